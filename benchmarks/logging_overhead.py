@@ -0,0 +1,118 @@
+"""
+Logging overhead per transaction on the calling thread (the event loop in production)
+
+Replays the log calls made along one transaction (request, dispatch, three
+sentinels, agent, persistence) with a realistic payload, and compares:
+- eager: f-strings at INFO written synchronously, as before structured logging
+- structured: lazy %-formatting through the background queue handler
+
+    python -m benchmarks.logging_overhead [--transactions 20000]
+"""
+import argparse
+import logging
+import os
+import sys
+import time
+from types import SimpleNamespace
+from src.logging_config import Truncated, setup_logging, shutdown_logging
+
+SENTINELS = ["SentinelOne", "SentinelTwo", "SentinelThree"]
+
+def build_payload():
+    data = {
+        "from_address": "0x" + "ab" * 20,
+        "to_address": "0x" + "cd" * 20,
+        "data": "0x" + "ef" * 2048,
+        "value": "1000000000000000000",
+        "chainId": 1,
+        "reason": "swap",
+    }
+    results = {
+        name: {"status": "completed", "result": {"risk_level": "low", "details": ["ok"] * 20}}
+        for name in SENTINELS
+    }
+    return data, results
+
+def eager_transaction(logger, transaction_id, data, results):
+    message = {"type": "message", "channel": "sentinels", "data": f'{{"transaction_id": "{transaction_id}"}}'}
+    logger.info(f"⚡ Processing transaction: {data}")
+    logger.info(f"Transaction {transaction_id} dispatched to sentinels")
+    for name in SENTINELS:
+        logger.info(f"🤖 {name} received message: {message}")
+        logger.info(f"✅ Sentinel {name} completed analysis for transaction {transaction_id}")
+    logger.info(f"✅ All sentinels completed analysis for transaction {transaction_id}")
+    logger.info(f"Sentinel results: {results}")
+    logger.info(f"Waiting for agent decision for transaction {transaction_id}")
+    logger.info(f"🤖 BAIbyAgent received message: {message}")
+    logger.info(f"✅ Agent decision received for transaction {transaction_id}")
+    logger.info(f"✅ Published persistence message for transaction {transaction_id}")
+    logger.info(f"📥 Received persistence message: {message}")
+    logger.info(f"✅ Transaction {transaction_id} persisted")
+
+def structured_transaction(logger, transaction_id, data, results):
+    message = {"type": "message", "channel": "sentinels", "data": f'{{"transaction_id": "{transaction_id}"}}'}
+    logger.debug("⚡ Processing transaction: %s", Truncated(data), extra={"category": "request"})
+    logger.debug("Transaction %s dispatched to sentinels", transaction_id, extra={"category": "transaction"})
+    for name in SENTINELS:
+        logger.debug("🤖 %s received message: %s", name, Truncated(message), extra={"category": "pubsub"})
+        logger.debug(
+            "✅ Sentinel %s completed analysis for transaction %s", name, transaction_id,
+            extra={"category": "sentinel"}
+        )
+    logger.debug("✅ All sentinels completed analysis for transaction %s", transaction_id, extra={"category": "transaction"})
+    logger.debug(
+        "Sentinel results for transaction %s: %s", transaction_id, Truncated(results),
+        extra={"category": "transaction"}
+    )
+    logger.debug("Waiting for agent decision for transaction %s", transaction_id, extra={"category": "transaction"})
+    logger.debug("🤖 %s received message: %s", "BAIbyAgent", Truncated(message), extra={"category": "pubsub"})
+    logger.info("Transaction %s analyzed", transaction_id, extra={"category": "transaction"})
+    logger.debug("✅ Published persistence message for transaction %s", transaction_id, extra={"category": "pubsub"})
+    logger.debug("📥 Received persistence message: %s", Truncated(message), extra={"category": "pubsub"})
+    logger.debug("✅ Transaction %s persisted", transaction_id, extra={"category": "persistence"})
+
+def run(transaction, logger, transactions):
+    data, results = build_payload()
+    start = time.perf_counter()
+    for index in range(transactions):
+        transaction(logger, f"tx-{index}", data, results)
+    return (time.perf_counter() - start) / transactions * 1e6
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--transactions", type=int, default=20000)
+    args = parser.parse_args()
+
+    # Log output goes to /dev/null: only the cost on the calling thread is measured
+    devnull = open(os.devnull, "w")
+    stdout, sys.stderr = sys.stdout, devnull
+    logger = logging.getLogger("benchmark")
+    root = logging.getLogger()
+
+    root.handlers = [logging.StreamHandler(devnull)]
+    root.setLevel(logging.INFO)
+    eager = run(eager_transaction, logger, args.transactions)
+
+    cases = [
+        ("structured, INFO", "INFO", {}),
+        ("structured, DEBUG sampled 1%", "DEBUG", {"pubsub": 0.01, "request": 0.01, "transaction": 0.01,
+                                                   "sentinel": 0.01, "persistence": 0.01}),
+        ("structured, DEBUG", "DEBUG", {}),
+    ]
+    results = []
+    for label, level, rates in cases:
+        settings = SimpleNamespace(
+            LOG_LEVEL=level, LOG_FORMAT="json", LOG_MAX_FIELD_LENGTH=512,
+            LOG_QUEUE_SIZE=1_000_000, LOG_SAMPLE_RATES=rates,
+        )
+        setup_logging(settings)
+        results.append((label, run(structured_transaction, logger, args.transactions)))
+        shutdown_logging()
+
+    print(f"Logging overhead per transaction ({args.transactions} transactions)", file=stdout)
+    print(f"  {'eager f-strings, INFO, synchronous':<36} {eager:8.2f} µs", file=stdout)
+    for label, value in results:
+        print(f"  {label:<36} {value:8.2f} µs", file=stdout)
+
+if __name__ == "__main__":
+    main()
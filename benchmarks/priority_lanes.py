@@ -0,0 +1,76 @@
+"""
+High priority latency while the low priority lane is saturated
+
+A single consumer with a fixed service time receives a flood of low priority
+transactions plus a steady trickle of high priority ones. The p99 time from
+arrival to processing of the high priority transactions is reported with a
+single FIFO queue (as before priority lanes) and with the lane scheduler, for
+growing low priority backlogs.
+
+    python -m benchmarks.priority_lanes [--service-ms 1] [--high 50]
+"""
+import argparse
+import asyncio
+import time
+from collections import deque
+from src.constants import Priority
+from src.priority_lanes import LaneScheduler
+
+class FIFO:
+    def __init__(self):
+        self._queue = deque()
+        self._not_empty = asyncio.Event()
+
+    def put(self, lane, item):
+        self._queue.append((lane, item))
+        self._not_empty.set()
+
+    async def get(self):
+        while not self._queue:
+            self._not_empty.clear()
+            await self._not_empty.wait()
+        return self._queue.popleft()
+
+def p99(samples):
+    ordered = sorted(samples)
+    return ordered[int(0.99 * (len(ordered) - 1))]
+
+async def run(queue, backlog: int, high: int, service: float) -> float:
+    waits = []
+
+    async def consume():
+        while True:
+            lane, enqueued_at = await queue.get()
+            if lane == Priority.HIGH:
+                waits.append(time.perf_counter() - enqueued_at)
+            await asyncio.sleep(service)
+
+    consumer = asyncio.create_task(consume())
+    for _ in range(backlog):
+        queue.put(Priority.LOW, time.perf_counter())
+    for _ in range(high):
+        queue.put(Priority.HIGH, time.perf_counter())
+        await asyncio.sleep(service * 4)
+        # Keep the low lane saturated
+        for _ in range(4):
+            queue.put(Priority.LOW, time.perf_counter())
+    while len(waits) < high:
+        await asyncio.sleep(service)
+    consumer.cancel()
+    return p99(waits) * 1000
+
+async def main(service_ms: float, high: int):
+    service = service_ms / 1000
+    print(f"High priority p99 queue wait (ms), service time {service_ms} ms, {high} high priority transactions")
+    print(f"  {'low backlog':>12} {'FIFO':>10} {'lanes':>10}")
+    for backlog in (0, 100, 500, 2000):
+        fifo = await run(FIFO(), backlog, high, service)
+        lanes = await run(LaneScheduler({"high": 8, "normal": 3, "low": 1}), backlog, high, service)
+        print(f"  {backlog:>12} {fifo:>10.1f} {lanes:>10.1f}")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--service-ms", type=float, default=1.0)
+    parser.add_argument("--high", type=int, default=50)
+    args = parser.parse_args()
+    asyncio.run(main(args.service_ms, args.high))
@@ -0,0 +1,104 @@
+"""
+Requests per second of the read endpoints, in process (no network, no Redis)
+
+Compares the fast response path of the API (orjson, no response_model
+re-validation, compression) against the previous path, which built pydantic
+models and let FastAPI validate and serialize them with the stdlib encoder.
+
+    python -m benchmarks.read_endpoints [--requests 2000]
+"""
+import argparse
+import asyncio
+import logging
+import time
+import uuid
+import httpx
+from fastapi import FastAPI
+from src.dashboard_view import get_dashboard_view
+from src.main import app
+from src.persistence_service import get_persistence_service
+from src.schemas.api import DashboardResponse, TransactionDetail
+
+def build_transaction(transaction_id: str) -> dict:
+    return {
+        "transaction_id": transaction_id,
+        "chainId": 1,
+        "from_address": "0x" + "ab" * 20,
+        "to_address": "0x" + "cd" * 20,
+        "data": "0x" + "ef" * 2048,
+        "value": 1000000000000000000,
+        "reason": "swap",
+        "validations": [
+            {"name": name, "status": "completed", "result": {"risk_level": "low", "details": ["ok"] * 20}}
+            for name in ["SentinelOne", "SentinelTwo", "SentinelThree", "agent"]
+        ],
+        "created_at": time.time(),
+        "updated_at": time.time(),
+        "status": "completed",
+    }
+
+def legacy_app(transaction: dict) -> FastAPI:
+    """The endpoints as they were: pydantic models validated again by FastAPI"""
+    legacy = FastAPI()
+
+    @legacy.get("/api/transaction/{transaction_id}", response_model=TransactionDetail)
+    async def get_transaction(transaction_id: str):
+        return TransactionDetail(**transaction)
+
+    @legacy.get("/api/dashboard", response_model=DashboardResponse)
+    async def get_dashboard():
+        view = get_dashboard_view()
+        return DashboardResponse(
+            total_transactions=view._total,
+            active_transactions=list(view._active.values()),
+            completed_transactions=list(view._completed.values()),
+        )
+
+    return legacy
+
+async def measure(target: FastAPI, path: str, requests: int, headers: dict) -> tuple:
+    transport = httpx.ASGITransport(app=target)
+    async with httpx.AsyncClient(transport=transport, base_url="http://benchmark") as client:
+
+        async def fetch() -> bytes:
+            # Raw bytes: decompressing is the client's cost, not the server's
+            async with client.stream("GET", path, headers=headers) as response:
+                assert response.status_code == 200, response.status_code
+                return b"".join([chunk async for chunk in response.aiter_raw()])
+
+        size = len(await fetch())
+        start = time.perf_counter()
+        for _ in range(requests):
+            await fetch()
+        return requests / (time.perf_counter() - start), size
+
+async def main(requests: int):
+    logging.disable(logging.INFO)
+    transaction = build_transaction(str(uuid.uuid4()))
+
+    async def get_transaction_details(transaction_id):
+        return dict(transaction)
+    get_persistence_service().get_transaction_details = get_transaction_details
+
+    view = get_dashboard_view()
+    for index in range(view.settings.DASHBOARD_MAX_TRANSACTIONS * 2):
+        view.apply({**build_transaction(str(uuid.uuid4())), "status": "completed" if index % 2 else "pending"})
+    view._seeded = True
+
+    legacy = legacy_app(transaction)
+    paths = [("transaction", f"/api/transaction/{transaction['transaction_id']}"), ("dashboard", "/api/dashboard")]
+    encodings = [("identity", {"accept-encoding": "identity"}), ("br", {"accept-encoding": "br"})]
+
+    print(f"Read endpoints ({requests} sequential requests each)")
+    print(f"  {'endpoint':<12} {'path':<8} {'encoding':<9} {'req/s':>9} {'bytes':>8}")
+    for name, path in paths:
+        rate, size = await measure(legacy, path, requests, encodings[0][1])
+        print(f"  {name:<12} {'legacy':<8} {'identity':<9} {rate:9.0f} {size:8d}")
+        for encoding, headers in encodings:
+            rate, size = await measure(app, path, requests, headers)
+            print(f"  {name:<12} {'fast':<8} {encoding:<9} {rate:9.0f} {size:8d}")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=2000)
+    asyncio.run(main(parser.parse_args().requests))
@@ -4,7 +4,8 @@ const API_URL = process.env.NEXT_PUBLIC_API_URL || 'http://localhost:8000/api';
 
 export async function fetchDashboard(): Promise<DashboardResponse> {
   try {
-    const response = await fetch(`${API_URL}/dashboard`);
+    // Revalidate with the ETag on every poll; unchanged dashboards return 304
+    const response = await fetch(`${API_URL}/dashboard`, { cache: 'no-cache' });
     
     if (!response.ok) {
       throw new Error(`Error ${response.status}: ${response.statusText}`);
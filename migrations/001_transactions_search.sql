@@ -0,0 +1,39 @@
+-- Searchable columns and indexes for GET /api/transactions.
+-- Run against the Supabase database (SQL editor or psql). Local SQLite and
+-- PostgreSQL stores (PERSISTENCE_DSN) create the same schema on first use.
+
+ALTER TABLE transactions
+    ADD COLUMN IF NOT EXISTS to_address TEXT,
+    ADD COLUMN IF NOT EXISTS chain_id BIGINT,
+    ADD COLUMN IF NOT EXISTS status TEXT,
+    ADD COLUMN IF NOT EXISTS agent_decision TEXT;
+
+-- Backfill existing rows from the stored transaction data
+UPDATE transactions SET
+    from_address = lower(from_address),
+    to_address = lower(data->>'to_address'),
+    chain_id = NULLIF(data->>'chainId', '')::BIGINT,
+    status = data->>'status',
+    agent_decision = (
+        SELECT CASE
+            WHEN v->'result'->>'approved' IS NULL THEN NULL
+            WHEN (v->'result'->>'approved')::BOOLEAN IS NOT TRUE THEN 'rejected'
+            WHEN jsonb_array_length(COALESCE(v->'result'->'warnings', '[]'::JSONB)) > 0 THEN 'warnings'
+            ELSE 'approved'
+        END
+        FROM jsonb_array_elements(data->'validations') AS v
+        WHERE v->>'name' = 'agent'
+        LIMIT 1
+    )
+WHERE status IS NULL;
+
+-- Idempotent upserts and lookups by transaction_id
+CREATE UNIQUE INDEX IF NOT EXISTS transactions_transaction_id_key ON transactions (transaction_id);
+
+-- Keyset pagination: every filter is followed by the (created_at, transaction_id) ordering
+CREATE INDEX IF NOT EXISTS transactions_created_at_idx ON transactions (created_at DESC, transaction_id DESC);
+CREATE INDEX IF NOT EXISTS transactions_agent_decision_idx ON transactions (agent_decision, created_at DESC, transaction_id DESC);
+CREATE INDEX IF NOT EXISTS transactions_chain_id_idx ON transactions (chain_id, created_at DESC, transaction_id DESC);
+CREATE INDEX IF NOT EXISTS transactions_from_address_idx ON transactions (from_address, created_at DESC, transaction_id DESC);
+CREATE INDEX IF NOT EXISTS transactions_status_idx ON transactions (status, created_at DESC, transaction_id DESC);
+CREATE INDEX IF NOT EXISTS transactions_to_address_idx ON transactions (to_address, created_at DESC, transaction_id DESC);
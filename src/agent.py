@@ -1,106 +1,243 @@
 import logging
-from typing import Dict, Any
+from typing import Dict, Any, List, Tuple
 import asyncio
-import json
 import time
-from src.state_manager import StateManager
+import numpy as np
+from src.state_manager import ABANDONED_STATUSES, StateManager, deadline_expired
 from src.constants import TransactionStatus
 from src.config import get_settings
+from src.logging_config import Truncated
+from src.priority_lanes import LaneScheduler, get_lane_metrics, lane_channels, read_lanes
 
 logger = logging.getLogger(__name__)
 
+# Numeric encoding of the risk levels reported by sentinels
+RISK_LEVELS = {"medium": 0.5, "high": 1.0}
+
+class RiskModel:
+    """
+    Vectorized rule model scoring a batch of transactions at once.
+
+    Each transaction is a row and each sentinel a column. A transaction is high
+    risk when any sentinel reports a high risk level, or when its weighted risk
+    score (risk level x confidence, averaged with per-sentinel weights) reaches
+    the threshold configured for its chain.
+    """
+    def __init__(self, sentinel_weights: Dict[str, float], chain_thresholds: Dict[int, float], default_threshold: float):
+        self.sentinel_weights = sentinel_weights
+        self.chain_thresholds = chain_thresholds
+        self.default_threshold = default_threshold
+
+    def score(self, chain_ids: List[Any], sentinel_results: List[Dict[str, dict]]) -> Tuple[np.ndarray, np.ndarray, List[str]]:
+        """
+        Score a batch of sentinel results
+
+        Returns:
+            Tuple with (high_risk, risk_levels, sentinel_names): a boolean vector
+            per transaction, the (transactions x sentinels) risk level matrix and
+            the sentinel name of each column
+        """
+        sentinel_names = list(dict.fromkeys(name for results in sentinel_results for name in results))
+        columns = {name: index for index, name in enumerate(sentinel_names)}
+        shape = (len(sentinel_results), len(sentinel_names))
+
+        levels = np.zeros(shape, dtype=np.float32)
+        confidence = np.ones(shape, dtype=np.float32)
+        present = np.zeros(shape, dtype=bool)
+        for row, results in enumerate(sentinel_results):
+            for name, result in results.items():
+                column = columns[name]
+                result_data = result.get("result") or {}
+                if not isinstance(result_data, dict):
+                    result_data = {}
+                present[row, column] = True
+                levels[row, column] = self._risk_level(result_data.get("risk_level"))
+                confidence[row, column] = self._confidence(result_data.get("confidence"))
+
+        weights = np.array([self.sentinel_weights.get(name, 1.0) for name in sentinel_names], dtype=np.float32)
+        thresholds = np.array(
+            [self.chain_thresholds.get(self._chain_id(chain_id), self.default_threshold) for chain_id in chain_ids],
+            dtype=np.float32
+        )
+
+        total_weight = np.maximum(present @ weights, np.finfo(np.float32).eps)
+        risk_score = ((levels * confidence * present) @ weights) / total_weight
+        high_risk = (present & (levels == RISK_LEVELS["high"])).any(axis=1) | (risk_score >= thresholds)
+
+        return high_risk, levels, sentinel_names
+
+    @staticmethod
+    def _risk_level(risk_level: Any) -> float:
+        return RISK_LEVELS.get(risk_level, 0.0) if isinstance(risk_level, str) else 0.0
+
+    @staticmethod
+    def _confidence(confidence: Any) -> float:
+        """Confidence of a sentinel result; missing or malformed values count as 1.0
+        so one bad payload cannot fail the whole batch"""
+        try:
+            value = float(confidence)
+        except (TypeError, ValueError):
+            return 1.0
+        return value if np.isfinite(value) else 1.0
+
+    @staticmethod
+    def _chain_id(chain_id: Any) -> Any:
+        try:
+            return int(chain_id)
+        except (TypeError, ValueError):
+            return chain_id
+
 class BAIbyAgent:
     def __init__(self):
         self.state = StateManager()
         self.settings = get_settings()
         self.name = "agent"  # Changed to match expected format in validations
-
-    async def _initialize_status(self, transaction_id: str):
-        """Initialize agent status for this transaction"""
-        await self.state.set_agent_status(
-            transaction_id=transaction_id,
-            status=TransactionStatus.PENDING
+        self.model = RiskModel(
+            sentinel_weights=self.settings.AGENT_SENTINEL_WEIGHTS,
+            chain_thresholds=self.settings.AGENT_CHAIN_RISK_THRESHOLDS,
+            default_threshold=self.settings.AGENT_RISK_THRESHOLD
         )
 
-    async def _process_transaction(self, data: dict):
-        """Process received messages from channel"""
-        transaction_id = data.get("transaction_id")
-        
-        if not transaction_id:
-            logger.error(f"{self.name} received message without transaction_id")
-            return
-            
-        await self._initialize_status(transaction_id)
-        
-        try:
-            logger.info(f"🤖 {self.name} processing transaction {transaction_id}")
-            await self.analyze(data)
-            
-        except Exception as e:
-            logger.error(f"Error processing message in {self.name}: {e}")
-            # Update status to error
-            await self.state.set_sentinel_status(
-                transaction_id=transaction_id,
-                sentinel_name=self.name,
-                status=TransactionStatus.ERROR,
-                result={"error": str(e)}
+    async def _collect_batch(self, scheduler: LaneScheduler) -> List[dict]:
+        """Wait for a message, then drain whatever arrives within the batch window
+
+        Messages are taken from the lanes by weighted fair scheduling, so a full
+        batch favors high priority transactions without starving the others.
+        """
+        batch = []
+        loop = asyncio.get_running_loop()
+        deadline = None
+        metrics = get_lane_metrics()
+
+        while len(batch) < self.settings.AGENT_BATCH_MAX_SIZE:
+            if deadline is None:
+                timeout = None  # Block until the first message arrives
+            else:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+
+            entry = await scheduler.get(timeout)
+            if entry is None:
+                break
+
+            lane, data = entry
+            logger.debug(
+                "🤖 %s received %s priority message: %s", self.name, lane.value, Truncated(data),
+                extra={"category": "pubsub"}
             )
+            metrics.record_wait(lane, data.get("enqueued_at"))
+            batch.append(data)
+            if deadline is None:
+                deadline = loop.time() + self.settings.AGENT_BATCH_WINDOW_MS / 1000
+
+        return batch
+
+    async def _process_batch(self, batch: List[dict]):
+        """Process a micro-batch of received messages"""
+        transaction_ids = []
+        for data in batch:
+            transaction_id = data.get("transaction_id")
+            if not transaction_id:
+                logger.error(f"{self.name} received message without transaction_id")
+                continue
+            if deadline_expired(data.get("deadline")):
+                logger.debug(
+                    "🤖 %s skipped expired transaction %s", self.name, transaction_id,
+                    extra={"category": "agent"}
+                )
+                continue
+            if transaction_id not in transaction_ids:
+                transaction_ids.append(transaction_id)
+
+        if not transaction_ids:
+            return
+
+        logger.debug(
+            "🤖 %s processing batch of %d transactions", self.name, len(transaction_ids),
+            extra={"category": "agent"}
+        )
+        await self.analyze(transaction_ids)
+
+    async def _consume(self, scheduler: LaneScheduler):
+        """Process queued messages in micro-batches"""
+        while True:
+            batch = await self._collect_batch(scheduler)
+            await self._process_batch(batch)
 
     async def listen(self):
-        """Listen for agent channel events"""
-        channel = self.settings.REDIS_CHANNELS.AGENT_INPUT.value
-        pubsub = await self.state.subscribe_to_channel(channel)
-        
+        """Listen for agent channel events on every priority lane"""
+        channels = lane_channels(self.settings.REDIS_CHANNELS.AGENT_INPUT.value)
+        pubsub = await self.state.subscribe_to_channel(*channels)
+        scheduler = LaneScheduler(self.settings.PRIORITY_LANE_WEIGHTS)
+        get_lane_metrics().register(self.name, scheduler)
+
         try:
-            async for message in pubsub.listen():
-                logger.info(f"🤖 {self.name} received message: {message}")
-                if message['type'] == 'message':
-                    data = json.loads(message['data'])
-                    await self._process_transaction(data)
+            await asyncio.gather(read_lanes(pubsub, channels, scheduler), self._consume(scheduler))
         except Exception as e:
             logger.error(f"Error in {self.name} listener: {e}")
             raise
 
-    async def analyze(self, data: Dict[str, Any]):
-        """Analyze sentinel results and make final decision"""
-        
-        transaction_id = data["transaction_id"]
-        
-        # Get sentinel results from the provided data or fetch them
-        sentinel_results = data.get("sentinel_results", {})
-        if not sentinel_results:
-            sentinel_results = await self.state.get_sentinel_statuses(transaction_id)
+    async def analyze(self, transaction_ids: List[str]):
+        """Analyze sentinel results of a batch of transactions and make their final decisions"""
 
-        try:
-            high_risk = False
-            warnings = []
-
-            for sentinel_name, result in sentinel_results.items():
-                result_data = result.get("result", {})
-                if result_data.get("risk_level") == "high":
-                    high_risk = True
-                    warnings.append(f"High risk detected by {sentinel_name}: {result_data.get('reason')}")
-                elif result_data.get("risk_level") == "medium":
-                    warnings.append(f"Warning from {sentinel_name}: {result_data.get('reason')}")
-
-            result = {
-                "status": "success",
-                "message": "Analysis completed successfully",
-                "approved": not high_risk,
-                "risk_level": "high" if high_risk else "low",
-                "warnings": warnings,
-                "timestamp": time.time()
+        # Fetch all sentinel results in one round trip
+        records = await self.state.get_fields_batch(transaction_ids, ["validations", "chainId", "status"])
+        # Skip transactions that no longer exist or that failed or were cancelled meanwhile
+        transaction_ids = [
+            transaction_id for transaction_id in transaction_ids
+            if records[transaction_id] and records[transaction_id]["status"] not in ABANDONED_STATUSES
+        ]
+        if not transaction_ids:
+            return
+
+        validations_by_transaction = {
+            transaction_id: records[transaction_id]["validations"] or [] for transaction_id in transaction_ids
+        }
+        sentinel_results = [
+            {
+                validation.get("name"): validation
+                for validation in validations_by_transaction[transaction_id]
+                if validation.get("name") != self.name
             }
+            for transaction_id in transaction_ids
+        ]
+        chain_ids = [records[transaction_id]["chainId"] for transaction_id in transaction_ids]
+
+        try:
+            high_risk, levels, sentinel_names = self.model.score(chain_ids, sentinel_results)
+            columns = {name: index for index, name in enumerate(sentinel_names)}
+            timestamp = time.time()
+            outcomes = []
 
-            status = TransactionStatus.COMPLETED
-            logger.info(f"✅ Agent completed analysis for transaction {transaction_id}")
+            for row, transaction_id in enumerate(transaction_ids):
+                warnings = []
+                if levels[row].any():
+                    for sentinel_name, result in sentinel_results[row].items():
+                        level = levels[row, columns[sentinel_name]]
+                        result_data = result.get("result") or {}
+                        if level == RISK_LEVELS["high"]:
+                            warnings.append(f"High risk detected by {sentinel_name}: {result_data.get('reason')}")
+                        elif level == RISK_LEVELS["medium"]:
+                            warnings.append(f"Warning from {sentinel_name}: {result_data.get('reason')}")
+
+                result = {
+                    "status": "success",
+                    "message": "Analysis completed successfully",
+                    "approved": not bool(high_risk[row]),
+                    "risk_level": "high" if high_risk[row] else "low",
+                    "warnings": warnings,
+                    "timestamp": timestamp
+                }
+                outcomes.append((TransactionStatus.COMPLETED, result))
+
+            logger.debug(
+                "✅ Agent completed analysis for %d transactions", len(transaction_ids),
+                extra={"category": "agent"}
+            )
         except Exception as e:
-            result = {"error": str(e)}
-            status = TransactionStatus.ERROR
-            logger.error(f"❌ Agent failed analysis for transaction {transaction_id}: {e}")
-
-        await self.state.set_agent_status(
-            transaction_id=transaction_id,
-            status=status,
-            result=result
-        )
+            outcomes = [(TransactionStatus.FAILED, {"error": str(e)})] * len(transaction_ids)
+            logger.error("❌ Agent failed analysis for transactions %s: %s", Truncated(transaction_ids), e)
+
+        # Write all verdicts back in one round trip
+        await self.state.set_agent_statuses_batch(dict(zip(transaction_ids, outcomes)))
@@ -1,6 +1,6 @@
 from pydantic_settings import BaseSettings
 from functools import lru_cache
-from typing import ClassVar, Optional
+from typing import ClassVar, Dict, List, Optional
 from src.constants import RedisChannels
 
 class Settings(BaseSettings):
@@ -12,20 +12,119 @@ class Settings(BaseSettings):
     HOST: str = "0.0.0.0"
     PORT: int = 8000
     FRONTEND_URL: str = "http://localhost:3000"
+    # Responses larger than this (bytes) are compressed with brotli, or gzip if the client lacks it
+    RESPONSE_COMPRESSION_MIN_SIZE: int = 1024
+    RESPONSE_COMPRESSION_LEVEL: int = 4  # brotli quality (0-11), gzip level is min(level, 9)
     
     # Logging
     LOG_LEVEL: str = "INFO"
+    LOG_FORMAT: str = "json"  # json | text
+    LOG_MAX_FIELD_LENGTH: int = 512  # characters kept of logged payloads
+    LOG_QUEUE_SIZE: int = 10000  # records waiting for the background writer, extra records are dropped
+    # Fraction of records kept per category (e.g. {"pubsub": 0.01}), warnings and errors are always kept
+    LOG_SAMPLE_RATES: Dict[str, float] = {}
+
+    # Admin diagnostics (/admin endpoints, disabled while ADMIN_TOKEN is unset)
+    ADMIN_TOKEN: Optional[str] = None  # expected in the X-Admin-Token header
+    LOOP_MONITOR_ENABLED: bool = True
+    LOOP_MONITOR_INTERVAL: float = 0.25  # segundos between event loop lag probes
+    LOOP_MONITOR_WINDOW: int = 1200  # lag samples kept (5 minutes at the default interval)
+    SLOW_CALLBACK_THRESHOLD: float = 0.1  # segundos blocking the loop before its stack is logged
+    PROFILE_MAX_SECONDS: float = 60.0
 
     # Redis settings
     REDIS_URL: str = "redis://localhost:6379/0"
+    REDIS_CLUSTER_MODE: bool = False
+    REDIS_MAX_CONNECTIONS: int = 50  # commands wait for a free connection beyond this (not applied in cluster mode)
+    REDIS_POOL_TIMEOUT: float = 5.0  # segundos waiting for a free connection before failing
+    REDIS_SOCKET_TIMEOUT: float = 5.0  # segundos
+    REDIS_SOCKET_CONNECT_TIMEOUT: float = 5.0  # segundos
+    REDIS_HEALTH_CHECK_INTERVAL: int = 30  # segundos
+    REDIS_SCAN_COUNT: int = 500
+    # Dedicated pool for pub/sub connections (defaults to REDIS_URL)
+    REDIS_PUBSUB_URL: Optional[str] = None
+    REDIS_PUBLISH_MAX_CONNECTIONS: int = 20  # connections for publishes, subscriptions use their own
     REDIS_CHANNELS: ClassVar[RedisChannels] = RedisChannels
 
+    # RPC settings
+    RPC_DEFAULT_CHAIN_ID: Optional[int] = None  # used when eth_* transactions omit chainId
+    # Proxy mode: forward calls to an upstream node, screening transactions first
+    RPC_PROXY_ENABLED: bool = False
+    RPC_UPSTREAM_URL: Optional[str] = None
+    RPC_UPSTREAM_TIMEOUT: float = 10.0  # segundos
+    RPC_UPSTREAM_MAX_CONNECTIONS: int = 100
+    RPC_UPSTREAM_MAX_KEEPALIVE_CONNECTIONS: int = 20
+    RPC_PROXY_CACHE_TTL: float = 1.0  # segundos, for idempotent read methods
+    RPC_PROXY_CACHE_MAX_SIZE: int = 10000
+
+    # Dashboard settings
+    DASHBOARD_MAX_TRANSACTIONS: int = 100  # per list (active / completed)
+    STATS_MAX_BUCKETS: int = 10000  # per /api/stats query
+
     # Supabase settings
     SUPABASE_URL: Optional[str] = None
     SUPABASE_KEY: Optional[str] = None
 
+    # Persistence settings
+    # Local stand-in for Supabase: sqlite:///path/to.db or postgresql://... (takes precedence)
+    PERSISTENCE_DSN: Optional[str] = None
+    TRANSACTIONS_PAGE_MAX_SIZE: int = 500
+    PERSISTENCE_WRITE_TIMEOUT: float = 2.0  # segundos before a write is spooled
+    # Local spool for records the store could not take
+    PERSISTENCE_SPOOL_DIR: str = "spool"
+    PERSISTENCE_SPOOL_SEGMENT_MAX_BYTES: int = 64 * 1024 * 1024
+    PERSISTENCE_SPOOL_SEGMENT_MAX_AGE: float = 60.0  # segundos
+    PERSISTENCE_SPOOL_FSYNC: bool = True
+    PERSISTENCE_SPOOL_REPLAY_INTERVAL: float = 10.0  # segundos
+    PERSISTENCE_SPOOL_REPLAY_BATCH_SIZE: int = 500
+    EXPORT_PAGE_SIZE: int = 5000  # records read per query by bulk exports
+
+    # Priority lanes
+    PRIORITY_LANE_WEIGHTS: Dict[str, int] = {"high": 8, "normal": 3, "low": 1}  # share of each lane when all are backlogged
+    PRIORITY_HIGH_VALUE: int = 100 * 10**18  # wei, transactions moving at least this much are high priority
+    PRIORITY_CHAIN_LANES: Dict[int, str] = {}  # lane per chainId, e.g. {11155111: "low"}
+    PRIORITY_API_KEY_LANES: Dict[str, str] = {}  # lane per X-API-Key header value
+    LANE_METRICS_WINDOW: int = 1000  # latency samples kept per lane
+
+    # Sentinel result cache (for sentinels declaring cache_key() and cache_ttl)
+    SENTINEL_CACHE_ENABLED: bool = True
+    SENTINEL_CACHE_MAX_SIZE: int = 10000  # results kept in process, per worker
+
+    # Address feature store (sliding windows per sender address)
+    FEATURE_STORE_ENABLED: bool = True
+    FEATURE_WINDOWS: Dict[str, int] = {"1m": 60, "1h": 3600, "24h": 86400}  # name -> segundos
+    FEATURE_WINDOW_BUCKETS: int = 6  # buckets per window, more is smoother but costs more keys
+
+    # Hedged sentinel dispatch (replicas claim each request, slow ones are re-dispatched)
+    HEDGING_ENABLED: bool = False
+    HEDGE_LATENCY_PERCENTILE: float = 0.95  # a request is hedged once it outlives this latency
+    HEDGE_LATENCY_WINDOW: int = 500  # latency samples kept per sentinel
+    HEDGE_MIN_SAMPLES: int = 20  # samples needed before a sentinel is hedged
+    HEDGE_MAX_FRACTION: float = 0.05  # most of the sentinel requests that can be hedged
+    SENTINEL_REPLICA_ID: Optional[str] = None  # defaults to <hostname>-<pid>
+
+    # Sentinel input partitions (sentinels:input:<partition>:<lane>)
+    CHANNEL_PARTITION_FUNCTION: Optional[str] = None  # "module:function" of the transaction data, defaults to its chainId
+    SENTINEL_PARTITIONS: Dict[str, List[str]] = {}  # partitions per sentinel name, sentinels not listed receive all
+    SENTINEL_PARTITIONS_TTL: float = 30.0  # segundos, a worker's partitions are dropped without a heartbeat
+    SENTINEL_PARTITIONS_REFRESH_INTERVAL: float = 5.0  # segundos between reloads of the partitions in the core
+
+    # Agent settings
+    AGENT_BATCH_WINDOW_MS: float = 5.0  # time to collect a micro-batch after its first message
+    AGENT_BATCH_MAX_SIZE: int = 256
+    AGENT_SENTINEL_WEIGHTS: Dict[str, float] = {}  # defaults to 1.0 per sentinel
+    AGENT_RISK_THRESHOLD: float = float("inf")  # weighted risk score flagging a transaction as high risk
+    AGENT_CHAIN_RISK_THRESHOLDS: Dict[int, float] = {}  # overrides AGENT_RISK_THRESHOLD per chainId
+
     # Analysis settings
-    ANALYSIS_EXPIRATION_TIME: int = 3600  # segundos
+    ANALYSIS_EXPIRATION_TIME: int = 3600  # segundos, also the longest a transaction is analyzed
+    # Interval at which the synchronous API checks whether its client disconnected
+    CLIENT_DISCONNECT_POLL_INTERVAL: float = 0.5  # segundos
+    # Calldata longer than this (hex chars) is stored compressed and deduplicated
+    CALLDATA_DEDUP_THRESHOLD: int = 1024
+    CALLDATA_COMPRESSION_LEVEL: int = 6
+    # Lifetime of the Redis summary left once a transaction is persisted
+    PERSISTED_SUMMARY_TTL: int = 300  # segundos
     
     class Config:
         env_file = ".env"
@@ -10,8 +10,24 @@ class TransactionStatus(str, Enum):
     PROCESSING = "processing"
     COMPLETED = "completed"
     FAILED = "failed"
+    CANCELLED = "cancelled"
+
+class Priority(str, Enum):
+    HIGH = "high"
+    NORMAL = "normal"
+    LOW = "low"
 
 class AgentDecision(str, Enum):
     APPROVED = "approved"
     REJECTED = "rejected"
     WARNINGS = "warnings"
+
+class RPCErrorCode(int, Enum):
+    PARSE_ERROR = -32700
+    INVALID_REQUEST = -32600
+    METHOD_NOT_FOUND = -32601
+    INVALID_PARAMS = -32602
+    INTERNAL_ERROR = -32603
+    TIMEOUT = -32000  # implementation-defined server error
+    RESOURCE_UNAVAILABLE = -32002  # EIP-1474
+    TRANSACTION_REJECTED = -32003  # EIP-1474
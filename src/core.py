@@ -3,8 +3,14 @@ import asyncio
 import time
 
 from src.config import get_settings
-from src.constants import TransactionStatus
+from src.logging_config import Truncated
+from src.constants import Priority, TransactionStatus
+from src.partitions import covers, partition_channel, partition_of
+from src.priority_lanes import get_lane_metrics, lane_channel, resolve_priority
 from src.state_manager import StateManager
+from src.stats_service import get_stats_service
+from src.feature_store import get_feature_store
+from src.hedging import get_hedging_policy
 
 logger = logging.getLogger(__name__)
 
@@ -20,97 +26,226 @@ class CoreService:
     def __init__(self):
         self.settings = get_settings()
         self.state = StateManager()
+        self.stats = get_stats_service()
+        self.features = get_feature_store()
+        self.hedging = get_hedging_policy()
         self.expected_sentinels = set()
+        self.sentinel_partitions = {}
+        self._sentinels_loaded_at = 0.0
 
-    async def _dispatch_transaction_to_sentinels(self, transaction_id: str):
-        """Initialize transaction state and notify sentinels"""
-        # Load sentinels if not already loaded
-        if not self.expected_sentinels:
+    def _resolve_deadline(self, data: dict) -> float:
+        """Absolute deadline of a transaction: the earliest of its timeout, its deadline and ANALYSIS_EXPIRATION_TIME"""
+        now = time.time()
+        candidates = [now + self.settings.ANALYSIS_EXPIRATION_TIME]
+        if data.get("timeout") is not None:
+            candidates.append(now + float(data["timeout"]))
+        if data.get("deadline") is not None:
+            candidates.append(float(data["deadline"]))
+        return min(candidates)
+
+    async def _dispatch_transaction_to_sentinels(
+        self, transaction_id: str, deadline: float, priority: Priority, partition: str
+    ) -> set:
+        """Notify the sentinels of the transaction's partition and return their names"""
+        # Reload sentinels and their partitions periodically: workers come and go
+        now = time.monotonic()
+        if (not self.expected_sentinels
+                or now - self._sentinels_loaded_at >= self.settings.SENTINEL_PARTITIONS_REFRESH_INTERVAL):
             self.expected_sentinels = await self.state.get_active_sentinels()
+            self.sentinel_partitions = await self.state.get_sentinel_partitions(self.expected_sentinels)
+            self._sentinels_loaded_at = now
+
+        expected_sentinels = {
+            sentinel for sentinel in self.expected_sentinels
+            if covers(self.sentinel_partitions.get(sentinel), partition)
+        }
+        if not expected_sentinels:
+            raise ValueError(f"No sentinels found for partition {partition}")
 
-        if not self.expected_sentinels:
-            raise ValueError("No sentinels found")
+        # Notify sentinels via PubSub, on the channel of the transaction's partition and lane
+        await self.state.publish_message(
+            partition_channel(self.settings.REDIS_CHANNELS.SENTINELS_INPUT.value, partition, priority),
+            {
+                "transaction_id": transaction_id,
+                "deadline": deadline,
+                "enqueued_at": time.time()
+            }
+        )
+        self.hedging.record_dispatch(len(expected_sentinels))
+        logger.debug(
+            "Transaction %s dispatched to sentinels of partition %s", transaction_id, partition,
+            extra={"category": "transaction"}
+        )
+        return expected_sentinels
 
-        # Notify sentinels via PubSub
+    async def _hedge_sentinel(
+        self, transaction_id: str, sentinel_name: str, deadline: float, priority: Priority, partition: str
+    ):
+        """Re-dispatch a slow sentinel request to another replica than the one handling it"""
+        claims = await self.state.get_sentinel_claims(transaction_id, sentinel_name)
         await self.state.publish_message(
-            self.settings.REDIS_CHANNELS.SENTINELS_INPUT.value,
+            partition_channel(self.settings.REDIS_CHANNELS.SENTINELS_INPUT.value, partition, priority),
             {
-                "transaction_id": transaction_id
+                "transaction_id": transaction_id,
+                "deadline": deadline,
+                "enqueued_at": time.time(),
+                "sentinels": [sentinel_name],
+                "attempt": 1,
+                "exclude": [replica for field, replica in claims.items() if field.startswith("attempt:")]
             }
         )
-        logger.info(f"Transaction {transaction_id} dispatched to sentinels")
+        self.hedging.record_hedge()
+        logger.info(
+            "Hedged sentinel %s for transaction %s", sentinel_name, transaction_id,
+            extra={"category": "transaction"}
+        )
     
-    async def _dispatch_transaction_to_agent(self, transaction_id: str):
+    async def _dispatch_transaction_to_agent(self, transaction_id: str, deadline: float, priority: Priority):
         await self.state.publish_message(
-            self.settings.REDIS_CHANNELS.AGENT_INPUT.value,
+            lane_channel(self.settings.REDIS_CHANNELS.AGENT_INPUT.value, priority),
             {
-                "transaction_id": transaction_id
+                "transaction_id": transaction_id,
+                "deadline": deadline,
+                "enqueued_at": time.time()
             }
         )
 
-    async def _wait_for_sentinels_analysis(self, transaction_id: str) -> dict:
-        """Wait for analysis completion and return results"""
-        timeout = self.settings.ANALYSIS_EXPIRATION_TIME
-        start_time = time.time()
-        
+    async def _wait_for_sentinels_analysis(
+        self, transaction_id: str, deadline: float, expected_sentinels: set, priority: Priority, partition: str
+    ) -> dict:
+        """Wait for analysis completion by the expected sentinels, until the deadline, and return results
+
+        Sentinel latencies feed the hedging policy, which may re-dispatch
+        sentinels that take longer than usual to another replica.
+        """
+        dispatched_at = time.time()
+        pending = set(expected_sentinels)
+        hedged = set()
         while True:
             # Check status of each sentinel
             sentinel_statuses = await self.state.get_sentinel_statuses(transaction_id)
             completed_sentinels = set(sentinel for sentinel, status in sentinel_statuses.items() 
                                    if status["status"] == TransactionStatus.COMPLETED)
+            elapsed = time.time() - dispatched_at
+            for sentinel in pending & completed_sentinels:
+                result = sentinel_statuses[sentinel]["result"]
+                self.hedging.record_latency(
+                    sentinel, elapsed, hedged=isinstance(result, dict) and bool(result.get("hedged"))
+                )
+            pending -= completed_sentinels
             
             # Check if all sentinels have completed
-            if completed_sentinels and completed_sentinels >= self.expected_sentinels:
-                logger.info(f"✅ All sentinels completed analysis for transaction {transaction_id}")
+            if completed_sentinels and completed_sentinels >= expected_sentinels:
+                logger.debug(
+                    "✅ All sentinels completed analysis for transaction %s", transaction_id,
+                    extra={"category": "transaction"}
+                )
                 return sentinel_statuses
             
-            if time.time() - start_time > timeout:
+            if time.time() >= deadline:
                 raise TimeoutError(f"Transaction {transaction_id} timed out")
+
+            for sentinel in pending - hedged:
+                if self.hedging.should_hedge(sentinel, elapsed):
+                    hedged.add(sentinel)
+                    await self._hedge_sentinel(transaction_id, sentinel, deadline, priority, partition)
             
-            await asyncio.sleep(0.1)
+            await asyncio.sleep(min(0.1, max(deadline - time.time(), 0)))
 
-    async def _wait_for_agent_decision(self, transaction_id: str) -> dict:
-        """Wait for agent decision and return results"""
-        timeout = self.settings.ANALYSIS_EXPIRATION_TIME
-        start_time = time.time()
-        
+    async def _wait_for_agent_decision(self, transaction_id: str, deadline: float) -> dict:
+        """Wait for agent decision, until the deadline, and return results"""
         while True:
             # Check current transaction state
             agent_status = await self.state.get_agent_status(transaction_id)
             
             if agent_status and agent_status.get("status") == TransactionStatus.COMPLETED:
-                logger.info(f"✅ Agent decision received for transaction {transaction_id}")
+                logger.debug(
+                    "✅ Agent decision received for transaction %s", transaction_id,
+                    extra={"category": "transaction"}
+                )
                 return agent_status
+            if agent_status and agent_status.get("status") == TransactionStatus.FAILED:
+                # The agent does not retry: fail now instead of waiting for the deadline
+                raise RuntimeError(f"Agent failed analysis of transaction {transaction_id}")
             
-            if time.time() - start_time > timeout:
+            if time.time() >= deadline:
                 raise TimeoutError(f"Transaction {transaction_id} timed out waiting for agent decision")
             
-            await asyncio.sleep(0.1)
+            await asyncio.sleep(min(0.1, max(deadline - time.time(), 0)))
+
+    async def _abandon_transaction(self, transaction_id: str, status: TransactionStatus):
+        """Mark a transaction as failed or cancelled so sentinels and agent skip it"""
+        await self.state.set_transaction_status(transaction_id=transaction_id, status=status)
+        transaction = await self.state.get_transaction(transaction_id, resolve_calldata=False)
+        await self.stats.record_finished(transaction or {}, status)
 
     async def analyze_transaction(self, data: dict) -> dict:
-        """Process transaction and wait for results"""
-        
+        """Process transaction and wait for results
+
+        Waiting stops at the transaction deadline (TimeoutError); any error marks
+        the transaction as failed, and cancelling the call (e.g. on client
+        disconnect) marks it as cancelled.
+        """
+        started_at = time.time()
+        deadline = self._resolve_deadline(data)
+        priority = resolve_priority(data)
+        partition = partition_of(data)
+        data = {**data, "deadline": deadline, "priority": priority.value}
+        data.pop("timeout", None)
+
         transaction_id = await self.state.initialize_transaction(data)
 
-        await self._dispatch_transaction_to_sentinels(transaction_id)
+        try:
+            # Features are updated before dispatch so sentinels see this transaction
+            await asyncio.gather(self.stats.record_received(data), self.features.record(data))
+
+            expected_sentinels = await self._dispatch_transaction_to_sentinels(
+                transaction_id, deadline, priority, partition
+            )
 
-        sentinel_results = await self._wait_for_sentinels_analysis(transaction_id)
-        logger.info(f"Sentinel results: {sentinel_results}")
+            sentinel_results = await self._wait_for_sentinels_analysis(
+                transaction_id, deadline, expected_sentinels, priority, partition
+            )
+            logger.debug(
+                "Sentinel results for transaction %s: %s", transaction_id, Truncated(sentinel_results),
+                extra={"category": "transaction"}
+            )
 
-        # Dispatch transaction to agent with sentinel results
-        await self._dispatch_transaction_to_agent(transaction_id)
+            # Dispatch transaction to agent with sentinel results
+            await self._dispatch_transaction_to_agent(transaction_id, deadline, priority)
 
-        logger.info(f"Waiting for agent decision for transaction {transaction_id}")
-        agent_decision = await self._wait_for_agent_decision(transaction_id)
+            logger.debug(
+                "Waiting for agent decision for transaction %s", transaction_id,
+                extra={"category": "transaction"}
+            )
+            agent_decision = await self._wait_for_agent_decision(transaction_id, deadline)
+        except Exception:
+            # Timeouts, partitions without sentinels, Redis errors...: never leave the transaction pending
+            try:
+                await self._abandon_transaction(transaction_id, TransactionStatus.FAILED)
+            except Exception as e:
+                logger.error(f"Error failing transaction {transaction_id}: {e}")
+            raise
+        except asyncio.CancelledError:
+            # Shielded: the cancellation must still be recorded while it propagates
+            await asyncio.shield(self._abandon_transaction(transaction_id, TransactionStatus.CANCELLED))
+            logger.info("Transaction %s cancelled", transaction_id, extra={"category": "transaction"})
+            raise
         
-        logger.info(f"Agent decision received for transaction {transaction_id}")
+        get_lane_metrics().record_latency(priority, time.time() - started_at)
+        logger.info("Transaction %s analyzed", transaction_id, extra={"category": "transaction"})
+        # Read the record before completing it: once persisted it is shrunk to a summary
+        transaction = await self.state.get_transaction(transaction_id)
+
         # Update final transaction status
-        await self.state.set_transaction_status(
+        updated_at = await self.state.set_transaction_status(
             transaction_id=transaction_id,
             status=TransactionStatus.COMPLETED
         )
 
-        transaction = await self.state.get_transaction(transaction_id)
+        transaction["status"] = TransactionStatus.COMPLETED
+        transaction["updated_at"] = updated_at
+        await self.stats.record_finished(transaction, TransactionStatus.COMPLETED)
         return transaction
 
 core = CoreService()
\ No newline at end of file
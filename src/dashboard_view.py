@@ -0,0 +1,167 @@
+import asyncio
+import logging
+import time
+import uuid
+from collections import OrderedDict
+from datetime import datetime
+from typing import Any, Dict, Optional, Tuple
+from src.config import get_settings
+from src.constants import TransactionStatus
+from src.responses import compress, dumps
+
+logger = logging.getLogger(__name__)
+
+class DashboardView:
+    """
+    Materialized dashboard kept in memory:
+    - Seeded once from Redis and Supabase
+    - Updated incrementally on transaction status transitions
+    - Serialized (and compressed) once per version and served with a version-based ETag
+    """
+    _instance = None
+
+    def __new__(cls):
+        if cls._instance is None:
+            cls._instance = super().__new__(cls)
+            cls._instance.initialized = False
+        return cls._instance
+
+    def __init__(self):
+        if not hasattr(self, 'initialized') or not self.initialized:
+            self.settings = get_settings()
+            self.version = 0
+            # Distinguishes ETags across restarts, since versions start over
+            self._etag_prefix = uuid.uuid4().hex[:8]
+            self._active: OrderedDict[str, Dict[str, Any]] = OrderedDict()
+            self._completed: OrderedDict[str, Dict[str, Any]] = OrderedDict()
+            self._created_at: Dict[str, float] = {}
+            # All-time count, from the stats counters shared by every replica
+            self._total = 0
+            self._snapshot: Optional[bytes] = None
+            self._encoded: Dict[str, bytes] = {}
+            self._snapshot_version = -1
+            self._seeded = False
+            self._seed_lock = asyncio.Lock()
+            self.initialized = True
+
+    @property
+    def etag(self) -> str:
+        return f'"{self._etag_prefix}-{self.version}"'
+
+    @staticmethod
+    def _to_timestamp(value: Any) -> float:
+        if isinstance(value, (int, float)):
+            return float(value)
+        try:
+            return datetime.fromisoformat(str(value)).timestamp()
+        except ValueError:
+            return time.time()
+
+    def apply(self, transaction: Dict[str, Any]):
+        """Insert or update a transaction from its (full or summary) record"""
+        transaction_id = transaction.get("transaction_id")
+        if not transaction_id:
+            return
+
+        created_at = transaction.get("created_at")
+        summary = {
+            "transaction_id": transaction_id,
+            "from_address": transaction.get("from_address", ""),
+            "created_at": datetime.fromtimestamp(float(created_at)).isoformat()
+            if isinstance(created_at, (int, float)) else created_at,
+            "status": transaction.get("status"),
+        }
+
+        if summary["status"] == TransactionStatus.COMPLETED:
+            self._active.pop(transaction_id, None)
+            self._created_at.pop(transaction_id, None)
+            self._completed[transaction_id] = summary
+            while len(self._completed) > self.settings.DASHBOARD_MAX_TRANSACTIONS:
+                self._completed.popitem(last=False)
+        else:
+            self._active[transaction_id] = summary
+            self._created_at[transaction_id] = self._to_timestamp(created_at)
+
+        self.version += 1
+
+    def update_status(self, transaction_id: str, status: str):
+        """Apply a status transition to a transaction already in the view"""
+        summary = self._active.get(transaction_id) or self._completed.get(transaction_id)
+        if summary is None or summary["status"] == status:
+            return
+        self.apply({**summary, "status": status})
+
+    def set_total(self, total: int):
+        """Update the all-time transaction count (StatsService totals)"""
+        if total != self._total:
+            self._total = total
+            self.version += 1
+
+    def prune_expired(self):
+        """Drop active transactions that outlived their Redis record"""
+        expired_before = time.time() - self.settings.ANALYSIS_EXPIRATION_TIME
+        # Active transactions are kept in creation order
+        while self._active:
+            transaction_id = next(iter(self._active))
+            if self._created_at.get(transaction_id, 0) >= expired_before:
+                break
+            self._active.popitem(last=False)
+            self._created_at.pop(transaction_id, None)
+            self.version += 1
+
+    async def ensure_seeded(self):
+        """Load the initial state from Redis and Supabase on first use"""
+        if self._seeded:
+            return
+        async with self._seed_lock:
+            if self._seeded:
+                return
+            from src.persistence_service import get_persistence_service
+            from src.stats_service import get_stats_service
+            active, completed, _ = await get_persistence_service().get_transactions_data()
+
+            # Oldest first, so the most recent entries end up last like live updates
+            for transaction in sorted(active + completed, key=lambda t: self._to_timestamp(t.get("created_at"))):
+                # Live updates received while loading are more recent
+                transaction_id = transaction.get("transaction_id")
+                if transaction_id not in self._active and transaction_id not in self._completed:
+                    self.apply(transaction)
+            self.set_total(await get_stats_service().get_total("transactions"))
+            self._seeded = True
+            logger.info(f"Dashboard view seeded with {len(active) + len(completed)} transactions")
+
+    def render(self) -> bytes:
+        """Return the serialized dashboard, rebuilt only when the version changed"""
+        self.prune_expired()
+        if self._snapshot_version != self.version:
+            limit = self.settings.DASHBOARD_MAX_TRANSACTIONS
+            # Most recent first
+            active = list(reversed(self._active.values()))[:limit]
+            completed = list(reversed(self._completed.values()))[:limit]
+            self._snapshot = dumps({
+                "total_transactions": self._total,
+                "active_transactions": active,
+                "completed_transactions": completed,
+            })
+            self._snapshot_version = self.version
+            self._encoded = {}
+        return self._snapshot
+
+    def render_encoded(self, encoding: Optional[str]) -> Tuple[bytes, Optional[str]]:
+        """
+        Return the serialized dashboard compressed with the given encoding,
+        compressing each version at most once per encoding
+
+        Returns:
+            Tuple of (body, content encoding or None when sent uncompressed)
+        """
+        snapshot = self.render()
+        if encoding is None or len(snapshot) < self.settings.RESPONSE_COMPRESSION_MIN_SIZE:
+            return snapshot, None
+        if encoding not in self._encoded:
+            self._encoded[encoding] = compress(snapshot, encoding)
+        return self._encoded[encoding], encoding
+
+# Singleton to access the dashboard view
+def get_dashboard_view() -> DashboardView:
+    return DashboardView()
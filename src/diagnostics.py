@@ -0,0 +1,138 @@
+import asyncio
+import logging
+import os
+import sys
+import threading
+import time
+import traceback
+from collections import Counter, deque
+from typing import Any, Deque, Dict, List, Optional
+from src.config import get_settings
+
+logger = logging.getLogger(__name__)
+
+class LoopMonitor:
+    """
+    Event loop responsiveness, measured from a watchdog thread:
+    - Every LOOP_MONITOR_INTERVAL the thread schedules a callback on the loop;
+      the delay until it runs is the loop lag
+    - When the callback has not run after SLOW_CALLBACK_THRESHOLD, the loop is
+      blocked: the stack of the loop thread is logged, once per stall
+
+    When idle it costs one callback per interval.
+    """
+    _instance = None
+
+    def __new__(cls):
+        if cls._instance is None:
+            cls._instance = super().__new__(cls)
+            cls._instance.initialized = False
+        return cls._instance
+
+    def __init__(self):
+        if not hasattr(self, 'initialized') or not self.initialized:
+            self.settings = get_settings()
+            self._lags: Deque[float] = deque(maxlen=self.settings.LOOP_MONITOR_WINDOW)
+            self._loop: Optional[asyncio.AbstractEventLoop] = None
+            self._loop_thread_id: Optional[int] = None
+            self._thread: Optional[threading.Thread] = None
+            self._stop = threading.Event()
+            self.stalls = 0
+            self.last_stall: Optional[Dict[str, Any]] = None
+            self.initialized = True
+
+    def start(self):
+        """Start watching the running loop (call from the loop thread)"""
+        if not self.settings.LOOP_MONITOR_ENABLED or self._thread is not None:
+            return
+        self._loop = asyncio.get_running_loop()
+        self._loop_thread_id = threading.get_ident()
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="loop-monitor", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        if self._thread is None:
+            return
+        self._stop.set()
+        self._thread.join(timeout=1)
+        self._thread = None
+
+    def _ack(self, sent_at: float, acked: threading.Event):
+        self._lags.append(time.perf_counter() - sent_at)
+        acked.set()
+
+    def _run(self):
+        threshold = self.settings.SLOW_CALLBACK_THRESHOLD
+        while not self._stop.wait(self.settings.LOOP_MONITOR_INTERVAL):
+            acked = threading.Event()
+            sent_at = time.perf_counter()
+            try:
+                self._loop.call_soon_threadsafe(self._ack, sent_at, acked)
+            except RuntimeError:
+                # Loop closed
+                return
+            if acked.wait(threshold):
+                continue
+            self._report_stall(threshold)
+            while not acked.wait(0.5):
+                if self._stop.is_set():
+                    return
+
+    def _report_stall(self, threshold: float):
+        frame = sys._current_frames().get(self._loop_thread_id)
+        stack = "".join(traceback.format_stack(frame)) if frame is not None else ""
+        self.stalls += 1
+        self.last_stall = {"at": time.time(), "stack": stack}
+        logger.warning(
+            "Event loop blocked for more than %.0f ms in:\n%s", threshold * 1000, stack,
+            extra={"category": "diagnostics"}
+        )
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Loop lag percentiles in seconds over the last LOOP_MONITOR_WINDOW samples, and stalls"""
+        ordered = sorted(self._lags)
+        return {
+            "running": self._thread is not None,
+            "interval": self.settings.LOOP_MONITOR_INTERVAL,
+            "samples": len(ordered),
+            "p50": ordered[int(0.50 * (len(ordered) - 1))] if ordered else None,
+            "p99": ordered[int(0.99 * (len(ordered) - 1))] if ordered else None,
+            "max": ordered[-1] if ordered else None,
+            "slow_callback_threshold": self.settings.SLOW_CALLBACK_THRESHOLD,
+            "stalls": self.stalls,
+            "last_stall": self.last_stall,
+        }
+
+# Singleton to access the event loop monitor
+def get_loop_monitor() -> LoopMonitor:
+    return LoopMonitor()
+
+def _frame_name(frame) -> str:
+    code = frame.f_code
+    return f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})"
+
+def sample_stacks(duration: float, interval: float) -> str:
+    """
+    Sample the stacks of every thread for `duration` seconds (blocking, run it in a thread)
+
+    Returns:
+        Folded stacks ("thread;outer;...;inner count" per line), the input of
+        flamegraph.pl, speedscope or inferno
+    """
+    own_id = threading.get_ident()
+    names = {thread.ident: thread.name for thread in threading.enumerate()}
+    folded: Counter = Counter()
+    ends_at = time.perf_counter() + duration
+    while time.perf_counter() < ends_at:
+        for thread_id, frame in sys._current_frames().items():
+            if thread_id == own_id:
+                continue
+            stack: List[str] = []
+            while frame is not None:
+                stack.append(_frame_name(frame))
+                frame = frame.f_back
+            stack.append(names.get(thread_id, str(thread_id)))
+            folded[";".join(reversed(stack))] += 1
+        time.sleep(interval)
+    return "".join(f"{stack} {count}\n" for stack, count in folded.most_common())
@@ -0,0 +1,267 @@
+"""
+Bulk export of persisted transactions to Parquet or Arrow IPC
+
+    python -m src.export --from 2025-01-01 --to 2025-02-01 --format parquet --output january.parquet
+
+Records are read from the persistence store in pages of EXPORT_PAGE_SIZE and
+written one record batch (one Parquet row group) per page, so memory does not
+grow with the size of the export.
+"""
+import argparse
+import asyncio
+import json
+import logging
+from datetime import datetime
+from typing import Any, AsyncIterator, Dict, List, Optional, Sequence, Tuple
+from src.config import get_settings
+from src.stats_service import get_agent_decision, get_agent_result
+from src.transaction_store import TransactionStore, format_timestamp
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:
+    pa = pq = None
+
+logger = logging.getLogger(__name__)
+
+EXPORT_FORMATS = {
+    "parquet": "application/vnd.apache.parquet",
+    "arrow": "application/vnd.apache.arrow.stream",
+}
+
+def _require_pyarrow():
+    if pa is None:
+        raise RuntimeError("pyarrow is required to export transactions (poetry install --extras export)")
+
+def export_schema(sentinel_names: Sequence[str]) -> "pa.Schema":
+    """Columns of an export: transaction fields, agent decision, then the fields of each sentinel"""
+    _require_pyarrow()
+    fields = [
+        pa.field("transaction_id", pa.string()),
+        pa.field("created_at", pa.timestamp("us", tz="UTC")),
+        pa.field("chain_id", pa.int64()),
+        pa.field("from_address", pa.string()),
+        pa.field("to_address", pa.string()),
+        pa.field("value", pa.string()),  # wei, beyond 64 bits
+        pa.field("priority", pa.string()),
+        pa.field("status", pa.string()),
+        pa.field("agent_decision", pa.string()),
+        pa.field("agent_approved", pa.bool_()),
+        pa.field("agent_risk_level", pa.string()),
+        pa.field("agent_warnings", pa.list_(pa.string())),
+    ]
+    # Flattened fields of each sentinel result, the full result is kept as JSON
+    for name in sentinel_names:
+        fields += [
+            pa.field(f"{name}_status", pa.string()),
+            pa.field(f"{name}_risk_level", pa.string()),
+            pa.field(f"{name}_confidence", pa.float64()),
+            pa.field(f"{name}_reason", pa.string()),
+            pa.field(f"{name}_result", pa.string()),
+        ]
+    # Every validation, including sentinels without their own columns
+    fields.append(pa.field("validations", pa.string()))
+    return pa.schema(fields)
+
+def _float(value: Any) -> Optional[float]:
+    try:
+        return float(value) if value is not None else None
+    except (TypeError, ValueError):
+        return None
+
+def flatten_record(record: Dict[str, Any], sentinel_names: Sequence[str]) -> Dict[str, Any]:
+    """Flatten a persisted record (with details) into a row of export_schema()"""
+    data = record.get("data") or {}
+    validations = data.get("validations") or []
+    by_name = {validation.get("name"): validation for validation in validations}
+    agent_result = get_agent_result(data)
+    decision = get_agent_decision(data)
+    value = data.get("value")
+
+    row = {
+        "transaction_id": record.get("transaction_id"),
+        "created_at": datetime.fromisoformat(format_timestamp(record.get("created_at"))),
+        "chain_id": record.get("chain_id"),
+        "from_address": record.get("from_address"),
+        "to_address": record.get("to_address"),
+        "value": str(value) if value is not None else None,
+        "priority": data.get("priority"),
+        "status": record.get("status"),
+        "agent_decision": decision.value if decision else None,
+        "agent_approved": agent_result.get("approved"),
+        "agent_risk_level": agent_result.get("risk_level"),
+        "agent_warnings": agent_result.get("warnings"),
+        "validations": json.dumps(validations),
+    }
+    for name in sentinel_names:
+        validation = by_name.get(name) or {}
+        result = validation.get("result")
+        result_data = result if isinstance(result, dict) else {}
+        row[f"{name}_status"] = validation.get("status")
+        row[f"{name}_risk_level"] = result_data.get("risk_level")
+        row[f"{name}_confidence"] = _float(result_data.get("confidence"))
+        row[f"{name}_reason"] = result_data.get("reason")
+        row[f"{name}_result"] = json.dumps(result) if result is not None else None
+    return row
+
+def sentinel_names_of(records: List[Dict[str, Any]]) -> List[str]:
+    """Sentinels having validations in some records, the agent excluded"""
+    names = {
+        validation.get("name")
+        for record in records
+        for validation in (record.get("data") or {}).get("validations") or []
+    }
+    return sorted(name for name in names if name and name != "agent")
+
+async def iter_pages(
+    store: TransactionStore,
+    created_from: Optional[str] = None,
+    created_to: Optional[str] = None,
+    page_size: Optional[int] = None,
+) -> AsyncIterator[List[Dict[str, Any]]]:
+    """Pages of records with details in a created_at range, most recent first (keyset pagination)"""
+    page_size = page_size or get_settings().EXPORT_PAGE_SIZE
+    cursor: Optional[Tuple[str, str]] = None
+    while True:
+        page = await store.search(
+            {},
+            created_from=format_timestamp(created_from),
+            created_to=format_timestamp(created_to),
+            cursor=cursor,
+            limit=page_size,
+            include_details=True,
+        )
+        # Stores may cap the page size (e.g. PostgREST max-rows): stop on an empty page only
+        if not page:
+            return
+        yield page
+        last = page[-1]
+        cursor = (format_timestamp(last["created_at"]), last["transaction_id"])
+
+class _ChunkSink:
+    """File-like object collecting what a pyarrow writer writes, drained after each batch"""
+
+    def __init__(self):
+        self.chunks: List[bytes] = []
+        self.position = 0
+        self.closed = False
+
+    def write(self, data) -> int:
+        chunk = bytes(data)
+        self.chunks.append(chunk)
+        self.position += len(chunk)
+        return len(chunk)
+
+    def tell(self) -> int:
+        return self.position
+
+    def flush(self):
+        pass
+
+    def close(self):
+        self.closed = True
+
+    def drain(self) -> bytes:
+        data = b"".join(self.chunks)
+        self.chunks.clear()
+        return data
+
+def _write_page(writer, schema: "pa.Schema", page: List[Dict[str, Any]], sentinel_names: Sequence[str]):
+    rows = [flatten_record(record, sentinel_names) for record in page]
+    writer.write_batch(pa.RecordBatch.from_pylist(rows, schema=schema))
+
+def _open_writer(sink: Any, schema: "pa.Schema", export_format: str):
+    if export_format == "parquet":
+        return pq.ParquetWriter(sink, schema, compression="zstd")
+    return pa.ipc.new_stream(sink, schema)
+
+async def stream_export(
+    store: TransactionStore,
+    export_format: str = "parquet",
+    created_from: Optional[str] = None,
+    created_to: Optional[str] = None,
+    sentinel_names: Optional[Sequence[str]] = None,
+    page_size: Optional[int] = None,
+) -> AsyncIterator[bytes]:
+    """
+    Export records as Parquet or Arrow IPC (stream format), yielding the bytes of each page
+
+    Sentinel columns are those of `sentinel_names`, or of the sentinels seen in the first page;
+    results of other sentinels are only in the `validations` column.
+    """
+    _require_pyarrow()
+    if export_format not in EXPORT_FORMATS:
+        raise ValueError(f"Unsupported export format: {export_format}")
+
+    sink = _ChunkSink()
+    schema = writer = None
+    rows = 0
+    try:
+        async for page in iter_pages(store, created_from, created_to, page_size):
+            if writer is None:
+                sentinel_names = list(sentinel_names) if sentinel_names else sentinel_names_of(page)
+                schema = export_schema(sentinel_names)
+                writer = _open_writer(pa.PythonFile(sink, mode="w"), schema, export_format)
+            # Flattening and encoding are CPU bound: keep them off the event loop
+            await asyncio.to_thread(_write_page, writer, schema, page, sentinel_names)
+            rows += len(page)
+            chunk = sink.drain()
+            if chunk:
+                yield chunk
+
+        if writer is None:
+            # Empty range: still a valid file
+            schema = export_schema(list(sentinel_names or []))
+            writer = _open_writer(pa.PythonFile(sink, mode="w"), schema, export_format)
+        writer.close()
+        writer = None
+        chunk = sink.drain()
+        if chunk:
+            yield chunk
+        logger.info(f"📦 Exported {rows} transactions as {export_format}")
+    finally:
+        if writer is not None:
+            writer.close()
+
+async def export_to_file(path: str, store: TransactionStore, **options) -> None:
+    """Write an export to a file"""
+    with open(path, "wb") as output:
+        async for chunk in stream_export(store, **options):
+            output.write(chunk)
+
+async def _main(args: argparse.Namespace) -> None:
+    # Imported here: the persistence service pulls in Redis and Supabase clients
+    from src.persistence_service import get_persistence_service
+
+    service = get_persistence_service()
+    if not await service.init_store():
+        raise SystemExit("Persistence store not configured (PERSISTENCE_DSN or SUPABASE_URL/SUPABASE_KEY)")
+    try:
+        await export_to_file(
+            args.output,
+            service.store,
+            export_format=args.format,
+            created_from=args.created_from,
+            created_to=args.created_to,
+            sentinel_names=args.sentinels.split(",") if args.sentinels else None,
+            page_size=args.page_size,
+        )
+    finally:
+        await service.store.close()
+
+def main(argv: Optional[Sequence[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Export analyzed transactions to Parquet or Arrow IPC")
+    parser.add_argument("--from", dest="created_from", help="Inclusive lower bound of created_at (ISO date or Unix time)")
+    parser.add_argument("--to", dest="created_to", help="Inclusive upper bound of created_at (ISO date or Unix time)")
+    parser.add_argument("--format", choices=sorted(EXPORT_FORMATS), default="parquet")
+    parser.add_argument("--output", required=True, help="Output file")
+    parser.add_argument("--sentinels", help="Comma-separated sentinels to flatten (default: those of the first page)")
+    parser.add_argument("--page-size", type=int, default=None, help="Records read per query (default: EXPORT_PAGE_SIZE)")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=get_settings().LOG_LEVEL)
+    asyncio.run(_main(args))
+
+if __name__ == "__main__":
+    main()
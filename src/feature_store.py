@@ -0,0 +1,139 @@
+import logging
+import time
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+from src.config import get_settings
+from src.state_manager import StateManager
+
+logger = logging.getLogger(__name__)
+
+GWEI = 10**9
+
+def feature_key(address: str, kind: str, bucket_size: int, bucket_start: int) -> str:
+    # Hash tag on the address: all keys of an address live in one slot, so
+    # multi-key commands (PFCOUNT over several buckets) work in cluster mode
+    return f"features:{{{address.lower()}}}:{kind}:{bucket_size}:{bucket_start}"
+
+def _value_in_gwei(value: Any) -> int:
+    """Transaction value in gwei: sums in wei would overflow Redis 64-bit counters"""
+    try:
+        if isinstance(value, str) and value.lower().startswith("0x"):
+            return int(value, 16) // GWEI
+        return int(value or 0) // GWEI
+    except (TypeError, ValueError):
+        return 0
+
+class FeatureStore:
+    """
+    Behavioral features per sender address, maintained on write:
+    - Each window (FEATURE_WINDOWS) is split in FEATURE_WINDOW_BUCKETS buckets,
+      each a small hash (tx count, value in gwei) plus a HyperLogLog of counterparties
+    - Buckets expire once outside their window, so memory is bounded by active addresses
+    - Sliding counts weight the oldest bucket by its overlap with the window;
+      distinct counts are the union of the window's buckets (approximate by one bucket)
+    """
+    _instance = None
+
+    def __new__(cls):
+        if cls._instance is None:
+            cls._instance = super().__new__(cls)
+            cls._instance.initialized = False
+        return cls._instance
+
+    def __init__(self):
+        if not hasattr(self, 'initialized') or not self.initialized:
+            self.settings = get_settings()
+            self.state = StateManager()
+            self.initialized = True
+
+    def _bucket_size(self, window: int) -> int:
+        return max(window // self.settings.FEATURE_WINDOW_BUCKETS, 1)
+
+    async def record(self, data: Dict[str, Any], timestamp: Optional[float] = None):
+        """Add a received transaction to the features of its sender"""
+        if not self.settings.FEATURE_STORE_ENABLED or not data.get("from_address"):
+            return
+        timestamp = timestamp or time.time()
+        address = data["from_address"]
+        counterparty = (data.get("to_address") or "").lower()
+        value = _value_in_gwei(data.get("value"))
+
+        try:
+            redis = await self.state.get_redis()
+            async with redis.pipeline(transaction=False) as pipe:
+                for window in self.settings.FEATURE_WINDOWS.values():
+                    size = self._bucket_size(window)
+                    bucket_start = int(timestamp // size * size)
+                    ttl = window + 2 * size
+
+                    counters = feature_key(address, "tx", size, bucket_start)
+                    pipe.hincrby(counters, "count", 1)
+                    if value:
+                        pipe.hincrby(counters, "value", value)
+                    pipe.expire(counters, ttl)
+
+                    if counterparty:
+                        counterparties = feature_key(address, "hll", size, bucket_start)
+                        pipe.pfadd(counterparties, counterparty)
+                        pipe.expire(counterparties, ttl)
+                await pipe.execute()
+        except Exception as e:
+            # Features must never fail the transaction flow
+            logger.warning(f"Error updating address features: {e}")
+
+    def _window_buckets(self, window: int, now: float) -> List[Tuple[int, float]]:
+        """Buckets overlapping [now - window, now], oldest first, with their overlap weight"""
+        size = self._bucket_size(window)
+        window_start = now - window
+        first = int(window_start // size * size)
+        buckets = []
+        for bucket_start in range(first, int(now // size * size) + 1, size):
+            # Only the oldest bucket sticks out of the window
+            overlap = (bucket_start + size - window_start) / size
+            buckets.append((bucket_start, min(overlap, 1.0)))
+        return buckets
+
+    async def get_features(self, addresses: Iterable[str], now: Optional[float] = None) -> Dict[str, Dict[str, float]]:
+        """
+        Feature vectors of several addresses, read in a single pipeline
+
+        Returns:
+            {address: {"tx_count_<window>", "value_gwei_<window>",
+                       "velocity_gwei_per_s_<window>", "distinct_counterparties_<window>"}}
+        """
+        now = now or time.time()
+        addresses = list(dict.fromkeys(address.lower() for address in addresses if address))
+        if not addresses:
+            return {}
+
+        windows = [
+            (name, window, self._bucket_size(window), self._window_buckets(window, now))
+            for name, window in self.settings.FEATURE_WINDOWS.items()
+        ]
+        redis = await self.state.get_redis()
+        async with redis.pipeline(transaction=False) as pipe:
+            for address in addresses:
+                for _, _, size, buckets in windows:
+                    for bucket_start, _ in buckets:
+                        pipe.hmget(feature_key(address, "tx", size, bucket_start), ["count", "value"])
+                    pipe.pfcount(*(feature_key(address, "hll", size, bucket_start) for bucket_start, _ in buckets))
+            replies = iter(await pipe.execute())
+
+        features = {}
+        for address in addresses:
+            vector = {}
+            for name, window, _, buckets in windows:
+                count = value = 0.0
+                for _, weight in buckets:
+                    bucket_count, bucket_value = next(replies)
+                    count += weight * int(bucket_count or 0)
+                    value += weight * int(bucket_value or 0)
+                vector[f"tx_count_{name}"] = round(count, 2)
+                vector[f"value_gwei_{name}"] = int(value)
+                vector[f"velocity_gwei_per_s_{name}"] = value / window
+                vector[f"distinct_counterparties_{name}"] = next(replies)
+            features[address] = vector
+        return features
+
+# Singleton to access the feature store
+def get_feature_store() -> FeatureStore:
+    return FeatureStore()
@@ -0,0 +1,104 @@
+import logging
+from collections import deque
+from typing import Any, Deque, Dict, Optional
+from src.config import get_settings
+
+logger = logging.getLogger(__name__)
+
+class LatencyTracker:
+    """Latency samples of one sentinel over a sliding window, with a cached percentile"""
+
+    def __init__(self, window: int, percentile: float):
+        self.samples: Deque[float] = deque(maxlen=window)
+        self.percentile = percentile
+        self._cached: Optional[float] = None
+
+    def record(self, seconds: float):
+        self.samples.append(seconds)
+        self._cached = None
+
+    def value(self) -> Optional[float]:
+        if self._cached is None and self.samples:
+            ordered = sorted(self.samples)
+            self._cached = ordered[int(self.percentile * (len(ordered) - 1))]
+        return self._cached
+
+class HedgingPolicy:
+    """
+    Decides when CoreService re-dispatches a sentinel analysis to another replica:
+    - Tracks the dispatch-to-result latency of each sentinel
+    - A request is hedged once it outlives the sentinel's HEDGE_LATENCY_PERCENTILE latency,
+      after HEDGE_MIN_SAMPLES samples
+    - At most HEDGE_MAX_FRACTION of the sentinel requests are hedged
+    """
+    _instance = None
+
+    def __new__(cls):
+        if cls._instance is None:
+            cls._instance = super().__new__(cls)
+            cls._instance.initialized = False
+        return cls._instance
+
+    def __init__(self):
+        if not hasattr(self, 'initialized') or not self.initialized:
+            self.settings = get_settings()
+            self._latencies: Dict[str, LatencyTracker] = {}
+            self.dispatched = 0
+            self.hedged = 0
+            self.hedges_won = 0
+            self.initialized = True
+
+    @property
+    def enabled(self) -> bool:
+        return self.settings.HEDGING_ENABLED
+
+    def _tracker(self, sentinel_name: str) -> LatencyTracker:
+        if sentinel_name not in self._latencies:
+            self._latencies[sentinel_name] = LatencyTracker(
+                self.settings.HEDGE_LATENCY_WINDOW, self.settings.HEDGE_LATENCY_PERCENTILE
+            )
+        return self._latencies[sentinel_name]
+
+    def record_dispatch(self, sentinel_count: int):
+        self.dispatched += sentinel_count
+
+    def record_latency(self, sentinel_name: str, seconds: float, hedged: bool = False):
+        """Record the latency of a sentinel result, and whether a hedge produced it"""
+        self._tracker(sentinel_name).record(seconds)
+        if hedged:
+            self.hedges_won += 1
+
+    def hedge_after(self, sentinel_name: str) -> Optional[float]:
+        """Seconds after which a request to the sentinel is hedged, None while unknown"""
+        tracker = self._tracker(sentinel_name)
+        if len(tracker.samples) < self.settings.HEDGE_MIN_SAMPLES:
+            return None
+        return tracker.value()
+
+    def should_hedge(self, sentinel_name: str, elapsed: float) -> bool:
+        """Whether a pending request should be hedged now, taking the budget into account"""
+        if not self.enabled:
+            return False
+        threshold = self.hedge_after(sentinel_name)
+        if threshold is None or elapsed < threshold:
+            return False
+        return self.hedged < self.settings.HEDGE_MAX_FRACTION * max(self.dispatched, 1)
+
+    def record_hedge(self):
+        self.hedged += 1
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Hedging counters and the hedge threshold of each sentinel"""
+        return {
+            "enabled": self.enabled,
+            "dispatched": self.dispatched,
+            "hedged": self.hedged,
+            "hedged_fraction": self.hedged / self.dispatched if self.dispatched else 0.0,
+            "max_fraction": self.settings.HEDGE_MAX_FRACTION,
+            "hedges_won": self.hedges_won,
+            "hedge_after": {name: self.hedge_after(name) for name in self._latencies},
+        }
+
+# Singleton to access the hedging policy
+def get_hedging_policy() -> HedgingPolicy:
+    return HedgingPolicy()
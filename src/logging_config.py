@@ -0,0 +1,142 @@
+import atexit
+import json
+import logging
+import queue
+import random
+import sys
+from datetime import datetime, timezone
+from logging.handlers import QueueHandler, QueueListener
+from typing import Any, Dict, Optional
+
+# Attributes every LogRecord has; anything else was passed through `extra`
+RESERVED_ATTRS = set(vars(logging.LogRecord("", 0, "", 0, "", (), None))) | {"message", "asctime"}
+
+# Default truncation limit, set from LOG_MAX_FIELD_LENGTH by setup_logging()
+_max_field_length = 512
+
+class Truncated:
+    """
+    Lazy log argument: the value is converted and truncated only if the record
+    is actually emitted, so payloads passed to disabled levels cost nothing
+
+        logger.debug("Processing transaction: %s", Truncated(data))
+    """
+    __slots__ = ("value", "limit")
+
+    def __init__(self, value: Any, limit: Optional[int] = None):
+        self.value = value
+        self.limit = limit
+
+    def __str__(self) -> str:
+        text = self.value if isinstance(self.value, str) else repr(self.value)
+        limit = self.limit or _max_field_length
+        if len(text) <= limit:
+            return text
+        return f"{text[:limit]}...(+{len(text) - limit} chars)"
+
+def truncate(value: Any, limit: Optional[int] = None) -> str:
+    """Convert a value to a string of at most `limit` characters"""
+    return str(Truncated(value, limit))
+
+class JSONFormatter(logging.Formatter):
+    """Format records as one JSON object per line, including `extra` fields"""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "timestamp": datetime.fromtimestamp(record.created, tz=timezone.utc).isoformat(),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+        }
+        for key, value in vars(record).items():
+            if key not in RESERVED_ATTRS and not key.startswith("_"):
+                entry[key] = value if isinstance(value, (int, float, bool, type(None))) else truncate(value)
+        if record.exc_info:
+            entry["exception"] = self.formatException(record.exc_info)
+        if record.stack_info:
+            entry["stack"] = record.stack_info
+        return json.dumps(entry, ensure_ascii=False)
+
+class SamplingFilter(logging.Filter):
+    """
+    Keep only a fraction of the records of each category
+
+    The category is given with `extra={"category": ...}`; categories without a
+    configured rate are always kept, and warnings and errors are never sampled.
+    """
+    def __init__(self, rates: Dict[str, float]):
+        super().__init__()
+        self.rates = rates
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if record.levelno >= logging.WARNING:
+            return True
+        rate = self.rates.get(getattr(record, "category", None))
+        return rate is None or random.random() < rate
+
+class BackgroundQueueHandler(QueueHandler):
+    """
+    Queue handler that leaves formatting and I/O to the listener thread:
+    the emitting thread only renders the message and enqueues the record.
+    Records are dropped (and counted) when the queue is full instead of blocking.
+    """
+    def __init__(self, log_queue: queue.Queue):
+        super().__init__(log_queue)
+        self.dropped = 0
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # Render the message now: arguments may be mutated once the call returns
+        record.message = record.getMessage()
+        record.msg = record.message
+        record.args = None
+        return record
+
+    def enqueue(self, record: logging.LogRecord):
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+_listener: Optional[QueueListener] = None
+
+def setup_logging(settings) -> None:
+    """
+    Route all logging through a bounded queue drained by a background thread
+
+    LOG_FORMAT selects JSON or plain text output; LOG_SAMPLE_RATES sets the
+    fraction of records kept per category.
+    """
+    global _listener, _max_field_length
+    if _listener is not None:
+        return
+    _max_field_length = settings.LOG_MAX_FIELD_LENGTH
+
+    # Records carry no caller location or process info: this skips a stack walk
+    # and two lookups per record (see "Optimization" in the logging docs)
+    logging._srcfile = None
+    logging.logProcesses = False
+    logging.logMultiprocessing = False
+
+    output = logging.StreamHandler(sys.stderr)
+    if settings.LOG_FORMAT == "json":
+        output.setFormatter(JSONFormatter())
+    else:
+        output.setFormatter(logging.Formatter("%(asctime)s %(levelname)s %(name)s: %(message)s"))
+
+    handler = BackgroundQueueHandler(queue.Queue(maxsize=settings.LOG_QUEUE_SIZE))
+    handler.addFilter(SamplingFilter(settings.LOG_SAMPLE_RATES))
+
+    root = logging.getLogger()
+    root.handlers = [handler]
+    root.setLevel(settings.LOG_LEVEL)
+
+    _listener = QueueListener(handler.queue, output, respect_handler_level=True)
+    _listener.start()
+    atexit.register(shutdown_logging)
+
+def shutdown_logging() -> None:
+    """Flush queued records and stop the background writer"""
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
@@ -7,13 +7,18 @@ from pathlib import Path
 from dotenv import load_dotenv
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.middleware.gzip import GZipMiddleware
 from src.state_manager import StateManager
 from src.sentinels.base_sentinel import BaseSentinel
 from contextlib import asynccontextmanager
 from src.config import get_settings
-from src.routers import api, rpc
+from src.routers import admin, api, rpc
 from src.agent import BAIbyAgent
-from src.persistence_service import run_persistence_service
+from src.persistence_service import get_persistence_service, run_persistence_service
+from src.rpc_proxy import get_rpc_proxy
+from src.logging_config import setup_logging, shutdown_logging
+from src.responses import FastJSONResponse
+from src.diagnostics import get_loop_monitor
 
 # Load environment variables from .env file
 load_dotenv()
@@ -21,7 +26,7 @@ load_dotenv()
 settings = get_settings()
 
 # Configure logging
-logging.basicConfig(level=settings.LOG_LEVEL)
+setup_logging(settings)
 logger = logging.getLogger(__name__)
 
 # Store sentinel tasks and agent task to cancel them on shutdown
@@ -56,6 +61,7 @@ async def lifespan(app: FastAPI):
     # Startup
     state = StateManager()
     await state.init()
+    get_loop_monitor().start()
     
     # Initialize agent
     agent = BAIbyAgent()
@@ -70,6 +76,8 @@ async def lifespan(app: FastAPI):
     sentinels = discover_sentinels()
     sentinel_names = {sentinel.name for sentinel in sentinels}
     await state.set_active_sentinels(sentinel_names)
+    for sentinel in sentinels:
+        await sentinel.register_partitions()
     
     # Start sentinel tasks
     for sentinel in sentinels:
@@ -101,15 +109,36 @@ async def lifespan(app: FastAPI):
     if all_tasks:
         await asyncio.gather(*all_tasks, return_exceptions=True)
     
+    await get_persistence_service().close()
+    await get_rpc_proxy().close()
     await state.close()
+    get_loop_monitor().stop()
     logger.info("Application and all services shutdown")
+    shutdown_logging()
 
 app = FastAPI(
     title=settings.PROJECT_NAME,
     version=settings.VERSION,
-    lifespan=lifespan
+    lifespan=lifespan,
+    default_response_class=FastJSONResponse
 )
 
+# Compress large responses (brotli when available, gzip otherwise)
+try:
+    from brotli_asgi import BrotliMiddleware
+    app.add_middleware(
+        BrotliMiddleware,
+        quality=settings.RESPONSE_COMPRESSION_LEVEL,
+        minimum_size=settings.RESPONSE_COMPRESSION_MIN_SIZE,
+        gzip_fallback=True
+    )
+except ImportError:
+    app.add_middleware(
+        GZipMiddleware,
+        minimum_size=settings.RESPONSE_COMPRESSION_MIN_SIZE,
+        compresslevel=min(settings.RESPONSE_COMPRESSION_LEVEL, 9)
+    )
+
 # Configurar CORS
 app.add_middleware(
     CORSMiddleware,
@@ -122,6 +151,7 @@ app.add_middleware(
 # Include routers
 app.include_router(api.router)
 app.include_router(rpc.router)
+app.include_router(admin.router)
 
 if __name__ == "__main__":
     import uvicorn
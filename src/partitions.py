@@ -0,0 +1,57 @@
+import importlib
+import logging
+from functools import lru_cache
+from typing import Any, Callable, Collection, Dict, Optional, Tuple
+from src.config import get_settings
+from src.constants import Priority
+from src.priority_lanes import lane_channel
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_PARTITION = "default"
+
+def chain_partition(data: Dict[str, Any]) -> str:
+    """Default partition function: the chainId of the transaction"""
+    try:
+        return str(int(data.get("chainId")))
+    except (TypeError, ValueError):
+        return DEFAULT_PARTITION
+
+@lru_cache(maxsize=None)
+def _load_partition_function(path: Optional[str]) -> Callable[[Dict[str, Any]], Any]:
+    if not path:
+        return chain_partition
+    module_name, _, function_name = path.partition(":")
+    return getattr(importlib.import_module(module_name), function_name)
+
+def partition_of(data: Dict[str, Any]) -> str:
+    """Partition of a transaction, from CHANNEL_PARTITION_FUNCTION (default: its chainId)"""
+    partition = _load_partition_function(get_settings().CHANNEL_PARTITION_FUNCTION)(data)
+    return str(partition) if partition is not None else DEFAULT_PARTITION
+
+def partition_channel(channel: str, partition: str, lane: Priority) -> str:
+    """Channel carrying one lane of one partition, e.g. sentinels:input:1:high"""
+    return lane_channel(f"{channel}:{partition}", lane)
+
+def partition_subscriptions(
+    channel: str, partitions: Optional[Collection[str]] = None
+) -> Tuple[Dict[str, Priority], Dict[str, Priority]]:
+    """
+    Channels and patterns to subscribe to for some partitions, mapped to their lane
+
+    Returns:
+        Tuple of (channels, patterns): explicit channels for the given partitions,
+        or one pattern per lane matching every partition when partitions is None
+    """
+    if partitions is None:
+        return {}, {partition_channel(channel, "*", lane): lane for lane in Priority}
+    channels = {
+        partition_channel(channel, partition, lane): lane
+        for partition in partitions
+        for lane in Priority
+    }
+    return channels, {}
+
+def covers(partitions: Optional[Collection[str]], partition: str) -> bool:
+    """Whether a worker subscribed to `partitions` (None: all) receives a partition"""
+    return partitions is None or partition in partitions
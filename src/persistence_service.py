@@ -1,3 +1,4 @@
+import base64
 import json
 import logging
 import asyncio
@@ -5,11 +6,53 @@ from typing import List, Dict, Any, Optional, Tuple
 from datetime import datetime
 from supabase import create_client
 from src.config import get_settings
+from src.logging_config import Truncated
 from src.constants import TransactionStatus
+from src.dashboard_view import get_dashboard_view
+from src.persistence_spool import PersistenceSpool
 from src.state_manager import StateManager
+from src.stats_service import get_agent_decision
+from src.transaction_store import (
+    SQLTransactionStore,
+    SupabaseTransactionStore,
+    TransactionStore,
+    format_timestamp,
+)
 
 logger = logging.getLogger(__name__)
 
+def build_record(transaction_data: Dict[str, Any]) -> Dict[str, Any]:
+    """Build the persistence record of a transaction: searchable columns plus the full data"""
+    chain_id = transaction_data.get("chainId")
+    decision = get_agent_decision(transaction_data)
+    return {
+        "transaction_id": transaction_data.get("transaction_id"),
+        "from_address": (transaction_data.get("from_address") or "").lower(),
+        "to_address": (transaction_data.get("to_address") or "").lower(),
+        "chain_id": int(chain_id) if str(chain_id).isdigit() else None,
+        "status": getattr(transaction_data.get("status"), "value", transaction_data.get("status")),
+        "agent_decision": decision.value if decision else None,
+        "created_at": format_timestamp(transaction_data.get("created_at")),
+        "data": transaction_data  # Store the entire object as JSON
+    }
+
+def encode_cursor(record: Dict[str, Any]) -> str:
+    """Encode the keyset position of a record as an opaque cursor"""
+    position = json.dumps([record["created_at"], record["transaction_id"]])
+    return base64.urlsafe_b64encode(position.encode()).decode()
+
+def decode_cursor(cursor: str) -> Tuple[str, str]:
+    """Decode a cursor produced by encode_cursor"""
+    try:
+        position = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+        if (not isinstance(position, list) or len(position) != 2
+                or not all(isinstance(value, str) and value for value in position)):
+            raise ValueError("Unexpected cursor shape")
+        created_at, transaction_id = position
+        return format_timestamp(created_at), transaction_id
+    except (ValueError, TypeError, OverflowError) as e:
+        raise ValueError("Invalid cursor") from e
+
 class PersistenceService:
     _instance = None
     
@@ -23,26 +66,41 @@ class PersistenceService:
         if not hasattr(self, 'initialized') or not self.initialized:
             self.settings = get_settings()
             self.state = StateManager()
-            self.supabase = None
+            self.store: Optional[TransactionStore] = None
+            self.spool = PersistenceSpool(
+                directory=self.settings.PERSISTENCE_SPOOL_DIR,
+                segment_max_bytes=self.settings.PERSISTENCE_SPOOL_SEGMENT_MAX_BYTES,
+                segment_max_age=self.settings.PERSISTENCE_SPOOL_SEGMENT_MAX_AGE,
+                fsync=self.settings.PERSISTENCE_SPOOL_FSYNC
+            )
+            # Cleared when the store fails, set again once the spool is replayed
+            self.store_healthy = True
             self.initialized = True
     
-    async def init_supabase(self):
-        """Initialize Supabase client if not already initialized"""
-        if not self.supabase and self.settings.SUPABASE_URL and self.settings.SUPABASE_KEY:
-            self.supabase = create_client(
-                self.settings.SUPABASE_URL,
-                self.settings.SUPABASE_KEY
-            )
-            logger.info("Supabase client initialized")
-            return True
-        return self.supabase is not None
+    async def init_store(self) -> bool:
+        """Initialize the persistence store if not already initialized
+
+        PERSISTENCE_DSN selects a local SQLite/PostgreSQL store; otherwise
+        Supabase is used when configured.
+        """
+        if not self.store:
+            if self.settings.PERSISTENCE_DSN:
+                self.store = SQLTransactionStore(self.settings.PERSISTENCE_DSN)
+                logger.info("SQL persistence store initialized")
+            elif self.settings.SUPABASE_URL and self.settings.SUPABASE_KEY:
+                self.store = SupabaseTransactionStore(create_client(
+                    self.settings.SUPABASE_URL,
+                    self.settings.SUPABASE_KEY
+                ))
+                logger.info("Supabase client initialized")
+        return self.store is not None
     
     async def persist_transaction(self, transaction_id: str):
-        """Persist transaction data to Supabase"""
+        """Persist transaction data to the persistence store"""
         try:
-            supabase_available = await self.init_supabase()
-            if not supabase_available:
-                logger.warning("Supabase client not initialized, skipping persistence")
+            store_available = await self.init_store()
+            if not store_available:
+                logger.warning("Persistence store not configured, skipping persistence")
                 return False
                 
             # Get all transaction data
@@ -51,25 +109,45 @@ class PersistenceService:
                 logger.error(f"❌ Transaction {transaction_id} not found for persistence")
                 return False
             
-            # Prepare the data in the required format for Supabase
-            supabase_record = {
-                "transaction_id": transaction_id,
-                "from_address": transaction_data.get("from_address", ""),
-                "data": transaction_data  # Store the entire object as JSON
-            }
-                    
-            # Insert into Supabase
-            self.supabase.table('transactions').insert(supabase_record).execute()
-            logger.info(f"✅ Transaction {transaction_id} persisted in Supabase")
+            if transaction_data.get("persisted"):
+                # Already persisted (e.g. a redelivered message): do not overwrite it with the summary
+                return True
+
+            record = build_record(transaction_data)
+
+            # While the store is down, go straight to the spool instead of waiting on it
+            if not self.store_healthy:
+                self.spool.append(record)
+                logger.warning(f"⚠️ Transaction {transaction_id} spooled, persistence store unavailable")
+                return False
+
+            try:
+                await asyncio.wait_for(self.store.upsert(record), timeout=self.settings.PERSISTENCE_WRITE_TIMEOUT)
+            except Exception as e:
+                if not self.store.is_unavailable(e):
+                    # The store is up but refused this record: the full record stays in Redis
+                    logger.error(f"❌ Error persisting transaction {transaction_id}: {e!r}")
+                    return False
+                # Replayed later with an idempotent upsert, even if the write eventually lands
+                self.store_healthy = False
+                self.spool.append(record)
+                logger.error(f"❌ Error persisting transaction {transaction_id}, spooled for replay: {e!r}")
+                return False
+
+            logger.debug("✅ Transaction %s persisted", transaction_id, extra={"category": "persistence"})
+
+            # The store now holds the full record: keep only a summary in Redis
+            await self.state.shrink_transaction(transaction_id)
+            get_dashboard_view().apply(transaction_data)
             return True
                 
         except Exception as e:
-            logger.error(f"❌ Error persisting transaction {transaction_id} in Supabase: {e}")
+            logger.error(f"❌ Error persisting transaction {transaction_id}: {e}")
             return False
     
     async def get_transactions_data(self) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]], int]:
         """
-        Get summarized data from Redis and Supabase for the dashboard
+        Get summarized data from Redis and the persistence store for the dashboard
         
         Returns:
             Tuple with (active_transactions, completed_transactions, total_count)
@@ -81,7 +159,7 @@ class PersistenceService:
         # Get active transactions from Redis
         redis_transaction_ids = await self.state.get_all_transactions()
         for transaction_id in redis_transaction_ids:
-            transaction = await self.state.get_transaction(transaction_id)
+            transaction = await self.state.get_transaction(transaction_id, resolve_calldata=False)
             if transaction:
                 # Convert timestamps to ISO strings
                 if isinstance(transaction.get('created_at'), (int, float)):
@@ -96,29 +174,25 @@ class PersistenceService:
                 }
                 all_transactions.append(summary)
         
-        # Get historical transactions from Supabase
-        supabase_available = await self.init_supabase()
-        if supabase_available:
+        # Get historical transactions from the persistence store
+        store_available = await self.init_store()
+        if store_available:
             try:
-                # Get records from Supabase - limited to the last 100 for performance
-                response = self.supabase.table('transactions').select('transaction_id, from_address, created_at, data->status').order('created_at', desc=True).limit(100).execute()
-                
-                if response.data:
-                    for record in response.data:
-                        # Build the summary directly from the selected fields
-                        transaction_id = record.get('transaction_id')
-                        
-                        # Asegurarse que no procesamos duplicados que ya existen en Redis
-                        if transaction_id not in redis_transaction_ids:
-                            summary = {
-                                'transaction_id': transaction_id,
-                                'from_address': record.get('from_address', ''),
-                                'created_at': record.get('created_at'),
-                                'status': record.get('status')
-                            }
-                            all_transactions.append(summary)
+                # Limited to the last 100 for performance
+                records = await self.store.search({}, limit=100)
+                redis_ids = set(redis_transaction_ids)
+                for record in records:
+                    # Asegurarse que no procesamos duplicados que ya existen en Redis
+                    if record.get('transaction_id') not in redis_ids:
+                        summary = {
+                            'transaction_id': record.get('transaction_id'),
+                            'from_address': record.get('from_address', ''),
+                            'created_at': record.get('created_at'),
+                            'status': record.get('status')
+                        }
+                        all_transactions.append(summary)
             except Exception as e:
-                logger.warning(f"Error retrieving data from Supabase: {e}")
+                logger.warning(f"Error retrieving data from persistence store: {e}")
         
         # Split into active and completed
         active = [t for t in all_transactions if t.get('status') != TransactionStatus.COMPLETED]
@@ -129,10 +203,48 @@ class PersistenceService:
         completed = completed[:100]  # show the 100 most recent ones
         
         return active, completed, len(all_transactions)
+
+    async def search_transactions(
+        self,
+        filters: Dict[str, Any],
+        created_from: Optional[Any] = None,
+        created_to: Optional[Any] = None,
+        cursor: Optional[str] = None,
+        limit: int = 50,
+        include_details: bool = False,
+    ) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+        """
+        Search persisted transactions with keyset pagination, most recent first
+
+        Returns:
+            Tuple with (records, next_cursor); next_cursor is None on the last page
+        """
+        if not await self.init_store():
+            raise RuntimeError("Persistence store not configured")
+
+        # Addresses are stored lowercased
+        filters = {
+            column: value.lower() if column in ("from_address", "to_address") else value
+            for column, value in filters.items() if value is not None
+        }
+        # One extra record tells whether there is a next page
+        records = await self.store.search(
+            filters,
+            created_from=format_timestamp(created_from),
+            created_to=format_timestamp(created_to),
+            cursor=decode_cursor(cursor) if cursor else None,
+            limit=limit + 1,
+            include_details=include_details,
+        )
+        for record in records:
+            record["created_at"] = format_timestamp(record.get("created_at"))
+
+        next_cursor = encode_cursor(records[limit - 1]) if len(records) > limit else None
+        return records[:limit], next_cursor
     
     async def get_transaction_details(self, transaction_id: str) -> Optional[Dict[str, Any]]:
         """
-        Get the details of a transaction, first from Redis and then from Supabase if necessary
+        Get the details of a transaction, first from Redis and then from the persistence store if necessary
         
         Args:
             transaction_id: ID of the transaction to search for
@@ -142,21 +254,19 @@ class PersistenceService:
         """
         # First try to get from Redis (active transactions)
         transaction = await self.state.get_transaction(transaction_id)
+
+        # Persisted transactions only keep a summary in Redis
+        if transaction and transaction.get("persisted"):
+            transaction = None
         
-        # If not in Redis, search in Supabase
+        # If not in Redis, search in the persistence store
         if not transaction:
-            supabase_available = await self.init_supabase()
-            if supabase_available:
+            store_available = await self.init_store()
+            if store_available:
                 try:
-                    response = self.supabase.table('transactions')\
-                        .select('data')\
-                        .eq('transaction_id', transaction_id)\
-                        .execute()
-                    
-                    if response.data and len(response.data) > 0:
-                        transaction = response.data[0].get('data', {})
+                    transaction = await self.store.get(transaction_id)
                 except Exception as e:
-                    logger.error(f"Error retrieving transaction from Supabase: {e}")
+                    logger.error(f"Error retrieving transaction from persistence store: {e}")
         
         if not transaction:
             return None
@@ -169,6 +279,66 @@ class PersistenceService:
             
         return transaction
     
+    async def replay_spool(self) -> int:
+        """
+        Bulk upsert spooled records into the persistence store
+
+        Segments are deleted once replayed; replay stops at the first failure
+        and is retried on the next call.
+
+        Returns:
+            Number of records replayed
+        """
+        if not self.spool.has_data or not await self.init_store():
+            return 0
+
+        # Seal the segment being written so it is replayed too
+        if not self.spool.sealed_segments():
+            await self.spool.seal()
+
+        replayed = 0
+        batch_size = self.settings.PERSISTENCE_SPOOL_REPLAY_BATCH_SIZE
+        for segment in self.spool.sealed_segments():
+            records = await asyncio.to_thread(self.spool.read_segment, segment)
+            # A transaction may have been spooled more than once: keep its last record
+            records = list({record["transaction_id"]: record for record in records}.values())
+            try:
+                for start in range(0, len(records), batch_size):
+                    batch = records[start:start + batch_size]
+                    await self.store.upsert_many(batch)
+                    # Durably persisted now: keep only a summary in Redis, as for direct writes
+                    await asyncio.gather(*(
+                        self.state.shrink_transaction(record["transaction_id"]) for record in batch
+                    ))
+            except Exception as e:
+                # A record the store refuses must not stop direct writes
+                self.store_healthy = not self.store.is_unavailable(e)
+                logger.warning(f"Spool replay failed at {segment.name}, will retry: {e!r}")
+                return replayed
+
+            await asyncio.to_thread(segment.unlink)
+            replayed += len(records)
+            logger.info(f"✅ Replayed {len(records)} spooled transactions from {segment.name}")
+
+        # Records spooled meanwhile are replayed on the next call
+        self.store_healthy = True
+        return replayed
+
+    async def run_spool_replayer(self):
+        """Periodically replay the spool into the persistence store"""
+        while True:
+            try:
+                await self.replay_spool()
+            except Exception as e:
+                logger.error(f"❌ Error replaying persistence spool: {e}")
+            await asyncio.sleep(self.settings.PERSISTENCE_SPOOL_REPLAY_INTERVAL)
+
+    async def close(self):
+        """Flush the spool and release the persistence store"""
+        await self.spool.flush()
+        if self.store:
+            await self.store.close()
+
     async def listen(self):
         """Listen for persistence messages on Redis channel"""
         channel = self.settings.REDIS_CHANNELS.PERSISTENCE.value
@@ -180,7 +350,10 @@ class PersistenceService:
             async for message in pubsub.listen():
                 if message['type'] == 'message':
                     data = json.loads(message['data'])
-                    logger.info(f"📥 Received persistence message: {data}")
+                    logger.debug(
+                        "📥 Received persistence message: %s", Truncated(data),
+                        extra={"category": "pubsub"}
+                    )
                     
                     if data.get('type') == 'persist_transaction':
                         transaction_id = data.get('transaction_id')
@@ -199,7 +372,7 @@ def get_persistence_service() -> PersistenceService:
 async def run_persistence_service():
     """Run the persistence service"""
     service = get_persistence_service()
-    await service.listen()
+    await asyncio.gather(service.listen(), service.run_spool_replayer())
 
 if __name__ == "__main__":
     # This allows running the service standalone
@@ -0,0 +1,113 @@
+import asyncio
+import json
+import logging
+import os
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+SEGMENT_SUFFIX = ".jsonl"
+
+class PersistenceSpool:
+    """
+    Append-only local spool of records the persistence store could not take:
+    - append() only queues the record, so bursts never block the event loop
+    - A background writer flushes queued records to the current segment in a worker thread
+    - Segments rotate by size and age; sealed segments are replayed and then deleted
+
+    The segment state is only changed on the event loop: the worker thread just
+    appends to the segment it is given.
+    """
+    def __init__(self, directory: str, segment_max_bytes: int, segment_max_age: float, fsync: bool = True):
+        self.directory = Path(directory)
+        self.segment_max_bytes = segment_max_bytes
+        self.segment_max_age = segment_max_age
+        self.fsync = fsync
+        self._pending: List[Dict[str, Any]] = []
+        self._writer_task: Optional[asyncio.Task] = None
+        self._segment: Optional[Path] = None
+        self._segment_size = 0
+        self._segment_opened_at = 0.0
+
+    def append(self, record: Dict[str, Any]) -> None:
+        """Queue a record to be written to the spool"""
+        self._pending.append(record)
+        if self._writer_task is None or self._writer_task.done():
+            self._writer_task = asyncio.create_task(self._writer())
+
+    @property
+    def has_data(self) -> bool:
+        """Whether records are queued or stored in any segment"""
+        return bool(self._pending) or bool(self._segment_size) or bool(self.sealed_segments())
+
+    def _write(self, path: Path, records: List[Dict[str, Any]]) -> int:
+        """Append records to a segment (runs in a worker thread), returning the bytes written"""
+        path.parent.mkdir(parents=True, exist_ok=True)
+        payload = "".join(json.dumps(record) + "\n" for record in records).encode()
+        with open(path, "ab") as segment:
+            segment.write(payload)
+            segment.flush()
+            if self.fsync:
+                os.fsync(segment.fileno())
+        return len(payload)
+
+    def _rotate(self) -> None:
+        """Seal the current segment and start a new one"""
+        # Nanosecond names keep segments in creation order
+        self._segment = self.directory / f"{time.time_ns()}{SEGMENT_SUFFIX}"
+        self._segment_size = 0
+        self._segment_opened_at = time.time()
+
+    async def _writer(self):
+        """Flush queued records until the queue is empty"""
+        while self._pending:
+            records, self._pending = self._pending, []
+            if self._segment is None or self._segment_size >= self.segment_max_bytes or (
+                time.time() - self._segment_opened_at >= self.segment_max_age
+            ):
+                self._rotate()
+            try:
+                self._segment_size += await asyncio.to_thread(self._write, self._segment, records)
+            except Exception as e:
+                logger.error(f"❌ Error writing {len(records)} records to the persistence spool: {e}")
+                # Keep the records and retry later
+                self._pending = records + self._pending
+                await asyncio.sleep(1)
+
+    async def flush(self):
+        """Wait until every queued record is written"""
+        while self._writer_task and not self._writer_task.done():
+            await self._writer_task
+        if self._pending:
+            self._writer_task = asyncio.create_task(self._writer())
+            await self._writer_task
+
+    async def seal(self):
+        """Flush and seal the current segment so it can be replayed"""
+        await self.flush()
+        if self._segment_size:
+            self._segment = None
+            self._segment_size = 0
+
+    def sealed_segments(self) -> List[Path]:
+        """Segments that are no longer written to, oldest first"""
+        if not self.directory.exists():
+            return []
+        return sorted(
+            (path for path in self.directory.glob(f"*{SEGMENT_SUFFIX}") if path != self._segment),
+            key=lambda path: int(path.stem) if path.stem.isdigit() else 0
+        )
+
+    @staticmethod
+    def read_segment(path: Path) -> List[Dict[str, Any]]:
+        """Read the records of a segment, skipping a torn last line"""
+        records = []
+        with open(path, "rb") as segment:
+            for line_number, line in enumerate(segment, start=1):
+                try:
+                    records.append(json.loads(line))
+                except json.JSONDecodeError:
+                    logger.warning(f"Skipping corrupt record at {path.name}:{line_number}")
+        return records
@@ -0,0 +1,183 @@
+import asyncio
+import json
+import logging
+import time
+from collections import deque
+from typing import Any, Deque, Dict, Optional, Tuple
+from src.config import get_settings
+from src.constants import Priority
+
+logger = logging.getLogger(__name__)
+
+def lane_channel(channel: str, lane: Priority) -> str:
+    """Channel carrying the messages of one lane, e.g. sentinels:input:high"""
+    return f"{channel}:{Priority(lane).value}"
+
+def lane_channels(channel: str) -> Dict[str, Priority]:
+    """Lane channels of a base channel, mapped to their lane"""
+    return {lane_channel(channel, lane): lane for lane in Priority}
+
+def _parse_value(value: Any) -> int:
+    if isinstance(value, str) and value.lower().startswith("0x"):
+        return int(value, 16)
+    return int(value or 0)
+
+def resolve_priority(data: Dict[str, Any], api_key: Optional[str] = None) -> Priority:
+    """
+    Lane of a transaction, from the first rule that applies:
+    1. The priority given in the submission
+    2. The lane of the caller's API key (PRIORITY_API_KEY_LANES)
+    3. High priority when value >= PRIORITY_HIGH_VALUE (wei)
+    4. The lane of its chain (PRIORITY_CHAIN_LANES)
+    5. Normal priority
+    """
+    settings = get_settings()
+    if data.get("priority"):
+        return Priority(data["priority"])
+    if api_key and api_key in settings.PRIORITY_API_KEY_LANES:
+        return Priority(settings.PRIORITY_API_KEY_LANES[api_key])
+    try:
+        if _parse_value(data.get("value")) >= settings.PRIORITY_HIGH_VALUE:
+            return Priority.HIGH
+    except (TypeError, ValueError):
+        pass
+    try:
+        chain_id = int(data.get("chainId"))
+    except (TypeError, ValueError):
+        chain_id = None
+    if chain_id in settings.PRIORITY_CHAIN_LANES:
+        return Priority(settings.PRIORITY_CHAIN_LANES[chain_id])
+    return Priority.NORMAL
+
+class LaneScheduler:
+    """
+    Local per-lane queues consumed with smooth weighted round robin:
+    with weights high=8, normal=3, low=1 and every lane backlogged, 8 of each
+    12 items come from the high lane and low priority is never starved.
+    Empty lanes are skipped, so a lone lane gets the full throughput.
+    """
+    def __init__(self, weights: Dict[str, int]):
+        self.weights = {lane: max(int(weights.get(lane.value, 1)), 1) for lane in Priority}
+        self._queues: Dict[Priority, Deque[Any]] = {lane: deque() for lane in Priority}
+        self._credit = {lane: 0 for lane in Priority}
+        self._not_empty = asyncio.Event()
+
+    def put(self, lane: Priority, item: Any):
+        self._queues[lane].append(item)
+        self._not_empty.set()
+
+    def depth(self) -> Dict[str, int]:
+        return {lane.value: len(queue) for lane, queue in self._queues.items()}
+
+    def __len__(self) -> int:
+        return sum(len(queue) for queue in self._queues.values())
+
+    def get_nowait(self) -> Optional[Tuple[Priority, Any]]:
+        """Pop the next item, or None if every lane is empty"""
+        backlogged = [lane for lane, queue in self._queues.items() if queue]
+        if not backlogged:
+            self._not_empty.clear()
+            return None
+        total = sum(self.weights[lane] for lane in backlogged)
+        for lane in backlogged:
+            self._credit[lane] += self.weights[lane]
+        lane = max(backlogged, key=lambda candidate: self._credit[candidate])
+        self._credit[lane] -= total
+        # Idle lanes do not bank credit while empty
+        for idle in Priority:
+            if not self._queues[idle]:
+                self._credit[idle] = 0
+        return lane, self._queues[lane].popleft()
+
+    async def get(self, timeout: Optional[float] = None) -> Optional[Tuple[Priority, Any]]:
+        """Wait for and pop the next item, or return None after `timeout` seconds"""
+        loop = asyncio.get_running_loop()
+        expires_at = None if timeout is None else loop.time() + timeout
+        while True:
+            entry = self.get_nowait()
+            if entry is not None:
+                return entry
+            if expires_at is None:
+                await self._not_empty.wait()
+                continue
+            remaining = expires_at - loop.time()
+            if remaining <= 0:
+                return None
+            try:
+                await asyncio.wait_for(self._not_empty.wait(), remaining)
+            except asyncio.TimeoutError:
+                return None
+
+async def read_lanes(pubsub, channels: Dict[str, Priority], scheduler: LaneScheduler):
+    """Move messages from lane channel (or channel pattern) subscriptions into the scheduler queues"""
+    async for message in pubsub.listen():
+        if message['type'] == 'message':
+            scheduler.put(channels[message['channel']], json.loads(message['data']))
+        elif message['type'] == 'pmessage':
+            scheduler.put(channels[message['pattern']], json.loads(message['data']))
+
+class LaneMetrics:
+    """
+    In-process lane metrics:
+    - Queue depth of every registered consumer (sentinels, agent)
+    - Queue wait and end-to-end latency per lane, over the last
+      LANE_METRICS_WINDOW samples
+    """
+    _instance = None
+
+    def __new__(cls):
+        if cls._instance is None:
+            cls._instance = super().__new__(cls)
+            cls._instance.initialized = False
+        return cls._instance
+
+    def __init__(self):
+        if not hasattr(self, 'initialized') or not self.initialized:
+            self.settings = get_settings()
+            self._schedulers: Dict[str, LaneScheduler] = {}
+            self._waits: Dict[Priority, Deque[float]] = {
+                lane: deque(maxlen=self.settings.LANE_METRICS_WINDOW) for lane in Priority
+            }
+            self._latencies: Dict[Priority, Deque[float]] = {
+                lane: deque(maxlen=self.settings.LANE_METRICS_WINDOW) for lane in Priority
+            }
+            self.initialized = True
+
+    def register(self, consumer: str, scheduler: LaneScheduler):
+        self._schedulers[consumer] = scheduler
+
+    def record_wait(self, lane: Priority, enqueued_at: Optional[float]):
+        """Record the time a message spent queued before being processed"""
+        if enqueued_at:
+            self._waits[lane].append(time.time() - float(enqueued_at))
+
+    def record_latency(self, lane: Priority, seconds: float):
+        """Record the time from submission to verdict of a transaction"""
+        self._latencies[lane].append(seconds)
+
+    @staticmethod
+    def _percentiles(samples: Deque[float]) -> Dict[str, Optional[float]]:
+        ordered = sorted(samples)
+        if not ordered:
+            return {"p50": None, "p99": None}
+        return {
+            "p50": ordered[int(0.50 * (len(ordered) - 1))],
+            "p99": ordered[int(0.99 * (len(ordered) - 1))],
+        }
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Depth, queue wait and latency of every lane"""
+        lanes = {}
+        for lane in Priority:
+            consumers = {name: scheduler.depth()[lane.value] for name, scheduler in self._schedulers.items()}
+            lanes[lane.value] = {
+                "depth": sum(consumers.values()),
+                "consumers": consumers,
+                "wait": self._percentiles(self._waits[lane]),
+                "latency": {**self._percentiles(self._latencies[lane]), "count": len(self._latencies[lane])},
+            }
+        return lanes
+
+# Singleton to access the lane metrics
+def get_lane_metrics() -> LaneMetrics:
+    return LaneMetrics()
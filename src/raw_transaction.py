@@ -0,0 +1,67 @@
+"""
+Decoding of signed raw transactions (eth_sendRawTransaction), so they can be screened
+
+Supports legacy (EIP-155 or not) and typed transactions (EIP-2930, EIP-1559,
+EIP-4844 and EIP-7702). The sender is recovered from the signature with
+eth-account (libsecp256k1 through coincurve).
+"""
+from typing import Any, Dict, Union
+import rlp
+from eth_account import Account
+from eth_account.typed_transactions import TypedTransaction
+from eth_keys.exceptions import BadSignature, ValidationError
+from hexbytes import HexBytes
+
+class RawTransactionError(ValueError):
+    """The raw transaction cannot be decoded"""
+
+# Errors raised by rlp / eth-account on malformed transactions or signatures
+_DECODING_ERRORS = (ValueError, TypeError, IndexError, rlp.exceptions.RLPException, BadSignature, ValidationError)
+
+def _legacy_fields(raw: bytes) -> Dict[str, Any]:
+    # [nonce, gasPrice, gas, to, value, data, v, r, s]
+    fields = rlp.decode(raw)
+    if not isinstance(fields, list) or len(fields) != 9 or not all(isinstance(field, bytes) for field in fields):
+        raise RawTransactionError("Unexpected legacy transaction fields")
+    v = int.from_bytes(fields[6], "big")
+    return {
+        # Pre-EIP-155 signatures (v = 27/28) carry no chainId
+        "chainId": (v - 35) // 2 if v >= 35 else None,
+        "to": fields[3],
+        "value": int.from_bytes(fields[4], "big"),
+        "data": fields[5],
+    }
+
+def decode_raw_transaction(raw: Union[str, bytes]) -> Dict[str, Any]:
+    """
+    Decode a signed raw transaction and recover its sender (CPU bound, run it off the event loop)
+
+    Returns:
+        Dict with chainId (None for pre-EIP-155 legacy transactions), from, to
+        ("" for contract creations), value (int) and data (hex)
+    """
+    if isinstance(raw, str):
+        try:
+            raw = bytes.fromhex(raw[2:] if raw.lower().startswith("0x") else raw)
+        except ValueError as e:
+            raise RawTransactionError("Raw transaction is not hex encoded") from e
+    if not raw:
+        raise RawTransactionError("Empty raw transaction")
+
+    try:
+        if raw[0] >= 0xc0:
+            fields = _legacy_fields(raw)
+        else:
+            transaction = TypedTransaction.from_bytes(HexBytes(raw)).as_dict()
+            fields = {key: transaction[key] for key in ("chainId", "to", "value", "data")}
+        sender = Account.recover_transaction(raw)
+    except _DECODING_ERRORS as e:
+        raise RawTransactionError(str(e) or type(e).__name__) from e
+
+    return {
+        "chainId": fields["chainId"],
+        "from": sender.lower(),
+        "to": "0x" + bytes(fields["to"]).hex() if fields["to"] else "",
+        "value": fields["value"],
+        "data": "0x" + bytes(fields["data"]).hex(),
+    }
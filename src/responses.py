@@ -0,0 +1,57 @@
+import gzip
+import json
+from typing import Any, Optional
+import orjson
+from fastapi.responses import JSONResponse
+from src.config import get_settings
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+def dumps(content: Any) -> bytes:
+    """
+    Serialize content to JSON bytes with orjson
+
+    orjson rejects integers beyond 64 bits, which wei amounts can exceed:
+    those payloads fall back to the standard library encoder.
+    """
+    try:
+        return orjson.dumps(content, option=orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY)
+    except TypeError:
+        return json.dumps(content, separators=(",", ":"), default=str).encode()
+
+class FastJSONResponse(JSONResponse):
+    """
+    JSON response serialized with orjson
+
+    Returning it from an endpoint bypasses response_model validation, so it is
+    meant for data the service wrote itself.
+    """
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
+
+def negotiate_encoding(accept_encoding: str) -> Optional[str]:
+    """Pick the content encoding for a response: brotli, then gzip, else None"""
+    accepted = set()
+    for coding in accept_encoding.split(","):
+        name, _, params = coding.partition(";")
+        try:
+            quality = float(params.strip().removeprefix("q=")) if params.strip().startswith("q=") else 1.0
+        except ValueError:
+            quality = 1.0
+        if quality > 0:
+            accepted.add(name.strip().lower())
+    if brotli is not None and "br" in accepted:
+        return "br"
+    if "gzip" in accepted:
+        return "gzip"
+    return None
+
+def compress(body: bytes, encoding: str) -> bytes:
+    """Compress a body with brotli or gzip at RESPONSE_COMPRESSION_LEVEL"""
+    level = get_settings().RESPONSE_COMPRESSION_LEVEL
+    if encoding == "br":
+        return brotli.compress(body, quality=level)
+    return gzip.compress(body, compresslevel=min(level, 9))
@@ -0,0 +1,131 @@
+import asyncio
+import hashlib
+import json
+import logging
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Tuple
+from src.config import get_settings
+from src.state_manager import StateManager
+
+logger = logging.getLogger(__name__)
+
+def result_cache_key(sentinel_name: str, cache_key: str) -> str:
+    # Hash tag on the digest, like calldata keys
+    digest = hashlib.sha256(f"{sentinel_name}:{cache_key}".encode()).hexdigest()
+    return f"sentinel_cache:{{{digest}}}"
+
+def is_cacheable(result: Any) -> bool:
+    """Only successful analyses are reused"""
+    return isinstance(result, dict) and "error" not in result and result.get("status") != "error"
+
+class ResultCache:
+    """
+    Cache of sentinel results keyed by the part of the transaction they depend on:
+    - An in-process LRU answers repeated lookups without a round trip
+    - Redis shares results across processes until their TTL expires
+    - Concurrent lookups of the same key wait for a single analysis (single flight)
+    """
+    _instance = None
+
+    def __new__(cls):
+        if cls._instance is None:
+            cls._instance = super().__new__(cls)
+            cls._instance.initialized = False
+        return cls._instance
+
+    def __init__(self):
+        if not hasattr(self, 'initialized') or not self.initialized:
+            self.settings = get_settings()
+            self.state = StateManager()
+            self._local: OrderedDict[str, Tuple[float, Any]] = OrderedDict()
+            self._in_flight: Dict[str, asyncio.Future] = {}
+            self.initialized = True
+
+    def _local_get(self, key: str) -> Tuple[bool, Any]:
+        entry = self._local.get(key)
+        if entry is None:
+            return False, None
+        expires_at, result = entry
+        if expires_at < time.time():
+            del self._local[key]
+            return False, None
+        self._local.move_to_end(key)
+        return True, result
+
+    def _local_set(self, key: str, result: Any, ttl: float):
+        self._local[key] = (time.time() + ttl, result)
+        self._local.move_to_end(key)
+        while len(self._local) > self.settings.SENTINEL_CACHE_MAX_SIZE:
+            self._local.popitem(last=False)
+
+    async def _redis_get(self, key: str) -> Tuple[bool, Any]:
+        try:
+            redis = await self.state.get_redis()
+            async with redis.pipeline(transaction=False) as pipe:
+                pipe.get(key)
+                pipe.pttl(key)
+                value, ttl_ms = await pipe.execute()
+        except Exception as e:
+            # The cache must never fail an analysis
+            logger.warning(f"Error reading sentinel result cache: {e}")
+            return False, None
+        if value is None:
+            return False, None
+        result = json.loads(value)
+        if ttl_ms and ttl_ms > 0:
+            self._local_set(key, result, ttl_ms / 1000)
+        return True, result
+
+    async def _redis_set(self, key: str, result: Any, ttl: float):
+        try:
+            redis = await self.state.get_redis()
+            await redis.set(key, json.dumps(result), px=max(int(ttl * 1000), 1))
+        except Exception as e:
+            logger.warning(f"Error writing sentinel result cache: {e}")
+
+    async def _compute(self, key: str, ttl: float, analyze: Callable[[], Awaitable[Any]]) -> Tuple[Any, bool]:
+        hit, result = await self._redis_get(key)
+        if hit:
+            return result, True
+        result = await analyze()
+        if is_cacheable(result):
+            self._local_set(key, result, ttl)
+            await self._redis_set(key, result, ttl)
+        return result, False
+
+    async def get_or_analyze(
+        self, sentinel_name: str, cache_key: str, ttl: float, analyze: Callable[[], Awaitable[Any]]
+    ) -> Tuple[Any, bool]:
+        """
+        Return the cached result for a sentinel and cache key, or run the analysis
+
+        Returns:
+            Tuple of (result, cache_hit). Callers joining an analysis already in
+            flight for the same key count as hits.
+        """
+        key = result_cache_key(sentinel_name, cache_key)
+        hit, result = self._local_get(key)
+        if hit:
+            return result, True
+
+        in_flight = self._in_flight.get(key)
+        if in_flight is not None:
+            # Shielded so a caller giving up (e.g. at its deadline) does not cancel the others
+            result, _ = await asyncio.shield(in_flight)
+            return result, True
+
+        task = asyncio.create_task(self._compute(key, ttl, analyze))
+        self._in_flight[key] = task
+        task.add_done_callback(lambda done: self._finish(key, done))
+        return await asyncio.shield(task)
+
+    def _finish(self, key: str, task: asyncio.Task):
+        self._in_flight.pop(key, None)
+        # Retrieve the exception even when every caller gave up waiting
+        if not task.cancelled():
+            task.exception()
+
+# Singleton to access the sentinel result cache
+def get_result_cache() -> ResultCache:
+    return ResultCache()
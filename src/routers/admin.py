@@ -0,0 +1,84 @@
+from fastapi import APIRouter, Depends, Header, HTTPException, Query
+from fastapi.responses import PlainTextResponse, StreamingResponse
+from src.config import get_settings
+from src.diagnostics import get_loop_monitor, sample_stacks
+from src.export import EXPORT_FORMATS, pa, stream_export
+from src.persistence_service import get_persistence_service
+from src.transaction_store import format_timestamp
+from typing import Optional
+import asyncio
+import logging
+import secrets
+
+logger = logging.getLogger(__name__)
+
+def require_admin(x_admin_token: Optional[str] = Header(default=None)):
+    """Admin endpoints need the X-Admin-Token header to match ADMIN_TOKEN, and do not exist without it"""
+    token = get_settings().ADMIN_TOKEN
+    if not token:
+        raise HTTPException(status_code=404, detail="Not Found")
+    if not x_admin_token or not secrets.compare_digest(x_admin_token, token):
+        raise HTTPException(status_code=403, detail="Invalid admin token")
+
+router = APIRouter(prefix="/admin", dependencies=[Depends(require_admin)])
+
+# One profile at a time: concurrent profiles would sample each other
+_profile_lock = asyncio.Lock()
+
+@router.get("/loop")
+async def get_loop_lag():
+    """Get the event loop lag percentiles and the last time the loop was blocked"""
+    return get_loop_monitor().snapshot()
+
+@router.get("/profile", response_class=PlainTextResponse)
+async def get_profile(
+    seconds: float = Query(default=10.0, gt=0),
+    interval_ms: float = Query(default=5.0, ge=1, le=1000)
+):
+    """
+    Sample the stacks of the running process and return them as folded stacks
+
+    e.g. `curl -H "X-Admin-Token: ..." .../admin/profile?seconds=30 > profile.folded`,
+    then `flamegraph.pl profile.folded > profile.svg` or open it in speedscope.
+    """
+    seconds = min(seconds, get_settings().PROFILE_MAX_SECONDS)
+    if _profile_lock.locked():
+        raise HTTPException(status_code=409, detail="A profile is already running")
+    async with _profile_lock:
+        logger.info(f"🔍 Profiling for {seconds}s every {interval_ms}ms")
+        folded = await asyncio.to_thread(sample_stacks, seconds, interval_ms / 1000)
+    return PlainTextResponse(
+        folded,
+        headers={"Content-Disposition": 'attachment; filename="profile.folded"'}
+    )
+
+@router.get("/export")
+async def export_transactions(
+    format: str = Query(default="parquet", pattern="^(parquet|arrow)$"),
+    created_from: Optional[str] = None,
+    created_to: Optional[str] = None,
+    sentinels: Optional[str] = Query(default=None, description="Comma-separated sentinels to flatten")
+):
+    """Stream the persisted transactions of a time range as Parquet or Arrow IPC"""
+    if pa is None:
+        raise HTTPException(status_code=501, detail="pyarrow is not installed (export extra)")
+    try:
+        created_from, created_to = format_timestamp(created_from), format_timestamp(created_to)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    persistence = get_persistence_service()
+    if not await persistence.init_store():
+        raise HTTPException(status_code=503, detail="Persistence store not configured")
+
+    extension = "parquet" if format == "parquet" else "arrows"
+    return StreamingResponse(
+        stream_export(
+            persistence.store,
+            export_format=format,
+            created_from=created_from,
+            created_to=created_to,
+            sentinel_names=sentinels.split(",") if sentinels else None,
+        ),
+        media_type=EXPORT_FORMATS[format],
+        headers={"Content-Disposition": f'attachment; filename="transactions.{extension}"'}
+    )
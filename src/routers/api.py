@@ -1,10 +1,68 @@
-from fastapi import APIRouter, HTTPException
+from datetime import datetime
+from fastapi import APIRouter, Header, HTTPException, Query, Request, Response
 from src.core import core
-from src.schemas.api import TransactionRequest, TransactionResponse, DashboardResponse, TransactionDetail, TransactionSummary
+from src.dashboard_view import get_dashboard_view
+from src.hedging import get_hedging_policy
+from src.config import get_settings
+from src.logging_config import Truncated
+from src.priority_lanes import get_lane_metrics, resolve_priority
+from src.responses import FastJSONResponse, negotiate_encoding
+from src.constants import AgentDecision, TransactionStatus
+from src.schemas.api import (
+    TransactionRequest,
+    TransactionResponse,
+    DashboardResponse,
+    TransactionDetail,
+    StatsResponse,
+    TransactionSearchResponse,
+    LaneStats,
+    HedgingStats,
+)
+from src.stats_service import get_stats_service
+from typing import Dict, Optional
+import asyncio
 import logging
+import time
 
 logger = logging.getLogger(__name__)
-router = APIRouter(prefix="/api")
+router = APIRouter(prefix="/api", default_response_class=FastJSONResponse)
+
+def _detail_payload(transaction: dict) -> dict:
+    """Project a stored transaction onto the TransactionDetail fields without validating it"""
+    payload = {field: transaction.get(field) for field in TransactionDetail.model_fields}
+    if isinstance(payload["value"], str) and payload["value"].isdigit():
+        payload["value"] = int(payload["value"])
+    payload["validations"] = [
+        {
+            "name": validation.get("name"),
+            "status": validation.get("status"),
+            "result": validation.get("result"),
+        }
+        for validation in payload["validations"] or []
+    ]
+    return payload
+
+async def _cancel_on_disconnect(request: Request, coroutine):
+    """
+    Run a coroutine, cancelling it if the client disconnects before it finishes
+
+    Raises HTTPException 499 (client closed request) when the client is gone.
+    """
+    task = asyncio.create_task(coroutine)
+    try:
+        while True:
+            done, _ = await asyncio.wait({task}, timeout=get_settings().CLIENT_DISCONNECT_POLL_INTERVAL)
+            if done:
+                return task.result()
+            if await request.is_disconnected():
+                logger.info("Client disconnected, cancelling its transaction")
+                task.cancel()
+                await asyncio.gather(task, return_exceptions=True)
+                raise HTTPException(status_code=499, detail="Client closed request")
+    finally:
+        # Cancellation of the request itself also cancels the analysis
+        if not task.done():
+            task.cancel()
 
 @router.get("/health")
 async def health_check():
@@ -12,26 +70,105 @@ async def health_check():
     return {"status": "healthy"}
 
 @router.get("/dashboard", response_model=DashboardResponse)
-async def get_dashboard():
-    """Get summarized dashboard statistics and transaction headers"""
+async def get_dashboard(request: Request):
+    """Get summarized dashboard statistics and transaction headers
+
+    Served from the in-memory dashboard view; unchanged polls get a 304.
+    """
+    try:
+        view = get_dashboard_view()
+        await view.ensure_seeded()
+        # The total is shared by every replica: one HGET per poll keeps it exact
+        view.set_total(await get_stats_service().get_total("transactions"))
+        view.prune_expired()
+
+        etag = view.etag
+        if_none_match = request.headers.get("if-none-match", "")
+        if etag in (tag.strip().removeprefix("W/") for tag in if_none_match.split(",")):
+            return Response(status_code=304, headers={"ETag": etag})
+
+        # Compressed once per version here, so the compression middleware passes it through
+        body, encoding = view.render_encoded(negotiate_encoding(request.headers.get("accept-encoding", "")))
+        headers = {"ETag": etag, "Cache-Control": "no-cache", "Vary": "Accept-Encoding"}
+        if encoding:
+            headers["Content-Encoding"] = encoding
+        return Response(content=body, media_type="application/json", headers=headers)
+    except Exception as e:
+        logger.error(f"Error in dashboard endpoint: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+@router.get("/stats", response_model=StatsResponse)
+async def get_stats(start: Optional[float] = None, end: Optional[float] = None, granularity: str = "hour"):
+    """Get time-bucketed transaction counters between two Unix timestamps (default: last 24 hours)"""
+    end = end if end is not None else time.time()
+    start = start if start is not None else end - 86400
+    try:
+        stats = get_stats_service()
+        buckets = await stats.get_series(start, end, granularity)
+        totals = await stats.get_totals()
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        logger.error(f"Error in stats endpoint: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+    return FastJSONResponse({
+        "granularity": granularity,
+        "start": start,
+        "end": end,
+        "totals": totals,
+        "buckets": buckets,
+    })
+
+@router.get("/lanes", response_model=Dict[str, LaneStats])
+async def get_lanes():
+    """Get the queue depth, queue wait and end-to-end latency of each priority lane"""
+    return FastJSONResponse(get_lane_metrics().snapshot())
+
+@router.get("/hedging", response_model=HedgingStats)
+async def get_hedging():
+    """Get the share of hedged sentinel requests and the hedge threshold of each sentinel"""
+    return FastJSONResponse(get_hedging_policy().snapshot())
+
+@router.get("/transactions", response_model=TransactionSearchResponse)
+async def search_transactions(
+    from_address: Optional[str] = None,
+    to_address: Optional[str] = None,
+    status: Optional[TransactionStatus] = None,
+    agent_decision: Optional[AgentDecision] = None,
+    chainId: Optional[int] = None,
+    created_from: Optional[datetime] = None,
+    created_to: Optional[datetime] = None,
+    cursor: Optional[str] = None,
+    limit: int = Query(50, ge=1),
+    include_details: bool = False,
+):
+    """Search persisted transactions, most recent first, with cursor pagination"""
     try:
         from src.persistence_service import get_persistence_service
         persistence = get_persistence_service()
-        
-        # Get summarized dashboard data
-        active_transactions_data, completed_transactions_data, total_count = await persistence.get_transactions_data()
-        
-        # Convert data to Pydantic objects
-        active_transactions = [TransactionSummary(**tx) for tx in active_transactions_data]
-        completed_transactions = [TransactionSummary(**tx) for tx in completed_transactions_data]
-        
-        return DashboardResponse(
-            total_transactions=total_count,
-            active_transactions=active_transactions,
-            completed_transactions=completed_transactions
+
+        items, next_cursor = await persistence.search_transactions(
+            {
+                "from_address": from_address,
+                "to_address": to_address,
+                "status": status.value if status else None,
+                "agent_decision": agent_decision.value if agent_decision else None,
+                "chain_id": chainId,
+            },
+            created_from=created_from,
+            created_to=created_to,
+            cursor=cursor,
+            limit=min(limit, get_settings().TRANSACTIONS_PAGE_MAX_SIZE),
+            include_details=include_details,
         )
+        return FastJSONResponse({"items": items, "next_cursor": next_cursor})
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except RuntimeError as e:
+        raise HTTPException(status_code=503, detail=str(e))
     except Exception as e:
-        logger.error(f"Error in dashboard endpoint: {e}")
+        logger.error(f"Error searching transactions: {e}")
         raise HTTPException(status_code=500, detail=str(e))
 
 @router.get("/transaction/{transaction_id}", response_model=TransactionDetail)
@@ -46,25 +183,40 @@ async def get_transaction(transaction_id: str):
         
         if not transaction:
             raise HTTPException(status_code=404, detail="Transaction not found")
-            
-        return TransactionDetail(**transaction)
+
+        # Records are written by the service itself: serialize without re-validation
+        return FastJSONResponse(_detail_payload(transaction))
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Error getting transaction details: {e}")
         raise HTTPException(status_code=500, detail=str(e))
 
 @router.post("/transaction", response_model=TransactionResponse)
-async def process_transaction(request: TransactionRequest):
+async def process_transaction(
+    transaction: TransactionRequest,
+    request: Request,
+    x_api_key: Optional[str] = Header(default=None),
+):
+    """Analyze a transaction and wait for the verdict
+
+    The analysis stops at the request timeout/deadline, and is cancelled if the client disconnects.
+    Its priority lane is the given one, or derived from the API key tier, value and chainId.
+    """
     try:
-        data = request.model_dump()
-        logger.info(f"⚡ Processing transaction: {data}")
+        data = transaction.model_dump()
+        data["priority"] = resolve_priority(data, api_key=x_api_key).value
+        logger.debug("⚡ Processing transaction: %s", Truncated(data), extra={"category": "request"})
         
-        result = await core.analyze_transaction(data)
+        result = await _cancel_on_disconnect(request, core.analyze_transaction(data))
         return TransactionResponse(
             transaction_id=result.get("transaction_id"),
             status=result.get("status"),
             result=result
         )
         
+    except HTTPException:
+        raise
     except TimeoutError as e:
         logger.error(f"Timeout: {e}")
         raise HTTPException(status_code=408, detail=str(e))
@@ -1,28 +1,249 @@
-from fastapi import APIRouter, HTTPException
-from src.core import core
-from src.schemas.rpc import RPCRequest, RPCResponse
+import asyncio
+import json
 import logging
+from typing import Any, Dict, List, Optional, Union
+from fastapi import APIRouter, Header, Request, Response
+from pydantic import ValidationError
+from src.config import get_settings
+from src.logging_config import Truncated
+from src.constants import RPCErrorCode
+from src.core import core
+from src.priority_lanes import resolve_priority
+from src.raw_transaction import RawTransactionError, decode_raw_transaction
+from src.responses import FastJSONResponse
+from src.rpc_proxy import get_rpc_proxy
+from src.schemas.api import TransactionRequest
+from src.schemas.rpc import RPCRequest, RPCResponse, RPCError
 
 logger = logging.getLogger(__name__)
 router = APIRouter(prefix="/rpc")
 
-@router.post("/transaction", response_model=RPCResponse)
-async def process_transaction(request: RPCRequest):
+# Methods whose transaction is screened by the sentinels
+SCREENING_METHODS = {
+    "eth_sendTransaction",
+    "eth_signTransaction",
+    "eth_sendRawTransaction",
+    "baiby_analyzeTransaction",
+}
+# Methods submitting transactions that cannot be screened: never forwarded to the upstream node
+UNSCREENABLE_METHODS = {
+    "eth_sendRawTransactionConditional",
+    "eth_sendPrivateTransaction",
+    "eth_sendPrivateRawTransaction",
+    "eth_sendBundle",
+}
+
+class RPCException(Exception):
+    """Error mapped to a JSON-RPC error object"""
+    def __init__(self, code: RPCErrorCode, message: str, data: Any = None):
+        super().__init__(message)
+        self.code = code
+        self.message = message
+        self.data = data
+
+def _error_response(request_id: Optional[Union[str, int]], code: RPCErrorCode, message: str, data: Any = None) -> Dict[str, Any]:
+    return RPCResponse(id=request_id, error=RPCError(code=code, message=message, data=data)).to_dict()
+
+def _parse_quantity(value: Any) -> int:
+    """Parse a JSON-RPC quantity, either hex encoded or decimal"""
+    if isinstance(value, str) and value.lower().startswith("0x"):
+        return int(value, 16)
+    return int(value)
+
+async def _transaction_from_raw(params: Union[list, dict]) -> dict:
+    """Build an analysis request from the signed transaction of eth_sendRawTransaction"""
+    raw = params[0] if isinstance(params, list) and params else None
+    if not isinstance(raw, str):
+        raise RPCException(RPCErrorCode.INVALID_PARAMS, "Expected a signed raw transaction")
+    try:
+        # Sender recovery is CPU bound: keep it off the event loop
+        decoded = await asyncio.to_thread(decode_raw_transaction, raw)
+    except RawTransactionError as e:
+        # What cannot be decoded cannot be screened
+        raise RPCException(RPCErrorCode.TRANSACTION_REJECTED, "Transaction rejected: undecodable raw transaction", str(e))
+
+    # Pre-EIP-155 transactions carry no chainId
+    chain_id = decoded["chainId"]
+    try:
+        return TransactionRequest(
+            chainId=chain_id if chain_id is not None else get_settings().RPC_DEFAULT_CHAIN_ID,
+            from_address=decoded["from"],
+            to_address=decoded["to"],
+            data=decoded["data"],
+            value=str(decoded["value"]),
+        ).model_dump()
+    except ValidationError as e:
+        raise RPCException(RPCErrorCode.INVALID_PARAMS, "Invalid transaction params", str(e))
+
+def _transaction_from_params(method: str, params: Union[list, dict]) -> dict:
+    """Build an analysis request from the params of a screening method"""
+    if isinstance(params, list):
+        if not params or not isinstance(params[0], dict):
+            raise RPCException(RPCErrorCode.INVALID_PARAMS, "Expected a transaction object")
+        params = params[0]
+
     try:
-        data = request.model_dump()
-        logger.info(f"⚡ Processing transaction: {data}")
-        
-        result = await core.analyze_transaction(data)
-
-        return RPCResponse(
-            transaction_id=result.get("transaction_id"),
-            status="completed",
-            result=result
+        if method == "baiby_analyzeTransaction":
+            # Same payload as POST /api/transaction
+            return TransactionRequest(**params).model_dump()
+
+        # eth_* transaction object
+        chain_id = params.get("chainId", get_settings().RPC_DEFAULT_CHAIN_ID)
+        return TransactionRequest(
+            chainId=_parse_quantity(chain_id),
+            from_address=params.get("from"),
+            to_address=params.get("to") or "",
+            data=params.get("data") or params.get("input") or "0x",
+            value=str(_parse_quantity(params.get("value", 0))),
+        ).model_dump()
+    except (ValidationError, TypeError, ValueError) as e:
+        raise RPCException(RPCErrorCode.INVALID_PARAMS, "Invalid transaction params", str(e))
+
+def _verdict(transaction: dict) -> Dict[str, Any]:
+    """Agent verdict of an analyzed transaction, without the internal record"""
+    agent_result = next(
+        (validation.get("result") or {} for validation in transaction.get("validations", [])
+         if validation.get("name") == "agent"),
+        {}
+    )
+    return {
+        "transaction_id": transaction.get("transaction_id"),
+        "approved": bool(agent_result.get("approved")),
+        "risk_level": agent_result.get("risk_level"),
+        "warnings": agent_result.get("warnings", []),
+    }
+
+def _ensure_approved(verdict: Dict[str, Any]):
+    """Raise a JSON-RPC error unless the agent approved the transaction"""
+    if not verdict["approved"]:
+        raise RPCException(
+            RPCErrorCode.TRANSACTION_REJECTED,
+            "Transaction rejected",
+            {key: verdict[key] for key in ("transaction_id", "risk_level", "warnings")}
         )
-        
+
+async def _execute(rpc_request: RPCRequest, api_key: Optional[str] = None) -> Any:
+    """Execute a single JSON-RPC call and return its result"""
+    if rpc_request.method not in SCREENING_METHODS:
+        raise RPCException(RPCErrorCode.METHOD_NOT_FOUND, f"Method {rpc_request.method} not found")
+
+    if rpc_request.method == "eth_sendRawTransaction":
+        data = await _transaction_from_raw(rpc_request.params)
+    else:
+        data = _transaction_from_params(rpc_request.method, rpc_request.params)
+    data["priority"] = resolve_priority(data, api_key=api_key).value
+    transaction = await core.analyze_transaction(data)
+    if rpc_request.method == "baiby_analyzeTransaction":
+        # Same result as POST /api/transaction
+        return transaction
+
+    verdict = _verdict(transaction)
+    if not get_settings().RPC_PROXY_ENABLED:
+        return verdict
+
+    # Proxy mode: only approved transactions reach the upstream node
+    _ensure_approved(verdict)
+    response = (await get_rpc_proxy().forward([rpc_request.model_dump()]))[0]
+    if "error" in response:
+        error = response["error"]
+        raise RPCException(error.get("code", RPCErrorCode.INTERNAL_ERROR), error.get("message", ""), error.get("data"))
+    return response["result"]
+
+def _is_pass_through(entry: Any) -> bool:
+    """Whether a batch entry is forwarded to the upstream node without screening"""
+    return (
+        isinstance(entry, dict)
+        and isinstance(entry.get("method"), str)
+        and entry["method"] not in SCREENING_METHODS
+        and entry["method"] not in UNSCREENABLE_METHODS
+        and entry.get("jsonrpc") == "2.0"
+    )
+
+async def _handle_batch(entries: List[Any], api_key: Optional[str] = None) -> List[Optional[Dict[str, Any]]]:
+    """Handle JSON-RPC request objects concurrently, keeping their order"""
+    if not get_settings().RPC_PROXY_ENABLED:
+        return await asyncio.gather(*(_handle_entry(entry, api_key) for entry in entries))
+
+    # Proxy mode: pass-through calls are pipelined to the upstream node in one batch
+    pass_through = [index for index, entry in enumerate(entries) if _is_pass_through(entry)]
+    screened = [index for index, entry in enumerate(entries) if not _is_pass_through(entry)]
+
+    async def forward() -> List[Dict[str, Any]]:
+        if not pass_through:
+            return []
+        try:
+            return await get_rpc_proxy().forward([entries[index] for index in pass_through])
+        except Exception as e:
+            logger.error(f"Error in RPC proxy: {e}")
+            return [
+                _error_response(entries[index].get("id"), RPCErrorCode.INTERNAL_ERROR, "Internal error")
+                for index in pass_through
+            ]
+
+    forwarded, *handled = await asyncio.gather(forward(), *(_handle_entry(entries[index], api_key) for index in screened))
+
+    responses: List[Optional[Dict[str, Any]]] = [None] * len(entries)
+    for index, response in zip(pass_through, forwarded):
+        # Notifications get no response
+        responses[index] = response if "id" in entries[index] else None
+    for index, response in zip(screened, handled):
+        responses[index] = response
+    return responses
+
+async def _handle_entry(entry: Any, api_key: Optional[str] = None) -> Optional[Dict[str, Any]]:
+    """Handle one JSON-RPC request object, returning None for notifications"""
+    request_id = entry.get("id") if isinstance(entry, dict) else None
+    is_notification = isinstance(entry, dict) and "id" not in entry
+
+    try:
+        rpc_request = RPCRequest(**entry) if isinstance(entry, dict) else None
+    except ValidationError as e:
+        rpc_request = None
+        logger.debug(f"Invalid JSON-RPC request: {e}")
+    if rpc_request is None:
+        return _error_response(request_id if isinstance(request_id, (str, int)) else None,
+                               RPCErrorCode.INVALID_REQUEST, "Invalid Request")
+
+    try:
+        result = await _execute(rpc_request, api_key)
+        response = RPCResponse(id=request_id, result=result).to_dict()
+    except RPCException as e:
+        response = _error_response(request_id, e.code, e.message, e.data)
     except TimeoutError as e:
         logger.error(f"Timeout: {e}")
-        raise HTTPException(status_code=408, detail=str(e))
+        response = _error_response(request_id, RPCErrorCode.TIMEOUT, str(e))
     except Exception as e:
-        logger.error(f"Error in API endpoint: {e}")
-        raise HTTPException(status_code=500, detail=str(e))
\ No newline at end of file
+        # Details stay in the logs: exception messages may expose internals
+        logger.error(f"Error in RPC endpoint: {e}")
+        response = _error_response(request_id, RPCErrorCode.INTERNAL_ERROR, "Internal error")
+
+    return None if is_notification else response
+
+@router.post("")
+@router.post("/transaction")
+async def process_rpc(request: Request, x_api_key: Optional[str] = Header(default=None)):
+    """JSON-RPC 2.0 endpoint accepting single requests and batches
+
+    Screened transactions get their priority lane like POST /api/transaction,
+    including the tier of the X-API-Key header.
+    """
+    try:
+        payload = json.loads(await request.body())
+    except (json.JSONDecodeError, UnicodeDecodeError):
+        return FastJSONResponse(_error_response(None, RPCErrorCode.PARSE_ERROR, "Parse error"))
+
+    if isinstance(payload, list):
+        if not payload:
+            return FastJSONResponse(_error_response(None, RPCErrorCode.INVALID_REQUEST, "Invalid Request"))
+
+        logger.debug("⚡ Processing JSON-RPC batch of %d requests", len(payload), extra={"category": "request"})
+        responses = [response for response in await _handle_batch(payload, x_api_key) if response is not None]
+        return FastJSONResponse(responses) if responses else Response(status_code=204)
+
+    logger.debug(
+        "⚡ Processing JSON-RPC request: %s",
+        payload.get("method") if isinstance(payload, dict) else Truncated(payload),
+        extra={"category": "request"}
+    )
+    response = (await _handle_batch([payload], x_api_key))[0]
+    return FastJSONResponse(response) if response is not None else Response(status_code=204)
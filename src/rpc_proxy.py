@@ -0,0 +1,181 @@
+import json
+import logging
+import time
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Tuple
+import httpx
+from src.config import get_settings
+from src.constants import RPCErrorCode
+
+logger = logging.getLogger(__name__)
+
+# Idempotent read methods whose results can be cached for a short time
+CACHEABLE_METHODS = {
+    "eth_blockNumber",
+    "eth_call",
+    "eth_chainId",
+    "eth_estimateGas",
+    "eth_gasPrice",
+    "eth_getBalance",
+    "eth_getBlockByHash",
+    "eth_getBlockByNumber",
+    "eth_getCode",
+    "eth_getStorageAt",
+    "eth_getTransactionCount",
+    "net_version",
+}
+
+class RPCProxy:
+    """
+    Forwards JSON-RPC calls to the upstream node:
+    - Keeps a pooled keep-alive HTTP client to the upstream
+    - Pipelines the calls of a request into a single upstream batch
+    - Caches idempotent read methods for RPC_PROXY_CACHE_TTL seconds
+    """
+    _instance = None
+
+    def __new__(cls):
+        if cls._instance is None:
+            cls._instance = super().__new__(cls)
+            cls._instance.initialized = False
+        return cls._instance
+
+    def __init__(self):
+        if not hasattr(self, 'initialized') or not self.initialized:
+            self.settings = get_settings()
+            self.client: Optional[httpx.AsyncClient] = None
+            self._cache: OrderedDict[str, Tuple[float, Any]] = OrderedDict()
+            self.initialized = True
+
+    async def init(self, transport: Optional[httpx.AsyncBaseTransport] = None):
+        """Initialize the upstream client if not already initialized
+
+        A custom transport (e.g. httpx.MockTransport) can be given to run against a stub node.
+        """
+        if self.client:
+            return
+        if not self.settings.RPC_UPSTREAM_URL:
+            raise ValueError("RPC_UPSTREAM_URL must be set to use the RPC proxy")
+
+        self.client = httpx.AsyncClient(
+            timeout=self.settings.RPC_UPSTREAM_TIMEOUT,
+            limits=httpx.Limits(
+                max_connections=self.settings.RPC_UPSTREAM_MAX_CONNECTIONS,
+                max_keepalive_connections=self.settings.RPC_UPSTREAM_MAX_KEEPALIVE_CONNECTIONS,
+            ),
+            headers={"Content-Type": "application/json"},
+            transport=transport,
+        )
+        logger.info(f"RPC proxy initialized for upstream {self.settings.RPC_UPSTREAM_URL}")
+
+    async def close(self):
+        """Close the upstream client"""
+        if self.client:
+            await self.client.aclose()
+            self.client = None
+            logger.info("RPC proxy closed")
+
+    def _cache_key(self, request: Dict[str, Any]) -> Optional[str]:
+        """Cache key built from method and params (block tag included), or None if not cacheable"""
+        method = request.get("method")
+        if method not in CACHEABLE_METHODS:
+            return None
+        params = request.get("params", [])
+        # State at the pending block changes with every new transaction
+        if "pending" in (params if isinstance(params, list) else params.values()):
+            return None
+        return f"{method}:{json.dumps(params, sort_keys=True, separators=(',', ':'))}"
+
+    def _cache_get(self, key: str, now: float) -> Tuple[bool, Any]:
+        entry = self._cache.get(key)
+        if entry is None:
+            return False, None
+        expires_at, result = entry
+        if expires_at < now:
+            del self._cache[key]
+            return False, None
+        self._cache.move_to_end(key)
+        return True, result
+
+    def _cache_set(self, key: str, result: Any, now: float):
+        self._cache[key] = (now + self.settings.RPC_PROXY_CACHE_TTL, result)
+        self._cache.move_to_end(key)
+        while len(self._cache) > self.settings.RPC_PROXY_CACHE_MAX_SIZE:
+            self._cache.popitem(last=False)
+
+    @staticmethod
+    def _error(request_id: Any, code: RPCErrorCode, message: str) -> Dict[str, Any]:
+        return {"jsonrpc": "2.0", "id": request_id, "error": {"code": code, "message": message}}
+
+    async def forward(self, requests: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        Forward JSON-RPC requests to the upstream node
+
+        Cached results are served locally and the remaining calls are sent in
+        a single upstream batch. Returns one response per request, in order,
+        carrying the original request IDs.
+        """
+        if not self.client:
+            await self.init()
+
+        now = time.monotonic()
+        responses: List[Optional[Dict[str, Any]]] = [None] * len(requests)
+        pending: List[Tuple[int, Optional[str]]] = []
+
+        for index, request in enumerate(requests):
+            key = self._cache_key(request)
+            if key:
+                hit, result = self._cache_get(key, now)
+                if hit:
+                    responses[index] = {"jsonrpc": "2.0", "id": request.get("id"), "result": result}
+                    continue
+            pending.append((index, key))
+
+        if not pending:
+            return responses
+
+        # Upstream IDs are positions in the batch, so client IDs may collide or be missing
+        upstream_requests = [
+            {
+                "jsonrpc": "2.0",
+                "id": position,
+                "method": requests[index]["method"],
+                "params": requests[index].get("params", []),
+            }
+            for position, (index, _) in enumerate(pending)
+        ]
+        payload = upstream_requests[0] if len(upstream_requests) == 1 else upstream_requests
+
+        try:
+            response = await self.client.post(self.settings.RPC_UPSTREAM_URL, content=json.dumps(payload))
+            response.raise_for_status()
+            body = response.json()
+        except (httpx.HTTPError, ValueError) as e:
+            logger.error(f"Error forwarding {len(pending)} calls to upstream node: {e}")
+            for index, _ in pending:
+                responses[index] = self._error(
+                    requests[index].get("id"), RPCErrorCode.RESOURCE_UNAVAILABLE, "Upstream node unavailable"
+                )
+            return responses
+
+        items = body if isinstance(body, list) else [body]
+        by_position = {item.get("id"): item for item in items if isinstance(item, dict)}
+        now = time.monotonic()
+
+        for position, (index, key) in enumerate(pending):
+            request_id = requests[index].get("id")
+            item = by_position.get(position)
+            if item is None:
+                responses[index] = self._error(request_id, RPCErrorCode.INTERNAL_ERROR, "No response from upstream node")
+            elif "error" in item:
+                responses[index] = {"jsonrpc": "2.0", "id": request_id, "error": item["error"]}
+            else:
+                responses[index] = {"jsonrpc": "2.0", "id": request_id, "result": item.get("result")}
+                if key:
+                    self._cache_set(key, item.get("result"), now)
+
+        return responses
+
+# Singleton to access the RPC proxy
+def get_rpc_proxy() -> RPCProxy:
+    return RPCProxy()
@@ -1,5 +1,6 @@
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 from typing import Dict, List, Optional, Any, Union
+from src.constants import Priority
 
 class TransactionRequest(BaseModel):
     chainId: int
@@ -8,6 +9,11 @@ class TransactionRequest(BaseModel):
     data: str
     value: str = "0"
     reason: Optional[str] = None
+    # Stop analyzing after `timeout` seconds or at the `deadline` Unix timestamp, whichever comes first
+    timeout: Optional[float] = Field(default=None, gt=0)
+    deadline: Optional[float] = None
+    # Derived from the API key, value and chainId when not given
+    priority: Optional[Priority] = None
 
 class TransactionResponse(BaseModel):
     transaction_id: str
@@ -35,6 +41,8 @@ class TransactionDetail(BaseModel):
     validations: List[ValidationResult]
     created_at: Union[str, float]
     updated_at: Optional[Union[str, float]] = None
+    deadline: Optional[float] = None
+    priority: Optional[str] = None
     status: str
 
 class TransactionSummary(BaseModel):
@@ -47,4 +55,51 @@ class TransactionSummary(BaseModel):
 class DashboardResponse(BaseModel):
     total_transactions: int
     active_transactions: List[TransactionSummary]
-    completed_transactions: List[TransactionSummary]
\ No newline at end of file
+    completed_transactions: List[TransactionSummary]
+
+class StatsBucket(BaseModel):
+    timestamp: int
+    counters: Dict[str, int]
+
+class StatsResponse(BaseModel):
+    granularity: str
+    start: float
+    end: float
+    totals: Dict[str, int]
+    buckets: List[StatsBucket]
+
+class TransactionRecord(BaseModel):
+    """Persisted transaction returned by the history search"""
+    transaction_id: str
+    from_address: Optional[str] = None
+    to_address: Optional[str] = None
+    chain_id: Optional[int] = None
+    status: Optional[str] = None
+    agent_decision: Optional[str] = None
+    created_at: str
+    data: Optional[Dict[str, Any]] = None
+
+class TransactionSearchResponse(BaseModel):
+    items: List[TransactionRecord]
+    next_cursor: Optional[str] = None
+
+class LatencyStats(BaseModel):
+    """Percentiles in seconds over the most recent samples"""
+    p50: Optional[float] = None
+    p99: Optional[float] = None
+    count: Optional[int] = None
+
+class LaneStats(BaseModel):
+    depth: int
+    consumers: Dict[str, int]
+    wait: LatencyStats
+    latency: LatencyStats
+
+class HedgingStats(BaseModel):
+    enabled: bool
+    dispatched: int
+    hedged: int
+    hedged_fraction: float
+    max_fraction: float
+    hedges_won: int
+    hedge_after: Dict[str, Optional[float]]  # seconds per sentinel, None until enough samples
@@ -1,14 +1,23 @@
 from pydantic import BaseModel
-from typing import Optional, Dict, Any, Literal
+from typing import Optional, Dict, Any, List, Literal, Union
 
 class RPCRequest(BaseModel):
-    jsonrpc: Literal["2.0"] = "2.0"
+    jsonrpc: Literal["2.0"]
     method: str
-    params: Dict[str, Any]
-    id: Optional[str] = None
+    params: Union[List[Any], Dict[str, Any]] = []
+    id: Optional[Union[str, int]] = None
+
+class RPCError(BaseModel):
+    code: int
+    message: str
+    data: Optional[Any] = None
 
 class RPCResponse(BaseModel):
     jsonrpc: Literal["2.0"] = "2.0"
-    id: Optional[str] = None
-    result: Optional[Dict[str, Any]] = None
-    error: Optional[Dict[str, Any]] = None 
\ No newline at end of file
+    id: Optional[Union[str, int]] = None
+    result: Optional[Any] = None
+    error: Optional[RPCError] = None
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Serialize with exactly one of `result` or `error`, as required by JSON-RPC 2.0"""
+        return self.model_dump(exclude={"result"} if self.error else {"error"})
@@ -1,30 +1,89 @@
-import json
+import asyncio
 import logging
+import os
+import socket
+import time
+from typing import Any, Collection, Dict, Optional, Tuple
 from src.config import get_settings
 from src.constants import TransactionStatus
-from src.state_manager import StateManager
+from src.logging_config import Truncated
+from src.feature_store import get_feature_store
+from src.result_cache import get_result_cache
+from src.partitions import partition_subscriptions
+from src.priority_lanes import LaneScheduler, get_lane_metrics, read_lanes
+from src.state_manager import ABANDONED_STATUSES, StateManager, deadline_expired
 from abc import ABC, abstractmethod
 
 logger = logging.getLogger(__name__)
 
 class BaseSentinel(ABC):
+    # Seconds a result can be reused for transactions with the same cache_key(), None disables caching
+    cache_ttl: Optional[float] = None
+    # Input partitions (chainIds by default) this sentinel receives, None for all;
+    # SENTINEL_PARTITIONS overrides it per worker
+    partitions: Optional[Collection[str]] = None
+
     def __init__(self):
         self.name = self.__class__.__name__
         self.settings = get_settings()
         self.state = StateManager()
+        self.replica_id = self.settings.SENTINEL_REPLICA_ID or f"{socket.gethostname()}-{os.getpid()}"
 
-    async def _process_transaction(self, transaction_id: str):
-        """Process incoming transaction"""
-        
-        await self.state.set_sentinel_status(
-            transaction_id=transaction_id,
-            sentinel_name=self.name,
-            status=TransactionStatus.PENDING
-        )
+    async def _process_transaction(
+        self,
+        transaction_id: str,
+        deadline: Optional[float] = None,
+        attempt: int = 0,
+        exclude: Collection[str] = ()
+    ):
+        """Process incoming transaction
+
+        Transactions past their deadline are dropped, and the analysis is
+        failed if it runs past the deadline. With hedging enabled each attempt
+        is handled by the replica claiming it (a hedge never goes to the
+        replicas in `exclude`), and only the first completed result is written;
+        failed attempts are recorded on the claim, so a hedge can still succeed.
+        """
+        if deadline_expired(deadline):
+            logger.debug(
+                "Sentinel %s skipped expired transaction %s", self.name, transaction_id,
+                extra={"category": "sentinel"}
+            )
+            return
+
+        if self.settings.HEDGING_ENABLED and (
+            self.replica_id in exclude
+            or not await self.state.claim_sentinel_attempt(transaction_id, self.name, attempt, self.replica_id)
+        ):
+            logger.debug(
+                "Sentinel %s left attempt %s of transaction %s to another replica", self.name, attempt, transaction_id,
+                extra={"category": "sentinel"}
+            )
+            return
+
+        # A hedge must not reset the status of the attempt still running elsewhere
+        if not attempt:
+            await self.state.set_sentinel_status(
+                transaction_id=transaction_id,
+                sentinel_name=self.name,
+                status=TransactionStatus.PENDING
+            )
 
         try:
             data = await self.state.get_transaction(transaction_id)
-            result = await self.analyze(data)
+            # Nobody waits for a transaction that failed or was cancelled
+            if not data or data.get("status") in ABANDONED_STATUSES:
+                logger.debug(
+                    "Sentinel %s skipped abandoned transaction %s", self.name, transaction_id,
+                    extra={"category": "sentinel"}
+                )
+                return
+            if deadline is None:
+                result, cache_hit = await self._analyze_cached(data)
+            else:
+                result, cache_hit = await asyncio.wait_for(
+                    self._analyze_cached(data), timeout=float(deadline) - time.time()
+                )
             status = TransactionStatus.COMPLETED
 
             # Ensure result has standard format
@@ -34,14 +93,42 @@ class BaseSentinel(ABC):
                     "message": "Analysis completed successfully",
                     **result
                 }
-            logger.info(f"✅ Sentinel {self.name} completed analysis for transaction {transaction_id}")
+            if cache_hit is not None and isinstance(result, dict):
+                result = {**result, "cache_hit": cache_hit}
+            if attempt and isinstance(result, dict):
+                result = {**result, "hedged": True}
+            logger.debug(
+                "✅ Sentinel %s completed analysis for transaction %s", self.name, transaction_id,
+                extra={"category": "sentinel"}
+            )
+        except asyncio.TimeoutError:
+            result = {
+                "status": "error",
+                "message": "Deadline exceeded"
+            }
+            status = TransactionStatus.FAILED
+            logger.warning("Sentinel %s exceeded the deadline of transaction %s", self.name, transaction_id)
         except Exception as e:
             result = {
                 "status": "error",
                 "message": str(e)
             }
-            status = TransactionStatus.ERROR
-            logger.error(f"❌ Sentinel {self.name} failed analysis for transaction {transaction_id}: {e}")
+            status = TransactionStatus.FAILED
+            logger.error("❌ Sentinel %s failed analysis for transaction %s: %s", self.name, transaction_id, e)
+
+        if self.settings.HEDGING_ENABLED:
+            if status != TransactionStatus.COMPLETED:
+                # Another attempt may still succeed: a failure never takes the result
+                await self.state.record_sentinel_failure(
+                    transaction_id, self.name, attempt, result["message"]
+                )
+                return
+            if not await self.state.claim_sentinel_result(transaction_id, self.name, self.replica_id):
+                logger.debug(
+                    "Sentinel %s discarded a duplicate result for transaction %s", self.name, transaction_id,
+                    extra={"category": "sentinel"}
+                )
+                return
 
         await self.state.set_sentinel_status(
             transaction_id=transaction_id,
@@ -50,18 +137,88 @@ class BaseSentinel(ABC):
             result=result
         )
 
+    def get_partitions(self) -> Optional[Collection[str]]:
+        """Partitions this worker subscribes to, None for all"""
+        configured = self.settings.SENTINEL_PARTITIONS.get(self.name)
+        if configured is not None:
+            return [str(partition) for partition in configured]
+        if self.partitions is not None:
+            return [str(partition) for partition in self.partitions]
+        return None
+
+    async def get_address_features(self, *addresses: str) -> Dict[str, Dict[str, float]]:
+        """
+        Behavioral features of sender addresses over the FEATURE_WINDOWS, in one round trip
+
+        e.g. (await self.get_address_features(data["from_address"]))[data["from_address"].lower()]["tx_count_1m"]
+        """
+        return await get_feature_store().get_features(addresses)
+
+    def cache_key(self, data: dict) -> Optional[str]:
+        """
+        Part of the transaction the analysis depends on, used to reuse results
+        across transactions for cache_ttl seconds (None: do not cache)
+
+        e.g. contract checks only depend on `data["to_address"]`
+        """
+        return None
+
+    async def _analyze_cached(self, data: dict) -> Tuple[Any, Optional[bool]]:
+        """Run analyze() through the shared result cache when the sentinel declares a cache key
+
+        Returns:
+            Tuple of (result, cache_hit), cache_hit being None when the result is not cacheable
+        """
+        cache_key = self.cache_key(data) if self.cache_ttl and self.settings.SENTINEL_CACHE_ENABLED else None
+        if cache_key is None:
+            return await self.analyze(data), None
+        return await get_result_cache().get_or_analyze(
+            self.name, cache_key, self.cache_ttl, lambda: self.analyze(data)
+        )
+
+    async def _consume(self, scheduler: LaneScheduler):
+        """Process queued transactions, picking lanes by weighted fair scheduling"""
+        metrics = get_lane_metrics()
+        while True:
+            lane, data = await scheduler.get()
+            # Hedges name the sentinels they re-dispatch
+            if data.get("sentinels") and self.name not in data["sentinels"]:
+                continue
+            logger.debug(
+                "🤖 %s received %s priority message: %s", self.name, lane.value, Truncated(data),
+                extra={"category": "pubsub"}
+            )
+            metrics.record_wait(lane, data.get("enqueued_at"))
+            await self._process_transaction(
+                data.get("transaction_id"), data.get("deadline"), data.get("attempt", 0), data.get("exclude", ())
+            )
+
+    async def register_partitions(self):
+        """Register the partitions of this worker, so the core only waits for it on those"""
+        await self.state.set_sentinel_partitions(self.name, self.replica_id, self.get_partitions())
+
+    async def _heartbeat(self):
+        """Keep the partitions of this worker registered while it listens"""
+        while True:
+            await asyncio.sleep(self.settings.SENTINEL_PARTITIONS_TTL / 3)
+            try:
+                await self.register_partitions()
+            except Exception as e:
+                logger.warning(f"Error refreshing the partitions of {self.name}: {e}")
+
     async def listen(self):
-        """Listen for incoming transactions"""
-        channel = self.settings.REDIS_CHANNELS.SENTINELS_INPUT.value
-        pubsub = await self.state.subscribe_to_channel(channel)
+        """Listen for incoming transactions of its partitions on every priority lane"""
+        channels, patterns = partition_subscriptions(
+            self.settings.REDIS_CHANNELS.SENTINELS_INPUT.value, self.get_partitions()
+        )
+        pubsub = await self.state.subscribe_to_channel(*channels, patterns=patterns)
+        scheduler = LaneScheduler(self.settings.PRIORITY_LANE_WEIGHTS)
+        get_lane_metrics().register(self.name, scheduler)
 
         try:
-            async for message in pubsub.listen():
-                logger.info(f"🤖 {self.name} received message: {message}")
-                if message['type'] == 'message':
-                    data = json.loads(message['data'])
-                    transaction_id = data.get("transaction_id")
-                    await self._process_transaction(transaction_id)
+            await asyncio.gather(
+                read_lanes(pubsub, {**channels, **patterns}, scheduler), self._consume(scheduler), self._heartbeat()
+            )
         except Exception as e:
             logger.error(f"Error in {self.name} listener: {e}")
             raise 
@@ -1,18 +1,93 @@
+import hashlib
 import json
 import logging
 import time
 import uuid
+import zlib
 from supabase import Client
 from src.config import get_settings
-from typing import Any, Dict, Optional, List
-from redis.asyncio import Redis
+from src.logging_config import Truncated
+from typing import Any, Collection, Dict, Optional, List, Tuple, Union
+from redis.asyncio import BlockingConnectionPool, ConnectionPool, Redis
+from redis.client import NEVER_DECODE
+from redis.asyncio.cluster import RedisCluster
 from src.constants import TransactionStatus
+from src.dashboard_view import get_dashboard_view
 
 logger = logging.getLogger(__name__)
 
+TRANSACTION_KEY_PREFIX = "transaction:"
+
+def transaction_key(transaction_id: str) -> str:
+    """Build the Redis key for a transaction.
+
+    The transaction ID is wrapped in a hash tag so every key belonging to the
+    same transaction is mapped to the same Redis Cluster slot.
+    """
+    return f"{TRANSACTION_KEY_PREFIX}{{{transaction_id}}}"
+
+def transaction_id_from_key(key: str) -> str:
+    """Extract the transaction ID from a (hash-tagged) transaction key"""
+    return key[len(TRANSACTION_KEY_PREFIX):].strip("{}")
+
+# Fields kept in Redis once a transaction has been durably persisted
+SUMMARY_FIELDS = ("transaction_id", "from_address", "created_at", "updated_at", "status")
+
+def calldata_key(digest: str) -> str:
+    """Build the content-addressed Redis key for a compressed calldata blob"""
+    return f"calldata:{{{digest}}}"
+
+# The agent verdict has its own hash field, so writing it never races with sentinel results
+AGENT_VALIDATION_FIELD = "agent_validation"
+
+def with_agent_validation(validations: Optional[List[dict]], agent_validation: Optional[dict]) -> Optional[List[dict]]:
+    """Validations of a transaction with the agent verdict stored apart merged in"""
+    if agent_validation is None:
+        return validations
+    return [
+        validation for validation in validations or [] if validation.get("name") != agent_validation.get("name")
+    ] + [agent_validation]
+
+def claim_key(transaction_id: str, sentinel_name: str) -> str:
+    """Build the Redis key recording which replica handles each attempt of a sentinel request"""
+    return f"claim:{{{transaction_id}}}:{sentinel_name}"
+
+def merge_validation(validations: List[dict], name: str, status: str, result: Any = None) -> List[dict]:
+    """Update or add the validation entry of a sentinel (or the agent) in place"""
+    # Ensure result is a dictionary if provided
+    if result is not None:
+        if isinstance(result, list) and len(result) > 0:
+            result = result[0]
+        elif not isinstance(result, dict):
+            result = {"result": result}
+
+    # Update or add sentinel status
+    for validation in validations:
+        if validation.get("name") == name:
+            validation["status"] = status
+            if result is not None:
+                validation["result"] = result
+            return validations
+
+    validations.append({
+        "name": name,
+        "status": status,
+        **({"result": result} if result is not None else {})
+    })
+    return validations
+
+# Statuses after which no more work should be done on a transaction
+ABANDONED_STATUSES = (TransactionStatus.FAILED, TransactionStatus.CANCELLED)
+
+def deadline_expired(deadline: Optional[float]) -> bool:
+    """Whether a transaction deadline (Unix timestamp, or None for no deadline) has passed"""
+    return deadline is not None and time.time() >= float(deadline)
+
 class StateManager:
     _instance = None
-    _redis: Optional[Redis] = None
+    _redis: Optional[Union[Redis, RedisCluster]] = None
+    _pubsub_redis: Optional[Redis] = None
+    _subscriber_redis: Optional[Redis] = None
     _supabase: Optional[Client] = None
 
 
@@ -25,18 +100,88 @@ class StateManager:
         """Initialize state manager"""
         if not self._redis:
             self.settings = get_settings()
-            self._redis = Redis.from_url(
-                url=self.settings.REDIS_URL,
-                decode_responses=True
+            self._redis = self._create_command_client()
+            self._pubsub_redis = self._create_pubsub_client()
+            self._subscriber_redis = self._create_subscriber_client()
+            logger.info(
+                f"State manager initialized (cluster mode: {self.settings.REDIS_CLUSTER_MODE})"
             )
-            logger.info("State manager initialized")
+
+    def _create_command_client(self) -> Union[Redis, RedisCluster]:
+        """Create the client used for regular commands"""
+        options = {
+            "decode_responses": True,
+            "socket_timeout": self.settings.REDIS_SOCKET_TIMEOUT,
+            "socket_connect_timeout": self.settings.REDIS_SOCKET_CONNECT_TIMEOUT,
+            "health_check_interval": self.settings.REDIS_HEALTH_CHECK_INTERVAL,
+        }
+        if self.settings.REDIS_CLUSTER_MODE:
+            # The async cluster client raises instead of waiting once a node's
+            # max_connections is reached, so its pools are left unbounded
+            return RedisCluster.from_url(self.settings.REDIS_URL, **options)
+        # Bursts wait up to REDIS_POOL_TIMEOUT for a free connection instead of failing
+        pool = BlockingConnectionPool.from_url(
+            self.settings.REDIS_URL,
+            max_connections=self.settings.REDIS_MAX_CONNECTIONS,
+            timeout=self.settings.REDIS_POOL_TIMEOUT,
+            **options
+        )
+        return Redis(connection_pool=pool)
+
+    def _pubsub_options(self) -> Dict[str, Any]:
+        # No socket timeout since subscribers block on reads
+        return {
+            "decode_responses": True,
+            "socket_connect_timeout": self.settings.REDIS_SOCKET_CONNECT_TIMEOUT,
+            "health_check_interval": self.settings.REDIS_HEALTH_CHECK_INTERVAL,
+        }
+
+    def _create_pubsub_client(self) -> Redis:
+        """Create the client used for publishes, with its own bounded pool
+
+        Kept apart from the command pool so pub/sub traffic does not starve
+        regular commands. In cluster mode any node can be used, since classic
+        pub/sub messages are broadcast to the whole cluster.
+        """
+        pool = BlockingConnectionPool.from_url(
+            self.settings.REDIS_PUBSUB_URL or self.settings.REDIS_URL,
+            max_connections=self.settings.REDIS_PUBLISH_MAX_CONNECTIONS,
+            timeout=self.settings.REDIS_POOL_TIMEOUT,
+            **self._pubsub_options()
+        )
+        return Redis(connection_pool=pool)
+
+    def _create_subscriber_client(self) -> Redis:
+        """Create the client used for subscriptions
+
+        A subscription holds its connection for its whole lifetime, and there is a
+        fixed number of long-lived subscribers, so their pool is left unbounded and
+        never competes with publishes for REDIS_PUBLISH_MAX_CONNECTIONS.
+        """
+        pool = ConnectionPool.from_url(
+            self.settings.REDIS_PUBSUB_URL or self.settings.REDIS_URL,
+            **self._pubsub_options()
+        )
+        return Redis(connection_pool=pool)
+
+    async def get_redis(self) -> Union[Redis, RedisCluster]:
+        """Return the command client, for services keeping their own keys"""
+        if not self._redis:
+            await self.init()
+        return self._redis
 
     async def close(self):
-        """Close connection"""
+        """Close connections"""
         if self._redis:
             await self._redis.close()
             self._redis = None
-            logger.info("State manager closed")
+        if self._pubsub_redis:
+            await self._pubsub_redis.close()
+            self._pubsub_redis = None
+        if self._subscriber_redis:
+            await self._subscriber_redis.close()
+            self._subscriber_redis = None
+        logger.info("State manager closed")
 
     async def initialize_transaction(self, data: dict) -> None:
         """Initialize a new transaction with the unified structure"""
@@ -50,39 +195,99 @@ class StateManager:
             "chainId": data.get("chainId", ""),
             "from_address": data.get("from_address", ""),
             "to_address": data.get("to_address", ""),
-            "data": data.get("data", ""),
+            **(await self._store_calldata(data.get("data", ""))),
             "value": data.get("value", "0"),
             "reason": data.get("reason", ""),
             "validations": json.dumps([]),  # Serialize list
             "created_at": str(time.time()),
             "status": TransactionStatus.PENDING
         }
+        if data.get("deadline") is not None:
+            transaction_data["deadline"] = str(data["deadline"])
+        if data.get("priority"):
+            transaction_data["priority"] = data["priority"]
         
         # Store in Redis as hash
-        await self._redis.hset(f"transaction:{transaction_id}", mapping=transaction_data)
-        await self._redis.expire(f"transaction:{transaction_id}", self.settings.ANALYSIS_EXPIRATION_TIME)
+        key = transaction_key(transaction_id)
+        async with self._redis.pipeline(transaction=False) as pipe:
+            pipe.hset(key, mapping=transaction_data)
+            pipe.expire(key, self.settings.ANALYSIS_EXPIRATION_TIME)
+            await pipe.execute()
+
+        get_dashboard_view().apply({
+            **transaction_data,
+            "created_at": float(transaction_data["created_at"])
+        })
         
         return transaction_id
 
+    async def _store_calldata(self, calldata: str) -> dict:
+        """Return the hash fields holding the calldata of a transaction
+
+        Calldata above CALLDATA_DEDUP_THRESHOLD hex characters is stored once,
+        zlib-compressed in binary form, under a key derived from its SHA-256.
+        The transaction hash then only keeps the digest in `data_ref`.
+        """
+        if len(calldata) < self.settings.CALLDATA_DEDUP_THRESHOLD:
+            return {"data": calldata}
+
+        try:
+            raw = bytes.fromhex(calldata[2:])
+        except ValueError:
+            return {"data": calldata}
+
+        # Only canonical calldata can be rebuilt byte for byte from the blob
+        if calldata != "0x" + raw.hex():
+            return {"data": calldata}
+
+        digest = hashlib.sha256(raw).hexdigest()
+        key = calldata_key(digest)
+        # Outlive the transactions referencing the blob
+        ttl = self.settings.ANALYSIS_EXPIRATION_TIME + 60
+
+        # Already stored by another transaction: only extend its lifetime
+        if not await self._redis.expire(key, ttl):
+            blob = zlib.compress(raw, self.settings.CALLDATA_COMPRESSION_LEVEL)
+            await self._redis.set(key, blob, ex=ttl)
+
+        return {"data_ref": digest}
+
+    async def _load_calldata(self, digest: str) -> Optional[str]:
+        """Rebuild the hex calldata stored under a content hash"""
+        blob = await self._redis.execute_command(
+            "GET", calldata_key(digest), **{NEVER_DECODE: []}
+        )
+        if blob is None:
+            logger.warning(f"Calldata blob {digest} not found")
+            return None
+        return "0x" + zlib.decompress(blob).hex()
+
     async def set_transaction(self, transaction_id: str, transaction_data: dict) -> None:
         """Store a new transaction in Redis"""
         if not self._redis:
             await self.init()
         
         # Convert dict to flat key-value pairs for hash
+        mapping = {}
         for key, value in transaction_data.items():
             # Serialize complex values (lists, dicts) to JSON strings
             if isinstance(value, (dict, list)):
                 value = json.dumps(value)
-            await self._redis.hset(f"transaction:{transaction_id}", key, value)
+            mapping[key] = value
+        if mapping:
+            await self._redis.hset(transaction_key(transaction_id), mapping=mapping)
 
-    async def get_transaction(self, transaction_id: str) -> Optional[dict]:
-        """Retrieve a transaction from Redis"""
+    async def get_transaction(self, transaction_id: str, resolve_calldata: bool = True) -> Optional[dict]:
+        """Retrieve a transaction from Redis
+
+        Deduplicated calldata is transparently loaded back into `data`, unless
+        `resolve_calldata` is False.
+        """
         if not self._redis:
             await self.init()
         
         # Get all fields from hash
-        data = await self._redis.hgetall(f"transaction:{transaction_id}")
+        data = await self._redis.hgetall(transaction_key(transaction_id))
         if not data:
             return None
         
@@ -95,57 +300,127 @@ class StateManager:
             except json.JSONDecodeError:
                 # If not JSON, keep original value
                 result[key] = value
-        
+
+        agent_validation = result.pop(AGENT_VALIDATION_FIELD, None)
+        if agent_validation is not None:
+            result["validations"] = with_agent_validation(result.get("validations"), agent_validation)
+
+        digest = result.pop("data_ref", None)
+        if digest and resolve_calldata:
+            result["data"] = await self._load_calldata(digest)
+
         return result
 
+    async def _get_validations(self, transaction_id: str) -> Optional[List[dict]]:
+        """Read only the validations of a transaction, without loading its calldata"""
+        if not self._redis:
+            await self.init()
+        validations_json, agent_json = await self._redis.hmget(
+            transaction_key(transaction_id), ["validations", AGENT_VALIDATION_FIELD]
+        )
+        validations = json.loads(validations_json) if validations_json else None
+        return with_agent_validation(validations, json.loads(agent_json) if agent_json else None)
+
     async def set_sentinel_status(self, transaction_id: str, sentinel_name: str, status: str, result: Any = None) -> None:
         """Update a sentinel's status in the unified transaction record"""
         if not self._redis:
             await self.init()
         
         # Get current validations
-        validations_json = await self._redis.hget(f"transaction:{transaction_id}", "validations")
+        validations_json = await self._redis.hget(transaction_key(transaction_id), "validations")
         validations = json.loads(validations_json) if validations_json else []
-        
-        # Ensure result is a dictionary if provided
-        if result is not None:
-            if isinstance(result, list) and len(result) > 0:
-                result = result[0]
-            elif not isinstance(result, dict):
-                result = {"result": result}
-        
-        # Update or add sentinel status
-        sentinel_found = False
-        for validation in validations:
-            if validation.get("name") == sentinel_name:
-                validation["status"] = status
-                if result is not None:
-                    validation["result"] = result
-                sentinel_found = True
-                break
-        
-        if not sentinel_found:
-            validations.append({
-                "name": sentinel_name,
-                "status": status,
-                **({"result": result} if result is not None else {})
-            })
+        validations = merge_validation(validations, sentinel_name, status, result)
         
         # Update validations in Redis
         await self._redis.hset(
-            f"transaction:{transaction_id}", 
+            transaction_key(transaction_id),
             "validations", 
             json.dumps(validations)
         )
 
+    async def claim_sentinel_attempt(self, transaction_id: str, sentinel_name: str, attempt: int, replica_id: str) -> bool:
+        """Claim an attempt of a sentinel request for a replica, False if another replica owns it"""
+        if not self._redis:
+            await self.init()
+        key = claim_key(transaction_id, sentinel_name)
+        async with self._redis.pipeline(transaction=False) as pipe:
+            pipe.hsetnx(key, f"attempt:{attempt}", replica_id)
+            pipe.expire(key, self.settings.ANALYSIS_EXPIRATION_TIME)
+            claimed, _ = await pipe.execute()
+        return bool(claimed)
+
+    async def claim_sentinel_result(self, transaction_id: str, sentinel_name: str, replica_id: str) -> bool:
+        """Claim the right to write a completed sentinel result: the first replica to complete wins"""
+        if not self._redis:
+            await self.init()
+        return bool(await self._redis.hsetnx(claim_key(transaction_id, sentinel_name), "winner", replica_id))
+
+    async def record_sentinel_failure(self, transaction_id: str, sentinel_name: str, attempt: int, error: str) -> None:
+        """Record why an attempt of a sentinel request failed, without claiming the result"""
+        if not self._redis:
+            await self.init()
+        await self._redis.hset(claim_key(transaction_id, sentinel_name), f"failed:{attempt}", error)
+
+    async def get_sentinel_claims(self, transaction_id: str, sentinel_name: str) -> Dict[str, str]:
+        """Replica owning each attempt of a sentinel request, failed attempts, and the winner once completed"""
+        if not self._redis:
+            await self.init()
+        return await self._redis.hgetall(claim_key(transaction_id, sentinel_name))
+
+    async def get_fields_batch(self, transaction_ids: List[str], fields: List[str]) -> Dict[str, Optional[dict]]:
+        """Read some fields of several transactions in a single pipeline
+
+        Returns None for transactions that no longer exist.
+        """
+        if not self._redis:
+            await self.init()
+        merge_agent = "validations" in fields and AGENT_VALIDATION_FIELD not in fields
+        read_fields = fields + [AGENT_VALIDATION_FIELD] if merge_agent else fields
+        async with self._redis.pipeline(transaction=False) as pipe:
+            for transaction_id in transaction_ids:
+                pipe.hmget(transaction_key(transaction_id), read_fields)
+            rows = await pipe.execute()
+
+        result = {}
+        for transaction_id, values in zip(transaction_ids, rows):
+            if all(value is None for value in values):
+                result[transaction_id] = None
+                continue
+            record = {}
+            for field, value in zip(read_fields, values):
+                try:
+                    record[field] = json.loads(value) if value is not None else None
+                except json.JSONDecodeError:
+                    record[field] = value
+            if merge_agent:
+                record["validations"] = with_agent_validation(
+                    record["validations"], record.pop(AGENT_VALIDATION_FIELD)
+                )
+            result[transaction_id] = record
+        return result
+
+    async def set_agent_statuses_batch(self, outcomes: Dict[str, Tuple[str, Any]]) -> None:
+        """Write the agent verdicts, (status, result) by transaction, in a single pipeline
+
+        Verdicts go to their own hash field: sentinel or hedge results written
+        meanwhile are never overwritten.
+        """
+        if not self._redis:
+            await self.init()
+        async with self._redis.pipeline(transaction=False) as pipe:
+            for transaction_id, (status, result) in outcomes.items():
+                validation = merge_validation([], "agent", status, result)[0]
+                pipe.hset(transaction_key(transaction_id), AGENT_VALIDATION_FIELD, json.dumps(validation))
+            await pipe.execute()
+
     async def get_sentinel_statuses(self, transaction_id: str) -> Dict:
         """Get all sentinel statuses for a transaction from the unified structure"""
-        transaction_data = await self.get_transaction(transaction_id)
-        if not transaction_data:
+        validations = await self._get_validations(transaction_id)
+        if validations is None:
             return {}
         
         sentinel_statuses = {}
-        for validation in transaction_data.get("validations", []):
+        for validation in validations:
             if validation.get("name") != "agent":  # Exclude agent from sentinel results
                 sentinel_statuses[validation.get("name")] = {
                     "status": validation.get("status"),
@@ -154,18 +429,23 @@ class StateManager:
         
         return sentinel_statuses
 
-    async def set_transaction_status(self, transaction_id: str, status: str):
-        """Update transaction status and notify if completed"""
+    async def set_transaction_status(self, transaction_id: str, status: str) -> float:
+        """Update transaction status and notify if completed
+
+        Returns the `updated_at` timestamp written to the record.
+        """
         if not self._redis:
             await self.init()
         
-        key = f"transaction:{transaction_id}"
+        key = transaction_key(transaction_id)
+        updated_at = time.time()
         
         # Update status and timestamp
         await self._redis.hset(key, mapping={
             "status": status,
-            "updated_at": time.time()
+            "updated_at": updated_at
         })
+        get_dashboard_view().update_status(transaction_id, status)
         
         # If COMPLETED, notify the persistence service
         if status == TransactionStatus.COMPLETED:
@@ -177,33 +457,62 @@ class StateManager:
                     "timestamp": time.time()
                 }
             )
-            logger.info(f"✅ Published persistence message for transaction {transaction_id}")
+            logger.debug(
+                "✅ Published persistence message for transaction %s", transaction_id,
+                extra={"category": "pubsub"}
+            )
+
+        return updated_at
+
+    async def shrink_transaction(self, transaction_id: str) -> None:
+        """Reduce a durably persisted transaction to a short-lived summary
+
+        Calldata, validations and the rest of the record are dropped from Redis;
+        only SUMMARY_FIELDS remain, flagged as `persisted`, for PERSISTED_SUMMARY_TTL
+        seconds. Full details are then served from the persistence store.
+        """
+        if not self._redis:
+            await self.init()
+
+        key = transaction_key(transaction_id)
+        fields = await self._redis.hkeys(key)
+        if not fields:
+            return
+
+        stale_fields = [field for field in fields if field not in SUMMARY_FIELDS]
+        async with self._redis.pipeline(transaction=False) as pipe:
+            if stale_fields:
+                pipe.hdel(key, *stale_fields)
+            pipe.hset(key, "persisted", 1)
+            pipe.expire(key, self.settings.PERSISTED_SUMMARY_TTL)
+            await pipe.execute()
 
     async def set_agent_status(self, transaction_id: str, status: str, result: Any = None) -> None:
         """Set agent status in the unified transaction record"""
-        await self.set_sentinel_status(transaction_id, "agent", status, result)
+        await self.set_agent_statuses_batch({transaction_id: (status, result)})
 
     async def get_agent_status(self, transaction_id: str) -> Optional[Dict]:
         """Get agent status from the unified transaction record"""
-        transaction_data = await self.get_transaction(transaction_id)
-        if not transaction_data:
+        if not self._redis:
+            await self.init()
+        agent_json = await self._redis.hget(transaction_key(transaction_id), AGENT_VALIDATION_FIELD)
+        if not agent_json:
             return None
-        
-        for validation in transaction_data.get("validations", []):
-            if validation.get("name") == "agent":
-                return {
-                    "status": validation.get("status"),
-                    "result": validation.get("result", {})
-                }
-        
-        return None
+        validation = json.loads(agent_json)
+        return {
+            "status": validation.get("status"),
+            "result": validation.get("result", {})
+        }
 
-    async def subscribe_to_channel(self, channel: str):
-        """Create and return a pubsub subscription"""
+    async def subscribe_to_channel(self, *channels: str, patterns: Collection[str] = ()):
+        """Create and return a pubsub subscription to one or more channels and channel patterns"""
         if not self._redis:
             await self.init()
-        pubsub = self._redis.pubsub()
-        await pubsub.subscribe(channel)
+        pubsub = self._subscriber_redis.pubsub()
+        if channels:
+            await pubsub.subscribe(*channels)
+        if patterns:
+            await pubsub.psubscribe(*patterns)
         return pubsub
 
     async def publish_message(self, channel: str, message: dict):
@@ -211,8 +520,11 @@ class StateManager:
         if not self._redis:
             await self.init()
         message_str = json.dumps(message)
-        await self._redis.publish(channel, message_str)
-        logger.debug(f"Published message to {channel}: {message_str}")
+        await self._pubsub_redis.publish(channel, message_str)
+        logger.debug(
+            "Published message to %s: %s", channel, Truncated(message_str),
+            extra={"category": "pubsub"}
+        )
 
     async def set_active_sentinels(self, sentinel_names: set):
         """Store the set of active sentinels"""
@@ -220,6 +532,59 @@ class StateManager:
             await self.init()
         await self._redis.sadd("active_sentinels", *sentinel_names)
 
+    async def set_sentinel_partitions(self, sentinel_name: str, replica_id: str, partitions: Optional[Collection[str]]):
+        """Register (or refresh) the partitions a sentinel worker subscribes to, None for all
+
+        Each worker replaces its own entry, which expires after SENTINEL_PARTITIONS_TTL
+        seconds without a heartbeat, so restarted or stopped workers drop out.
+        """
+        if not self._redis:
+            await self.init()
+        ttl = self.settings.SENTINEL_PARTITIONS_TTL
+        key = f"sentinel_workers:{sentinel_name}"
+        entry = {"partitions": list(partitions) if partitions is not None else None, "expires_at": time.time() + ttl}
+        async with self._redis.pipeline(transaction=False) as pipe:
+            pipe.hset(key, replica_id, json.dumps(entry))
+            pipe.expire(key, int(ttl) + 1)
+            await pipe.execute()
+
+    async def get_sentinel_partitions(self, sentinel_names: Collection[str]) -> Dict[str, Optional[set]]:
+        """Partitions covered by each sentinel across its live workers, None meaning all"""
+        if not self._redis:
+            await self.init()
+        sentinel_names = list(sentinel_names)
+        async with self._redis.pipeline(transaction=False) as pipe:
+            for sentinel_name in sentinel_names:
+                pipe.hgetall(f"sentinel_workers:{sentinel_name}")
+            workers = await pipe.execute()
+
+        now = time.time()
+        covered: Dict[str, Optional[set]] = {}
+        expired: Dict[str, List[str]] = {}
+        for sentinel_name, entries in zip(sentinel_names, workers):
+            registered = False
+            partitions: Optional[set] = set()
+            for replica_id, entry in entries.items():
+                entry = json.loads(entry)
+                if entry["expires_at"] < now:
+                    expired.setdefault(sentinel_name, []).append(replica_id)
+                    continue
+                registered = True
+                if entry["partitions"] is None or partitions is None:
+                    partitions = None
+                else:
+                    partitions.update(entry["partitions"])
+            # Sentinels without live registered workers receive every partition, while
+            # workers registered with no partitions receive none
+            covered[sentinel_name] = partitions if registered else None
+
+        if expired:
+            async with self._redis.pipeline(transaction=False) as pipe:
+                for sentinel_name, replica_ids in expired.items():
+                    pipe.hdel(f"sentinel_workers:{sentinel_name}", *replica_ids)
+                await pipe.execute()
+        return covered
+
     async def get_active_sentinels(self) -> set:
         """Get the set of active sentinels"""
         if not self._redis:
@@ -231,8 +596,14 @@ class StateManager:
         """Get all transaction IDs"""
         if not self._redis:
             await self.init()
-        keys = await self._redis.keys("transaction:*")
-        return [key.split(":")[1] for key in keys]
+        # SCAN instead of KEYS: non-blocking, and iterates every primary in cluster mode
+        return [
+            transaction_id_from_key(key)
+            async for key in self._redis.scan_iter(
+                match=f"{TRANSACTION_KEY_PREFIX}*",
+                count=self.settings.REDIS_SCAN_COUNT
+            )
+        ]
 
     async def get_transaction_details(self, transaction_id: str) -> Optional[dict]:
         """Get full transaction details - for backward compatibility"""
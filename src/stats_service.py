@@ -0,0 +1,158 @@
+import logging
+import time
+from typing import Any, Dict, List, Optional
+from src.config import get_settings
+from src.constants import AgentDecision, TransactionStatus
+from src.state_manager import StateManager
+
+logger = logging.getLogger(__name__)
+
+# Bucket size and retention (seconds) of each granularity
+GRANULARITIES = {
+    "minute": (60, 2 * 86400),
+    "hour": (3600, 90 * 86400),
+    "day": (86400, 2 * 365 * 86400),
+}
+
+TOTALS_KEY = "stats:totals"
+
+def stats_key(granularity: str, bucket_start: int) -> str:
+    return f"stats:{granularity}:{bucket_start}"
+
+def get_agent_result(transaction: Dict[str, Any]) -> Dict[str, Any]:
+    """Return the agent result stored in the validations of a transaction"""
+    for validation in transaction.get("validations") or []:
+        if validation.get("name") == "agent":
+            return validation.get("result") or {}
+    return {}
+
+def get_agent_decision(transaction: Dict[str, Any]) -> Optional[AgentDecision]:
+    """Derive the agent decision of a transaction from its agent result"""
+    agent_result = get_agent_result(transaction)
+    if "approved" not in agent_result:
+        return None
+    if not agent_result["approved"]:
+        return AgentDecision.REJECTED
+    if agent_result.get("warnings"):
+        return AgentDecision.WARNINGS
+    return AgentDecision.APPROVED
+
+class StatsService:
+    """
+    Aggregate statistics maintained on write:
+    - Counters are incremented atomically (HINCRBY) as transactions are received and finish
+    - Each event updates per-minute, per-hour and per-day buckets plus all-time totals
+    - Reading a time range costs one hash read per bucket
+    """
+    _instance = None
+
+    def __new__(cls):
+        if cls._instance is None:
+            cls._instance = super().__new__(cls)
+            cls._instance.initialized = False
+        return cls._instance
+
+    def __init__(self):
+        if not hasattr(self, 'initialized') or not self.initialized:
+            self.settings = get_settings()
+            self.state = StateManager()
+            self.initialized = True
+
+    async def _increment(self, counters: Dict[str, int], timestamp: Optional[float] = None):
+        """Increment counters in every bucket containing the timestamp and in the totals"""
+        if not counters:
+            return
+        timestamp = timestamp or time.time()
+        redis = await self.state.get_redis()
+
+        try:
+            async with redis.pipeline(transaction=False) as pipe:
+                for granularity, (size, retention) in GRANULARITIES.items():
+                    key = stats_key(granularity, int(timestamp // size * size))
+                    for field, amount in counters.items():
+                        pipe.hincrby(key, field, amount)
+                    pipe.expire(key, retention)
+                for field, amount in counters.items():
+                    pipe.hincrby(TOTALS_KEY, field, amount)
+                await pipe.execute()
+        except Exception as e:
+            # Statistics must never fail the transaction flow
+            logger.warning(f"Error updating statistics: {e}")
+
+    async def record_received(self, data: Dict[str, Any]):
+        """Count a transaction submitted for analysis"""
+        counters = {
+            "transactions": 1,
+            f"chain:{data.get('chainId')}": 1,
+        }
+        if data.get("priority"):
+            counters[f"priority:{data['priority']}"] = 1
+        await self._increment(counters)
+
+    async def record_finished(self, transaction: Dict[str, Any], status: str):
+        """Count a transaction reaching a final status, with its decision and sentinel outcomes"""
+        counters = {f"status:{TransactionStatus(status).value}": 1}
+
+        decision = get_agent_decision(transaction)
+        if decision:
+            counters[f"decision:{decision.value}"] = 1
+
+        for validation in transaction.get("validations") or []:
+            name = validation.get("name")
+            if name == "agent":
+                continue
+            result = validation.get("result") or {}
+            outcome = result.get("risk_level") or result.get("status") or validation.get("status")
+            counters[f"sentinel:{name}:{outcome}"] = 1
+
+        await self._increment(counters)
+
+    async def get_total(self, counter: str) -> int:
+        """Get one all-time counter"""
+        redis = await self.state.get_redis()
+        return int(await redis.hget(TOTALS_KEY, counter) or 0)
+
+    async def get_totals(self) -> Dict[str, int]:
+        """Get all-time counters"""
+        redis = await self.state.get_redis()
+        totals = await redis.hgetall(TOTALS_KEY)
+        return {field: int(value) for field, value in totals.items()}
+
+    async def get_series(self, start: float, end: float, granularity: str) -> List[Dict[str, Any]]:
+        """
+        Get the counters of every bucket between start and end
+
+        Returns:
+            List of {"timestamp": bucket_start, "counters": {...}}, oldest first
+        """
+        if granularity not in GRANULARITIES:
+            raise ValueError(f"Unknown granularity {granularity}, expected one of {list(GRANULARITIES)}")
+        if end < start:
+            raise ValueError("end must be greater than start")
+
+        size, _ = GRANULARITIES[granularity]
+        first_bucket = int(start // size * size)
+        bucket_count = (int(end) - first_bucket) // size + 1
+        if bucket_count > self.settings.STATS_MAX_BUCKETS:
+            raise ValueError(
+                f"Range spans {bucket_count} buckets, the maximum is {self.settings.STATS_MAX_BUCKETS}"
+            )
+        bucket_starts = [first_bucket + index * size for index in range(bucket_count)]
+
+        redis = await self.state.get_redis()
+        async with redis.pipeline(transaction=False) as pipe:
+            for bucket_start in bucket_starts:
+                pipe.hgetall(stats_key(granularity, bucket_start))
+            buckets = await pipe.execute()
+
+        return [
+            {
+                "timestamp": bucket_start,
+                "counters": {field: int(value) for field, value in counters.items()}
+            }
+            for bucket_start, counters in zip(bucket_starts, buckets)
+        ]
+
+# Singleton to access the stats service
+def get_stats_service() -> StatsService:
+    return StatsService()
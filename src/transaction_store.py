@@ -0,0 +1,290 @@
+import asyncio
+import json
+import logging
+import sqlite3
+import sys
+import threading
+from abc import ABC, abstractmethod
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional, Tuple
+import httpx
+from supabase import Client
+
+logger = logging.getLogger(__name__)
+
+TABLE = "transactions"
+
+# Columns returned by searches unless details are requested
+SUMMARY_COLUMNS = ["transaction_id", "from_address", "to_address", "chain_id", "status", "agent_decision", "created_at"]
+
+# Columns of a persisted record
+RECORD_COLUMNS = SUMMARY_COLUMNS + ["data"]
+
+# Columns that can be filtered on with an equality match
+FILTER_COLUMNS = {"from_address", "to_address", "chain_id", "status", "agent_decision"}
+
+# Indexes backing the searches: every filter is followed by the keyset ordering
+INDEXES = {
+    "transactions_created_at_idx": "created_at DESC, transaction_id DESC",
+    **{
+        f"transactions_{column}_idx": f"{column}, created_at DESC, transaction_id DESC"
+        for column in sorted(FILTER_COLUMNS)
+    },
+}
+
+def format_timestamp(value: Any) -> Optional[str]:
+    """Normalize a Unix timestamp, datetime or ISO string to a fixed-width UTC ISO string
+
+    The fixed width keeps lexicographic and chronological order identical, which
+    stores keeping timestamps as text rely on.
+    """
+    if value is None or value == "":
+        return None
+    if isinstance(value, (int, float)):
+        value = datetime.fromtimestamp(float(value), tz=timezone.utc)
+    elif isinstance(value, str):
+        try:
+            value = datetime.fromtimestamp(float(value), tz=timezone.utc)
+        except ValueError:
+            value = datetime.fromisoformat(value.replace("Z", "+00:00"))
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return value.astimezone(timezone.utc).strftime("%Y-%m-%dT%H:%M:%S.%f+00:00")
+
+class TransactionStore(ABC):
+    """Durable store of completed transactions"""
+
+    async def upsert(self, record: Dict[str, Any]) -> None:
+        """Insert or replace a record by transaction_id
+
+        Idempotent, so a write retried or replayed from the spool never fails on
+        a record that already landed.
+        """
+        await self.upsert_many([record])
+
+    @abstractmethod
+    async def upsert_many(self, records: List[Dict[str, Any]]) -> None:
+        """Insert or replace records by transaction_id, in bulk"""
+        pass
+
+    @abstractmethod
+    async def get(self, transaction_id: str) -> Optional[Dict[str, Any]]:
+        """Get the full transaction data of a record"""
+        pass
+
+    @abstractmethod
+    async def search(
+        self,
+        filters: Dict[str, Any],
+        created_from: Optional[str] = None,
+        created_to: Optional[str] = None,
+        cursor: Optional[Tuple[str, str]] = None,
+        limit: int = 100,
+        include_details: bool = False,
+    ) -> List[Dict[str, Any]]:
+        """
+        Search records, most recent first
+
+        Args:
+            filters: Equality filters on FILTER_COLUMNS
+            created_from: Inclusive lower bound of created_at
+            created_to: Inclusive upper bound of created_at
+            cursor: (created_at, transaction_id) of the last record of the previous page
+            limit: Maximum number of records
+            include_details: Whether to include the full transaction in `data`
+        """
+        pass
+
+    def is_unavailable(self, error: BaseException) -> bool:
+        """Whether an error means the store cannot be reached (connection or timeout),
+        as opposed to an error specific to the request"""
+        return isinstance(error, (asyncio.TimeoutError, ConnectionError))
+
+    async def close(self) -> None:
+        """Release the resources of the store"""
+        pass
+
+class SupabaseTransactionStore(TransactionStore):
+    """Store backed by the Supabase `transactions` table (see migrations/)"""
+
+    def __init__(self, client: Client):
+        self.client = client
+
+    async def upsert_many(self, records: List[Dict[str, Any]]) -> None:
+        await asyncio.to_thread(
+            lambda: self.client.table(TABLE).upsert(records, on_conflict="transaction_id").execute()
+        )
+
+    def is_unavailable(self, error: BaseException) -> bool:
+        return super().is_unavailable(error) or isinstance(error, httpx.TransportError)
+
+    async def get(self, transaction_id: str) -> Optional[Dict[str, Any]]:
+        response = await asyncio.to_thread(
+            lambda: self.client.table(TABLE).select('data').eq('transaction_id', transaction_id).execute()
+        )
+        if response.data:
+            return response.data[0].get('data', {})
+        return None
+
+    async def search(self, filters, created_from=None, created_to=None, cursor=None, limit=100, include_details=False):
+        columns = SUMMARY_COLUMNS + (["data"] if include_details else [])
+        query = self.client.table(TABLE).select(", ".join(columns))
+
+        for column, value in filters.items():
+            query = query.eq(column, value)
+        if created_from:
+            query = query.gte("created_at", created_from)
+        if created_to:
+            query = query.lte("created_at", created_to)
+        if cursor:
+            created_at, transaction_id = cursor
+            # Reserved characters in PostgREST logic trees must be quoted
+            query = query.or_(
+                f'created_at.lt."{created_at}",'
+                f'and(created_at.eq."{created_at}",transaction_id.lt."{transaction_id}")'
+            )
+
+        query = query.order("created_at", desc=True).order("transaction_id", desc=True).limit(limit)
+        response = await asyncio.to_thread(query.execute)
+        return response.data or []
+
+class SQLTransactionStore(TransactionStore):
+    """
+    Store backed by a local SQLite file (`sqlite:///path.db`) or a PostgreSQL
+    database (`postgresql://...`, requires psycopg). The table and its indexes
+    are created on first use.
+    """
+
+    def __init__(self, dsn: str):
+        if dsn.startswith("sqlite:///"):
+            self.dialect = "sqlite"
+        elif dsn.startswith(("postgresql://", "postgres://")):
+            self.dialect = "postgres"
+        else:
+            raise ValueError(f"Unsupported persistence DSN: {dsn}")
+        self.dsn = dsn
+        self._connection = None
+        # A single connection, used from worker threads one call at a time
+        self._lock = threading.Lock()
+
+    def _connect(self):
+        if self.dialect == "sqlite":
+            connection = sqlite3.connect(self.dsn[len("sqlite:///"):], check_same_thread=False)
+            connection.row_factory = sqlite3.Row
+            connection.execute("PRAGMA journal_mode=WAL")
+            id_column, json_type, timestamp_type = "INTEGER PRIMARY KEY AUTOINCREMENT", "TEXT", "TEXT"
+        else:
+            try:
+                import psycopg
+                from psycopg.rows import dict_row
+            except ImportError as e:
+                raise RuntimeError("psycopg is required to use a PostgreSQL persistence store") from e
+            connection = psycopg.connect(self.dsn, autocommit=True, row_factory=dict_row)
+            id_column, json_type, timestamp_type = "BIGSERIAL PRIMARY KEY", "JSONB", "TIMESTAMPTZ"
+
+        connection.execute(f"""
+            CREATE TABLE IF NOT EXISTS {TABLE} (
+                id {id_column},
+                transaction_id TEXT NOT NULL UNIQUE,
+                from_address TEXT,
+                to_address TEXT,
+                chain_id BIGINT,
+                status TEXT,
+                agent_decision TEXT,
+                created_at {timestamp_type} NOT NULL,
+                data {json_type} NOT NULL
+            )
+        """)
+        for name, columns in INDEXES.items():
+            connection.execute(f"CREATE INDEX IF NOT EXISTS {name} ON {TABLE} ({columns})")
+        if self.dialect == "sqlite":
+            connection.commit()
+        logger.info(f"SQL transaction store ready ({self.dialect})")
+        return connection
+
+    def _execute(self, sql: str, params: Any = (), many: bool = False, fetch: bool = False) -> Optional[List[Dict[str, Any]]]:
+        with self._lock:
+            if self._connection is None:
+                self._connection = self._connect()
+            if self.dialect == "postgres":
+                sql = sql.replace("?", "%s")
+            cursor = self._connection.cursor()
+            if many:
+                cursor.executemany(sql, params)
+            else:
+                cursor.execute(sql, params)
+            rows = [dict(row) for row in cursor.fetchall()] if fetch else None
+            if self.dialect == "sqlite":
+                self._connection.commit()
+            return rows
+
+    async def _run(self, sql: str, params: Any = (), many: bool = False, fetch: bool = False):
+        return await asyncio.to_thread(self._execute, sql, params, many, fetch)
+
+    def _decode(self, row: Dict[str, Any]) -> Dict[str, Any]:
+        if "created_at" in row:
+            row["created_at"] = format_timestamp(row["created_at"])
+        if isinstance(row.get("data"), str):
+            row["data"] = json.loads(row["data"])
+        return row
+
+    async def upsert_many(self, records: List[Dict[str, Any]]) -> None:
+        if not records:
+            return
+        columns = RECORD_COLUMNS
+        updates = ", ".join(f"{column} = excluded.{column}" for column in columns if column != "transaction_id")
+        await self._run(
+            f"INSERT INTO {TABLE} ({', '.join(columns)}) VALUES ({', '.join('?' for _ in columns)}) "
+            f"ON CONFLICT (transaction_id) DO UPDATE SET {updates}",
+            [
+                [json.dumps(record.get(column)) if column == "data" else record.get(column) for column in columns]
+                for record in records
+            ],
+            many=True
+        )
+
+    def is_unavailable(self, error: BaseException) -> bool:
+        if super().is_unavailable(error):
+            return True
+        # Connection failures, locked database, ... (psycopg is only loaded for PostgreSQL)
+        psycopg = sys.modules.get("psycopg")
+        operational_errors = (sqlite3.OperationalError,) + ((psycopg.OperationalError,) if psycopg else ())
+        return isinstance(error, operational_errors)
+
+    async def get(self, transaction_id: str) -> Optional[Dict[str, Any]]:
+        rows = await self._run(f"SELECT data FROM {TABLE} WHERE transaction_id = ?", [transaction_id], fetch=True)
+        return self._decode(rows[0])["data"] if rows else None
+
+    async def search(self, filters, created_from=None, created_to=None, cursor=None, limit=100, include_details=False):
+        columns = SUMMARY_COLUMNS + (["data"] if include_details else [])
+        conditions, params = [], []
+
+        for column, value in filters.items():
+            if column not in FILTER_COLUMNS:
+                raise ValueError(f"Cannot filter on {column}")
+            conditions.append(f"{column} = ?")
+            params.append(value)
+        if created_from:
+            conditions.append("created_at >= ?")
+            params.append(created_from)
+        if created_to:
+            conditions.append("created_at <= ?")
+            params.append(created_to)
+        if cursor:
+            conditions.append("(created_at, transaction_id) < (?, ?)")
+            params.extend(cursor)
+
+        where = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+        rows = await self._run(
+            f"SELECT {', '.join(columns)} FROM {TABLE} {where} "
+            f"ORDER BY created_at DESC, transaction_id DESC LIMIT ?",
+            params + [limit],
+            fetch=True
+        )
+        return [self._decode(row) for row in rows]
+
+    async def close(self) -> None:
+        with self._lock:
+            if self._connection is not None:
+                self._connection.close()
+                self._connection = None
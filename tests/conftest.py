@@ -0,0 +1,22 @@
+import fakeredis
+import pytest
+from src.config import get_settings
+from src.state_manager import StateManager
+
+@pytest.fixture
+def settings():
+    return get_settings()
+
+@pytest.fixture
+def state():
+    """StateManager backed by an in-memory Redis"""
+    server = fakeredis.FakeServer()
+    manager = StateManager()
+    manager.settings = get_settings()
+    StateManager._redis = fakeredis.aioredis.FakeRedis(server=server, decode_responses=True)
+    StateManager._pubsub_redis = fakeredis.aioredis.FakeRedis(server=server, decode_responses=True)
+    StateManager._subscriber_redis = fakeredis.aioredis.FakeRedis(server=server, decode_responses=True)
+    yield manager
+    StateManager._redis = None
+    StateManager._pubsub_redis = None
+    StateManager._subscriber_redis = None
@@ -0,0 +1,74 @@
+import asyncio
+import time
+import pytest
+from src.agent import BAIbyAgent, RiskModel
+from src.constants import TransactionStatus
+from src.core import CoreService
+
+def test_malformed_confidence_scores_as_default():
+    model = RiskModel(sentinel_weights={}, chain_thresholds={}, default_threshold=0.5)
+    high_risk, _, _ = model.score(
+        [1, 1],
+        [
+            {"a": {"result": {"risk_level": "medium", "confidence": "very"}}},
+            {"a": {"result": {"risk_level": "medium", "confidence": None}}},
+        ],
+    )
+    assert high_risk.tolist() == [True, True]
+
+def test_malformed_sentinel_result_does_not_fail_the_batch(state):
+    async def run():
+        malformed = await state.initialize_transaction({"chainId": 1, "from_address": "0xa", "to_address": "0xb", "data": "0x"})
+        healthy = await state.initialize_transaction({"chainId": 1, "from_address": "0xc", "to_address": "0xd", "data": "0x"})
+        await state.set_sentinel_status(
+            malformed, "sentinel-one", TransactionStatus.COMPLETED,
+            {"risk_level": ["high"], "confidence": {"not": "a number"}}
+        )
+        await state.set_sentinel_status(healthy, "sentinel-one", TransactionStatus.COMPLETED, {"risk_level": "low"})
+
+        await BAIbyAgent().analyze([malformed, healthy])
+        return await state.get_agent_status(malformed), await state.get_agent_status(healthy)
+
+    malformed_status, healthy_status = asyncio.run(run())
+    assert malformed_status["status"] == TransactionStatus.COMPLETED
+    assert healthy_status["status"] == TransactionStatus.COMPLETED
+    assert healthy_status["result"]["approved"] is True
+
+def test_sentinel_result_written_during_analysis_is_kept(state, monkeypatch):
+    async def run():
+        transaction_id = await state.initialize_transaction({"chainId": 1, "from_address": "0xa", "to_address": "0xb", "data": "0x"})
+        await state.set_sentinel_status(transaction_id, "sentinel-one", TransactionStatus.COMPLETED, {"risk_level": "low"})
+
+        read_fields = state.get_fields_batch
+
+        async def read_then_hedge_lands(*args):
+            records = await read_fields(*args)
+            # A hedge result written after the agent read the validations
+            await state.set_sentinel_status(transaction_id, "sentinel-two", TransactionStatus.COMPLETED, {"risk_level": "low"})
+            return records
+
+        monkeypatch.setattr(state, "get_fields_batch", read_then_hedge_lands)
+        await BAIbyAgent().analyze([transaction_id])
+        return await state.get_transaction(transaction_id)
+
+    transaction = asyncio.run(run())
+    statuses = {validation["name"]: validation["status"] for validation in transaction["validations"]}
+    assert statuses == {
+        "sentinel-one": TransactionStatus.COMPLETED,
+        "sentinel-two": TransactionStatus.COMPLETED,
+        "agent": TransactionStatus.COMPLETED,
+    }
+
+def test_agent_failure_fails_the_caller_without_waiting_for_the_deadline(state):
+    core = CoreService()
+    core.state = state
+
+    async def run():
+        transaction_id = await state.initialize_transaction({"chainId": 1, "from_address": "0xa", "to_address": "0xb", "data": "0x"})
+        await state.set_agent_status(transaction_id, TransactionStatus.FAILED, {"error": "model error"})
+        started_at = time.monotonic()
+        with pytest.raises(RuntimeError, match="Agent failed"):
+            await core._wait_for_agent_decision(transaction_id, time.time() + 30)
+        return time.monotonic() - started_at
+
+    assert asyncio.run(run()) < 1
@@ -0,0 +1,25 @@
+import asyncio
+import pytest
+from src.constants import TransactionStatus
+from src.core import CoreService
+from src.stats_service import get_stats_service
+
+TRANSACTION = {"chainId": 1, "from_address": "0xa", "to_address": "0xb", "data": "0x", "timeout": 5}
+
+def test_dispatch_error_fails_the_transaction(state):
+    core = CoreService()
+    core.state = state
+
+    async def run():
+        # Registered sentinels only cover chain 10
+        await state.set_active_sentinels({"SentinelOne"})
+        await state.set_sentinel_partitions("SentinelOne", "worker-1", ["10"])
+        with pytest.raises(ValueError, match="No sentinels found"):
+            await core.analyze_transaction(TRANSACTION)
+        transaction_ids = await state.get_all_transactions()
+        return await state.get_transaction(transaction_ids[0]), await get_stats_service().get_totals()
+
+    transaction, totals = asyncio.run(run())
+    assert transaction["status"] == TransactionStatus.FAILED
+    assert totals["transactions"] == 1
+    assert totals["status:failed"] == 1
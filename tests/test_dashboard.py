@@ -0,0 +1,53 @@
+import asyncio
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from src.constants import TransactionStatus
+from src.dashboard_view import DashboardView, get_dashboard_view
+from src.routers.api import router
+from src.stats_service import get_stats_service
+
+TRANSACTION = {"chainId": 1, "from_address": "0xa", "to_address": "0xb", "data": "0x"}
+
+@pytest.fixture
+def client(state):
+    DashboardView._instance = None
+    app = FastAPI()
+    app.include_router(router)
+    with TestClient(app) as client:
+        yield client
+    DashboardView._instance = None
+
+def _receive(state, status=None) -> str:
+    async def receive():
+        transaction_id = await state.initialize_transaction(TRANSACTION)
+        await get_stats_service().record_received(TRANSACTION)
+        if status:
+            await state.set_transaction_status(transaction_id, status)
+        return transaction_id
+    return asyncio.run(receive())
+
+def test_unchanged_dashboard_is_not_modified(client, state):
+    _receive(state)
+    response = client.get("/api/dashboard")
+    assert response.status_code == 200
+    etag = response.headers["ETag"]
+
+    assert client.get("/api/dashboard", headers={"If-None-Match": etag}).status_code == 304
+
+    _receive(state)
+    response = client.get("/api/dashboard", headers={"If-None-Match": etag})
+    assert response.status_code == 200
+    assert response.headers["ETag"] != etag
+    assert response.json()["total_transactions"] == 2
+
+def test_total_comes_from_the_stats_counters(client, state, settings, monkeypatch):
+    monkeypatch.setattr(settings, "DASHBOARD_MAX_TRANSACTIONS", 1)
+    first = _receive(state, TransactionStatus.COMPLETED)
+    _receive(state, TransactionStatus.COMPLETED)
+    assert client.get("/api/dashboard").json()["total_transactions"] == 2
+
+    # The first transaction was evicted from the view: re-applying it (e.g. by the
+    # persistence listener) must not count it again
+    get_dashboard_view().apply({"transaction_id": first, "created_at": 0, "status": TransactionStatus.COMPLETED})
+    assert client.get("/api/dashboard").json()["total_transactions"] == 2
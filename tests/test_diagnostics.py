@@ -0,0 +1,77 @@
+import asyncio
+import threading
+import time
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from src.diagnostics import LoopMonitor, sample_stacks
+from src.routers.admin import router
+
+@pytest.fixture
+def monitor(settings, monkeypatch):
+    monkeypatch.setattr(settings, "LOOP_MONITOR_INTERVAL", 0.01)
+    monkeypatch.setattr(settings, "SLOW_CALLBACK_THRESHOLD", 0.05)
+    LoopMonitor._instance = None
+    monitor = LoopMonitor()
+    yield monitor
+    monitor.stop()
+    LoopMonitor._instance = None
+
+def blocking_handler():
+    time.sleep(0.3)
+
+def test_blocked_loop_is_reported_once_with_its_stack(monitor):
+    async def run():
+        monitor.start()
+        await asyncio.sleep(0.05)
+        blocking_handler()
+        await asyncio.sleep(0.05)
+        monitor.stop()
+
+    asyncio.run(run())
+    snapshot = monitor.snapshot()
+    assert snapshot["stalls"] == 1
+    assert "blocking_handler" in snapshot["last_stall"]["stack"]
+    assert snapshot["samples"] > 0
+    assert snapshot["max"] >= 0.05
+
+def test_disabled_monitor_does_not_start(monitor, settings, monkeypatch):
+    monkeypatch.setattr(settings, "LOOP_MONITOR_ENABLED", False)
+
+    async def run():
+        monitor.start()
+
+    asyncio.run(run())
+    assert monitor.snapshot()["running"] is False
+
+def test_sampled_stacks_are_folded():
+    stop = threading.Event()
+    thread = threading.Thread(target=stop.wait, name="sampled-worker")
+    thread.start()
+    try:
+        folded = sample_stacks(0.05, 0.01)
+    finally:
+        stop.set()
+        thread.join()
+    line = next(line for line in folded.splitlines() if line.startswith("sampled-worker;"))
+    stack, count = line.rsplit(" ", 1)
+    assert "wait (threading.py" in stack
+    assert int(count) > 0
+
+@pytest.fixture
+def admin_client():
+    app = FastAPI()
+    app.include_router(router)
+    with TestClient(app) as client:
+        yield client
+
+@pytest.mark.parametrize("configured, sent, status", [
+    (None, "secret", 404),
+    ("secret", None, 403),
+    ("secret", "wrong", 403),
+    ("secret", "secret", 200),
+])
+def test_admin_token(admin_client, settings, monkeypatch, configured, sent, status):
+    monkeypatch.setattr(settings, "ADMIN_TOKEN", configured)
+    headers = {"X-Admin-Token": sent} if sent else {}
+    assert admin_client.get("/admin/loop", headers=headers).status_code == status
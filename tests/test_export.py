@@ -0,0 +1,66 @@
+import asyncio
+import pytest
+from src.export import export_schema, export_to_file
+from src.persistence_service import build_record
+from src.transaction_store import SQLTransactionStore
+
+pa = pytest.importorskip("pyarrow")
+pq = pytest.importorskip("pyarrow.parquet")
+
+START = 1_700_000_000
+
+def _transaction(index: int) -> dict:
+    return {
+        "transaction_id": f"tx-{index}",
+        "chainId": 1,
+        "from_address": "0xA",
+        "to_address": "0xB",
+        "value": str(2 ** 70),
+        "status": "completed",
+        "created_at": START + index,
+        "validations": [
+            {"name": "SentinelOne", "status": "completed", "result": {"risk_level": "low", "confidence": 0.9}},
+            {"name": "agent", "status": "completed", "result": {"approved": index % 2 == 0, "warnings": []}},
+        ],
+    }
+
+@pytest.fixture
+def store(tmp_path):
+    store = SQLTransactionStore(f"sqlite:///{tmp_path / 'transactions.db'}")
+    asyncio.run(store.upsert_many([build_record(_transaction(index)) for index in range(5)]))
+    yield store
+    asyncio.run(store.close())
+
+def test_parquet_round_trip(store, tmp_path):
+    path = str(tmp_path / "transactions.parquet")
+    asyncio.run(export_to_file(path, store, export_format="parquet", page_size=2))
+
+    table = pq.read_table(path)
+    assert table.num_rows == 5
+    assert table.schema.names == export_schema(["SentinelOne"]).names
+    # One row group per page
+    assert pq.ParquetFile(path).num_row_groups == 3
+
+    rows = table.to_pylist()
+    assert [row["transaction_id"] for row in rows] == [f"tx-{index}" for index in range(4, -1, -1)]
+    assert rows[0]["value"] == str(2 ** 70)
+    assert rows[0]["agent_approved"] is True
+    assert rows[0]["SentinelOne_confidence"] == 0.9
+
+def test_arrow_round_trip_of_a_time_range(store, tmp_path):
+    path = str(tmp_path / "transactions.arrows")
+    asyncio.run(export_to_file(
+        path, store, export_format="arrow", created_from=str(START + 1), created_to=str(START + 3),
+        sentinel_names=["SentinelOne", "SentinelTwo"],
+    ))
+
+    with pa.ipc.open_stream(path) as reader:
+        table = reader.read_all()
+    assert table.num_rows == 3
+    assert table.schema.names == export_schema(["SentinelOne", "SentinelTwo"]).names
+    assert table.column("SentinelTwo_status").to_pylist() == [None, None, None]
+
+def test_empty_range_is_a_valid_file(store, tmp_path):
+    path = str(tmp_path / "empty.parquet")
+    asyncio.run(export_to_file(path, store, created_from=str(START + 100)))
+    assert pq.read_table(path).num_rows == 0
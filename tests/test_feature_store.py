@@ -0,0 +1,54 @@
+import asyncio
+import pytest
+from src.feature_store import GWEI, FeatureStore
+
+NOW = 1_700_000_000  # on a 10 second bucket boundary
+
+@pytest.fixture
+def features(state, settings, monkeypatch):
+    monkeypatch.setattr(settings, "FEATURE_WINDOWS", {"1m": 60})
+    monkeypatch.setattr(settings, "FEATURE_WINDOW_BUCKETS", 6)
+    FeatureStore._instance = None
+    yield FeatureStore()
+    FeatureStore._instance = None
+
+def _record(features, transactions):
+    async def run():
+        for timestamp, to_address, value in transactions:
+            await features.record({"from_address": "0xA", "to_address": to_address, "value": value}, timestamp)
+    asyncio.run(run())
+
+def test_window_counts_value_and_distinct_counterparties(features):
+    _record(features, [
+        (NOW + 1, "0xb", str(2 * GWEI)),
+        (NOW + 25, "0xB", hex(3 * GWEI)),
+        (NOW + 40, "0xc", "0"),
+    ])
+    vector = asyncio.run(features.get_features(["0xa"], now=NOW + 59))["0xa"]
+    assert vector == {
+        "tx_count_1m": 3,
+        "value_gwei_1m": 5,
+        "velocity_gwei_per_s_1m": 5 / 60,
+        "distinct_counterparties_1m": 2,
+    }
+
+def test_oldest_bucket_is_weighted_by_its_overlap(features):
+    _record(features, [(NOW + 1, "0xb", "0"), (NOW + 30, "0xb", "0")])
+    # The window starts halfway through the bucket of the first transaction
+    vector = asyncio.run(features.get_features(["0xA"], now=NOW + 65))["0xa"]
+    assert vector["tx_count_1m"] == 1.5
+
+def test_transactions_outside_the_window_are_ignored(features):
+    _record(features, [(NOW, "0xb", str(GWEI))])
+    vector = asyncio.run(features.get_features(["0xa"], now=NOW + 200))["0xa"]
+    assert vector["tx_count_1m"] == 0
+    assert vector["value_gwei_1m"] == 0
+
+def test_disabled_store_records_nothing(features, settings, monkeypatch, state):
+    monkeypatch.setattr(settings, "FEATURE_STORE_ENABLED", False)
+    _record(features, [(NOW, "0xb", "0")])
+
+    async def keys():
+        return [key async for key in state._redis.scan_iter("features:*")]
+
+    assert asyncio.run(keys()) == []
@@ -0,0 +1,54 @@
+import asyncio
+from typing import Optional
+import pytest
+from src.constants import TransactionStatus
+from src.sentinels.base_sentinel import BaseSentinel
+
+TRANSACTION = {"chainId": 1, "from_address": "0xa", "to_address": "0xb", "data": "0x"}
+
+class FlakySentinel(BaseSentinel):
+    """Sentinel failing on the primary replica and succeeding on the hedge"""
+
+    def __init__(self, replica_id: str, fails: bool, hedge: Optional["FlakySentinel"] = None):
+        super().__init__()
+        self.replica_id = replica_id
+        self.fails = fails
+        # Hedge completing while this attempt is still running
+        self.hedge = hedge
+
+    async def analyze(self, data: dict) -> dict:
+        if self.hedge:
+            await self.hedge._process_transaction(data["transaction_id"], attempt=1)
+        if self.fails:
+            raise RuntimeError("upstream explorer unavailable")
+        return {"risk_level": "low"}
+
+@pytest.fixture
+def hedging(settings, monkeypatch):
+    monkeypatch.setattr(settings, "HEDGING_ENABLED", True)
+
+def _run_attempts(state, *attempts):
+    async def run():
+        transaction_id = await state.initialize_transaction(TRANSACTION)
+        for sentinel, attempt in attempts:
+            await sentinel._process_transaction(transaction_id, attempt=attempt)
+        return (
+            (await state.get_sentinel_statuses(transaction_id))["FlakySentinel"],
+            await state.get_sentinel_claims(transaction_id, "FlakySentinel"),
+        )
+    return asyncio.run(run())
+
+def test_hedge_succeeds_after_primary_failure(state, hedging):
+    primary, hedge = FlakySentinel("replica-a", fails=True), FlakySentinel("replica-b", fails=False)
+    status, claims = _run_attempts(state, (primary, 0), (hedge, 1))
+    assert status["status"] == TransactionStatus.COMPLETED
+    assert status["result"]["hedged"] is True
+    assert claims["winner"] == "replica-b"
+    assert claims["failed:0"] == "upstream explorer unavailable"
+
+def test_late_primary_failure_keeps_hedge_result(state, hedging):
+    hedge = FlakySentinel("replica-b", fails=False)
+    primary = FlakySentinel("replica-a", fails=True, hedge=hedge)
+    status, claims = _run_attempts(state, (primary, 0))
+    assert status["status"] == TransactionStatus.COMPLETED
+    assert claims["winner"] == "replica-b"
@@ -0,0 +1,51 @@
+import json
+import logging
+import queue
+from src.logging_config import BackgroundQueueHandler, JSONFormatter, SamplingFilter, Truncated
+
+def _record(level=logging.INFO, msg="message %s", args=("arg",), **extra) -> logging.LogRecord:
+    record = logging.LogRecord("test", level, __file__, 1, msg, args, None)
+    record.__dict__.update(extra)
+    return record
+
+def test_full_queue_drops_records_without_blocking():
+    handler = BackgroundQueueHandler(queue.Queue(maxsize=2))
+    for _ in range(5):
+        handler.emit(_record())
+    assert handler.queue.qsize() == 2
+    assert handler.dropped == 3
+
+def test_message_is_rendered_before_queueing():
+    handler = BackgroundQueueHandler(queue.Queue())
+    data = {"status": "pending"}
+    handler.emit(_record(msg="transaction: %s", args=(data,)))
+    # Mutated after the call: the queued record keeps the value at logging time
+    data["status"] = "completed"
+    record = handler.queue.get_nowait()
+    assert record.getMessage() == "transaction: {'status': 'pending'}"
+
+def test_sampling_by_category():
+    sampling = SamplingFilter({"request": 0.0, "sentinel": 1.0})
+    assert not sampling.filter(_record(logging.DEBUG, category="request"))
+    assert sampling.filter(_record(logging.DEBUG, category="sentinel"))
+    # Unconfigured categories and warnings are always kept
+    assert sampling.filter(_record(logging.DEBUG, category="agent"))
+    assert sampling.filter(_record(logging.DEBUG))
+    assert sampling.filter(_record(logging.WARNING, category="request"))
+
+def test_json_lines_carry_extra_fields_truncated():
+    entry = json.loads(JSONFormatter().format(_record(category="request", count=3, payload="x" * 600)))
+    assert entry["message"] == "message arg"
+    assert entry["level"] == "INFO"
+    assert entry["category"] == "request"
+    assert entry["count"] == 3
+    assert entry["payload"] == "x" * 512 + "...(+88 chars)"
+
+def test_truncated_is_lazy():
+    class Payload:
+        def __repr__(self):
+            raise AssertionError("rendered for a disabled level")
+
+    logger = logging.getLogger("test.lazy")
+    logger.setLevel(logging.INFO)
+    logger.debug("payload: %s", Truncated(Payload()))
@@ -0,0 +1,60 @@
+import asyncio
+import time
+import pytest
+from src.constants import Priority
+from src.core import CoreService
+
+def test_restarted_worker_replaces_its_partitions(state):
+    async def run():
+        await state.set_sentinel_partitions("SentinelOne", "worker-1", ["1"])
+        await state.set_sentinel_partitions("SentinelOne", "worker-1", ["10"])
+        return await state.get_sentinel_partitions(["SentinelOne"])
+
+    assert asyncio.run(run()) == {"SentinelOne": {"10"}}
+
+def test_expired_worker_is_dropped(state, settings, monkeypatch):
+    async def run():
+        await state.set_sentinel_partitions("SentinelOne", "worker-1", ["1"])
+        monkeypatch.setattr(settings, "SENTINEL_PARTITIONS_TTL", 0.01)
+        await state.set_sentinel_partitions("SentinelOne", "worker-2", ["10"])
+        await asyncio.sleep(0.02)
+        return await state.get_sentinel_partitions(["SentinelOne"])
+
+    assert asyncio.run(run()) == {"SentinelOne": {"1"}}
+
+def test_core_reloads_partitions(state, settings, monkeypatch):
+    core = CoreService()
+    core.state = state
+
+    async def run():
+        await state.set_active_sentinels({"SentinelOne"})
+        await state.set_sentinel_partitions("SentinelOne", "worker-1", ["1"])
+        first = await core._dispatch_transaction_to_sentinels("tx-1", time.time() + 5, Priority.NORMAL, "1")
+
+        # A new worker takes chain 10; picked up once the refresh interval elapsed
+        await state.set_sentinel_partitions("SentinelOne", "worker-2", ["10"])
+        monkeypatch.setattr(settings, "SENTINEL_PARTITIONS_REFRESH_INTERVAL", 0.0)
+        second = await core._dispatch_transaction_to_sentinels("tx-2", time.time() + 5, Priority.NORMAL, "10")
+        return first, second
+
+    assert asyncio.run(run()) == ({"SentinelOne"}, {"SentinelOne"})
+
+def test_worker_with_no_partitions_covers_none(state):
+    async def run():
+        await state.set_sentinel_partitions("SentinelOne", "worker-1", [])
+        return await state.get_sentinel_partitions(["SentinelOne", "SentinelTwo"])
+
+    # SentinelTwo has no registered worker and receives every partition
+    assert asyncio.run(run()) == {"SentinelOne": set(), "SentinelTwo": None}
+
+def test_core_skips_sentinels_with_no_partitions(state):
+    core = CoreService()
+    core.state = state
+
+    async def run():
+        await state.set_active_sentinels({"SentinelOne"})
+        await state.set_sentinel_partitions("SentinelOne", "worker-1", [])
+        await core._dispatch_transaction_to_sentinels("tx-1", time.time() + 5, Priority.NORMAL, "1")
+
+    with pytest.raises(ValueError, match="No sentinels found"):
+        asyncio.run(run())
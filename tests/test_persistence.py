@@ -0,0 +1,161 @@
+import asyncio
+import base64
+import json
+import sqlite3
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from src.constants import TransactionStatus
+from src.persistence_service import PersistenceService, build_record, encode_cursor
+from src.routers.api import router
+from src.state_manager import SUMMARY_FIELDS, transaction_key
+from src.persistence_spool import PersistenceSpool
+from src.transaction_store import SQLTransactionStore
+
+TRANSACTION = {"chainId": 1, "from_address": "0xa", "to_address": "0xb", "data": "0x"}
+
+class RefusingStore(SQLTransactionStore):
+    """Store that is reachable but refuses every write"""
+
+    async def upsert_many(self, records):
+        raise sqlite3.IntegrityError("NOT NULL constraint failed: transactions.created_at")
+
+@pytest.fixture
+def service(state, tmp_path):
+    service = PersistenceService()
+    service.state = state
+    service.store = SQLTransactionStore(f"sqlite:///{tmp_path / 'transactions.db'}")
+    service.spool = PersistenceSpool(str(tmp_path / "spool"), segment_max_bytes=1 << 20, segment_max_age=60, fsync=False)
+    service.store_healthy = True
+    yield service
+    asyncio.run(service.store.close())
+    service.store = None
+
+def _completed_transaction(state) -> str:
+    async def create():
+        transaction_id = await state.initialize_transaction(TRANSACTION)
+        await state.set_transaction_status(transaction_id, TransactionStatus.COMPLETED)
+        return transaction_id
+    return asyncio.run(create())
+
+def test_record_already_in_the_store_keeps_it_healthy(service, state):
+    transaction_id = _completed_transaction(state)
+    # Written meanwhile by another persistence worker, or by a write that timed out but landed
+    record = build_record(asyncio.run(state.get_transaction(transaction_id)))
+    asyncio.run(service.store.upsert_many([record]))
+
+    assert asyncio.run(service.persist_transaction(transaction_id))
+    assert service.store_healthy
+    assert asyncio.run(service.store.get(transaction_id))["transaction_id"] == transaction_id
+
+def test_refused_record_does_not_open_the_circuit(service, state, tmp_path):
+    service.store = RefusingStore(f"sqlite:///{tmp_path / 'refusing.db'}")
+    transaction_id = _completed_transaction(state)
+    assert not asyncio.run(service.persist_transaction(transaction_id))
+    assert service.store_healthy
+    assert not service.spool.has_data
+
+class UnreachableStore(SQLTransactionStore):
+    """Store that cannot be reached"""
+
+    async def upsert_many(self, records):
+        raise ConnectionError("connection refused")
+
+def test_replayed_transactions_are_shrunk(service, state, tmp_path):
+    store = service.store
+    service.store = UnreachableStore(f"sqlite:///{tmp_path / 'unreachable.db'}")
+    transaction_id = _completed_transaction(state)
+
+    async def run():
+        assert not await service.persist_transaction(transaction_id)
+        assert not service.store_healthy
+        await service.spool.flush()
+
+        service.store = store
+        assert await service.replay_spool() == 1
+        return await state.get_transaction(transaction_id)
+
+    transaction = asyncio.run(run())
+    assert service.store_healthy
+    assert transaction["persisted"] == 1
+    assert "validations" not in transaction
+    assert asyncio.run(store.get(transaction_id))["transaction_id"] == transaction_id
+
+def test_spool_rotates_on_the_event_loop(tmp_path):
+    spool = PersistenceSpool(str(tmp_path), segment_max_bytes=1, segment_max_age=60, fsync=False)
+
+    async def run():
+        for index in range(3):
+            spool.append({"transaction_id": str(index)})
+            await spool.flush()
+        await spool.seal()
+        return spool.sealed_segments()
+
+    segments = asyncio.run(run())
+    # One record per segment, each segment rotated out by size
+    assert [PersistenceSpool.read_segment(path) for path in segments] == [
+        [{"transaction_id": "0"}], [{"transaction_id": "1"}], [{"transaction_id": "2"}]
+    ]
+
+def _record(transaction_id: str, created_at: float) -> dict:
+    return build_record({**TRANSACTION, "transaction_id": transaction_id, "created_at": created_at, "status": "completed"})
+
+def test_keyset_pagination_across_equal_timestamps(service):
+    # Five records sharing a timestamp, ordered by transaction_id within it
+    records = [_record(f"tx-{index}", 1700000000) for index in range(5)] + [_record("tx-old", 1600000000)]
+    asyncio.run(service.store.upsert_many(records))
+
+    async def search_all():
+        pages, cursor = [], None
+        while True:
+            items, cursor = await service.search_transactions({}, cursor=cursor, limit=2)
+            pages.append([item["transaction_id"] for item in items])
+            if cursor is None:
+                return pages
+
+    assert asyncio.run(search_all()) == [["tx-4", "tx-3"], ["tx-2", "tx-1"], ["tx-0", "tx-old"]]
+
+def _cursor(position) -> str:
+    return base64.urlsafe_b64encode(json.dumps(position).encode()).decode()
+
+@pytest.mark.parametrize("cursor", [
+    "not base64!",
+    base64.urlsafe_b64encode(b"not json").decode(),
+    _cursor({"created_at": "2024-01-01T00:00:00"}),
+    _cursor([{}, "x"]),
+    _cursor(["2024-01-01T00:00:00", 1]),
+    _cursor(["2024-01-01T00:00:00"]),
+    _cursor(["not a date", "tx-1"]),
+])
+def test_bad_cursor_is_a_client_error(service, cursor):
+    app = FastAPI()
+    app.include_router(router)
+    with TestClient(app) as client:
+        response = client.get("/api/transactions", params={"cursor": cursor})
+    assert response.status_code == 400
+    assert response.json()["detail"] == "Invalid cursor"
+
+def test_cursor_round_trip(service):
+    asyncio.run(service.store.upsert_many([_record("tx-1", 1700000000), _record("tx-2", 1700000000)]))
+    cursor = encode_cursor(asyncio.run(service.search_transactions({}, limit=1))[0][0])
+    items, _ = asyncio.run(service.search_transactions({}, cursor=cursor, limit=1))
+    assert [item["transaction_id"] for item in items] == ["tx-1"]
+
+def test_persisted_transaction_is_shrunk_to_a_summary(service, state, settings):
+    transaction_id = _completed_transaction(state)
+
+    async def run():
+        assert await service.persist_transaction(transaction_id)
+        key = transaction_key(transaction_id)
+        return (
+            await state._redis.hgetall(key),
+            await state._redis.ttl(key),
+            await service.get_transaction_details(transaction_id),
+        )
+
+    summary, ttl, details = asyncio.run(run())
+    assert set(summary) == {*SUMMARY_FIELDS, "persisted"}
+    assert 0 < ttl <= settings.PERSISTED_SUMMARY_TTL
+    # Details are served from the store, calldata included
+    assert details["data"] == "0x"
+    assert details["to_address"] == "0xb"
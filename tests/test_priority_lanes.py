@@ -0,0 +1,38 @@
+import asyncio
+from collections import Counter
+from src.constants import Priority
+from src.priority_lanes import LaneScheduler
+
+def test_backlogged_lanes_follow_their_weights():
+    scheduler = LaneScheduler({"high": 8, "normal": 3, "low": 1})
+    for lane in Priority:
+        for index in range(100):
+            scheduler.put(lane, index)
+
+    served = Counter(scheduler.get_nowait()[0] for _ in range(48))
+    assert served == {Priority.HIGH: 32, Priority.NORMAL: 12, Priority.LOW: 4}
+
+def test_items_of_a_lane_are_served_in_order():
+    scheduler = LaneScheduler({"high": 8, "normal": 3, "low": 1})
+    for index in range(3):
+        scheduler.put(Priority.LOW, index)
+    assert [scheduler.get_nowait() for _ in range(4)] == [
+        (Priority.LOW, 0), (Priority.LOW, 1), (Priority.LOW, 2), None
+    ]
+
+def test_idle_lanes_do_not_bank_credit():
+    scheduler = LaneScheduler({"high": 8, "normal": 3, "low": 1})
+    for index in range(12):
+        scheduler.put(Priority.LOW, index)
+    for _ in range(12):
+        scheduler.get_nowait()
+
+    # The low lane served alone does not earn a burst once high priority work arrives
+    for index in range(8):
+        scheduler.put(Priority.HIGH, index)
+        scheduler.put(Priority.LOW, index)
+    first = [scheduler.get_nowait()[0] for _ in range(9)]
+    assert Counter(first) == {Priority.HIGH: 8, Priority.LOW: 1}
+
+def test_get_times_out_on_empty_lanes():
+    assert asyncio.run(LaneScheduler({}).get(timeout=0.01)) is None
@@ -0,0 +1,61 @@
+import asyncio
+import pytest
+from src.result_cache import ResultCache
+
+@pytest.fixture
+def cache(state):
+    ResultCache._instance = None
+    yield ResultCache()
+    ResultCache._instance = None
+
+class Analysis:
+    """Slow analysis counting its runs"""
+
+    def __init__(self, result=None):
+        self.calls = 0
+        self.result = result or {"risk_level": "low"}
+
+    async def __call__(self):
+        self.calls += 1
+        await asyncio.sleep(0.01)
+        return self.result
+
+def test_concurrent_lookups_share_one_analysis(cache):
+    analysis = Analysis()
+
+    async def run():
+        return await asyncio.gather(*(cache.get_or_analyze("SentinelOne", "0xb", 60, analysis) for _ in range(5)))
+
+    results = asyncio.run(run())
+    assert analysis.calls == 1
+    assert [hit for _, hit in results] == [False, True, True, True, True]
+    assert all(result == {"risk_level": "low"} for result, _ in results)
+
+def test_results_are_shared_through_redis(cache):
+    analysis = Analysis()
+    asyncio.run(cache.get_or_analyze("SentinelOne", "0xb", 60, analysis))
+
+    # Another process: empty local cache, same Redis
+    ResultCache._instance = None
+    result, hit = asyncio.run(ResultCache().get_or_analyze("SentinelOne", "0xb", 60, analysis))
+    assert (result, hit) == ({"risk_level": "low"}, True)
+    assert analysis.calls == 1
+
+def test_errors_are_not_cached(cache):
+    analysis = Analysis({"error": "explorer unavailable"})
+    for _ in range(2):
+        asyncio.run(cache.get_or_analyze("SentinelOne", "0xb", 60, analysis))
+    assert analysis.calls == 2
+
+def test_caller_giving_up_does_not_cancel_the_others(cache):
+    analysis = Analysis()
+
+    async def run():
+        impatient = asyncio.create_task(cache.get_or_analyze("SentinelOne", "0xb", 60, analysis))
+        patient = asyncio.create_task(cache.get_or_analyze("SentinelOne", "0xb", 60, analysis))
+        await asyncio.sleep(0)
+        impatient.cancel()
+        return await patient
+
+    assert asyncio.run(run()) == ({"risk_level": "low"}, True)
+    assert analysis.calls == 1
@@ -0,0 +1,185 @@
+import asyncio
+import json
+import httpx
+import pytest
+import rlp
+from eth_account import Account
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from src.raw_transaction import RawTransactionError, decode_raw_transaction
+from src.routers import rpc
+from src.rpc_proxy import get_rpc_proxy
+
+# EIP-155 example transaction, signed by the key 0x4646...46
+LEGACY_RAW = (
+    "0xf86c098504a817c800825208943535353535353535353535353535353535353535880de0b6b3a764000080"
+    "25a028ef61340bd939bc2195fe537567866003e1a15d3c71ff63e1590620aa636276a067cbe9d8997f761aec"
+    "b703304b3800ccf555c9f3dc64214b297fb1966a3b6d83"
+)
+LEGACY_SENDER = "0x9d8a62f656a8d1615c1294fd71e9cfb3e4855a4f"
+
+ACCOUNT = Account.from_key("0x" + "c0" * 32)
+TO = "0x" + "11" * 20
+FAILING = "0x" + "ff" * 20
+
+def _sign(**transaction) -> str:
+    return "0x" + ACCOUNT.sign_transaction({"nonce": 1, "gas": 21000, **transaction}).raw_transaction.hex()
+
+def test_decode_legacy_raw_transaction():
+    decoded = decode_raw_transaction(LEGACY_RAW)
+    assert decoded == {
+        "chainId": 1,
+        "from": LEGACY_SENDER,
+        "to": "0x" + "35" * 20,
+        "value": 10 ** 18,
+        "data": "0x",
+    }
+
+@pytest.mark.parametrize("fees", [
+    {"gasPrice": 2},
+    {"type": 1, "gasPrice": 2, "accessList": []},
+    {"type": 2, "maxFeePerGas": 2, "maxPriorityFeePerGas": 1},
+])
+def test_decode_signed_transactions(fees):
+    decoded = decode_raw_transaction(_sign(chainId=10, to=TO, value=5, data="0xa9059cbb", **fees))
+    assert decoded == {
+        "chainId": 10,
+        "from": ACCOUNT.address.lower(),
+        "to": TO,
+        "value": 5,
+        "data": "0xa9059cbb",
+    }
+
+def test_decode_contract_creation():
+    raw = _sign(type=2, chainId=1, to=b"", value=0, data="0x6080", maxFeePerGas=2, maxPriorityFeePerGas=1)
+    assert decode_raw_transaction(raw)["to"] == ""
+
+def _with_signature(raw: str, v: bytes = None, r: bytes = None, s: bytes = None) -> bytes:
+    fields = rlp.decode(bytes.fromhex(raw[2:]))
+    fields[6:9] = [v if v is not None else fields[6], r if r is not None else fields[7], s if s is not None else fields[8]]
+    return rlp.encode(fields)
+
+@pytest.mark.parametrize("raw", [
+    "0xdeadbeef",
+    "0x05c0",  # unknown transaction type
+    "not hex",
+    _with_signature(LEGACY_RAW, r=b""),  # r = 0
+    _with_signature(LEGACY_RAW, s=b"\xff" * 32),  # s above the curve order
+    _with_signature(LEGACY_RAW, v=b"\x05"),  # invalid v
+])
+def test_bad_raw_transactions_are_rejected(raw):
+    with pytest.raises(RawTransactionError):
+        decode_raw_transaction(raw)
+
+def test_tampered_signature_recovers_another_sender():
+    assert decode_raw_transaction(_with_signature(LEGACY_RAW, r=b"\x01"))["from"] != LEGACY_SENDER
+
+@pytest.fixture
+def proxy(settings, monkeypatch):
+    """RPC proxy mode against a stub upstream node recording what it receives"""
+    monkeypatch.setattr(settings, "RPC_PROXY_ENABLED", True)
+    monkeypatch.setattr(settings, "RPC_UPSTREAM_URL", "http://upstream.test")
+    received = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        payload = json.loads(request.content)
+        received.extend(payload if isinstance(payload, list) else [payload])
+        return httpx.Response(200, json={"jsonrpc": "2.0", "id": 0, "result": "0xhash"})
+
+    asyncio.run(get_rpc_proxy().init(transport=httpx.MockTransport(handler)))
+    yield received
+    get_rpc_proxy().client = None
+
+def _screening(monkeypatch, approved: bool):
+    screened = []
+
+    async def analyze_transaction(data):
+        screened.append(data)
+        if data["from_address"] == FAILING:
+            raise RuntimeError("redis://internal-host:6379 unreachable")
+        return {
+            "transaction_id": "tx",
+            "data": data["data"],
+            "validations": [{"name": "agent", "result": {"approved": approved, "risk_level": "low", "warnings": []}}],
+        }
+
+    monkeypatch.setattr(rpc.core, "analyze_transaction", analyze_transaction)
+    return screened
+
+def _send_raw(raw: str):
+    entry = {"jsonrpc": "2.0", "id": 1, "method": "eth_sendRawTransaction", "params": [raw]}
+    return asyncio.run(rpc._handle_batch([entry]))[0]
+
+def test_rejected_raw_transaction_is_not_forwarded(proxy, monkeypatch):
+    screened = _screening(monkeypatch, approved=False)
+    response = _send_raw(LEGACY_RAW)
+    assert response["error"]["code"] == -32003
+    assert screened[0]["from_address"] == LEGACY_SENDER
+    assert proxy == []
+
+def test_undecodable_raw_transaction_is_not_forwarded(proxy, monkeypatch):
+    screened = _screening(monkeypatch, approved=True)
+    response = _send_raw("0xdeadbeef")
+    assert response["error"]["code"] == -32003
+    assert screened == []
+    assert proxy == []
+
+def test_approved_raw_transaction_is_forwarded(proxy, monkeypatch):
+    _screening(monkeypatch, approved=True)
+    response = _send_raw(LEGACY_RAW)
+    assert response["result"] == "0xhash"
+    assert [item["method"] for item in proxy] == ["eth_sendRawTransaction"]
+
+def test_unscreenable_submission_is_not_forwarded(proxy, monkeypatch):
+    _screening(monkeypatch, approved=True)
+    entry = {"jsonrpc": "2.0", "id": 1, "method": "eth_sendBundle", "params": [{"txs": [LEGACY_RAW]}]}
+    response = asyncio.run(rpc._handle_batch([entry]))[0]
+    assert response["error"]["code"] == -32601
+    assert proxy == []
+
+@pytest.fixture
+def client():
+    app = FastAPI()
+    app.include_router(rpc.router)
+    with TestClient(app) as client:
+        yield client
+
+def _send_transaction(request_id, sender: str = TO) -> dict:
+    transaction = {"from": sender, "to": TO, "value": "0x0", "data": "0xa9059cbb", "chainId": "0x1"}
+    return {"jsonrpc": "2.0", "id": request_id, "method": "eth_sendTransaction", "params": [transaction]}
+
+def test_send_transaction_returns_the_verdict_only(client, monkeypatch):
+    _screening(monkeypatch, approved=True)
+    response = client.post("/rpc", json=_send_transaction(1)).json()
+    assert response["result"] == {"transaction_id": "tx", "approved": True, "risk_level": "low", "warnings": []}
+
+def test_batch_keeps_order_and_ids_with_mixed_errors(client, monkeypatch):
+    _screening(monkeypatch, approved=False)
+    batch = [
+        _send_transaction("a"),
+        {"jsonrpc": "2.0", "id": 2, "method": "eth_getBalance", "params": []},
+        {"jsonrpc": "2.0", "method": "eth_sendTransaction", "params": [{}]},  # notification: no response
+        {"id": 3},
+        _send_transaction(4, sender=FAILING),
+        {"jsonrpc": "2.0", "id": 5, "method": "eth_sendTransaction", "params": []},
+    ]
+    responses = client.post("/rpc", json=batch).json()
+
+    assert [response["id"] for response in responses] == ["a", 2, 3, 4, 5]
+    assert responses[0]["result"]["approved"] is False
+    assert [response.get("error", {}).get("code") for response in responses[1:]] == [-32601, -32600, -32603, -32602]
+    # Internal errors do not leak exception messages
+    assert responses[3]["error"]["message"] == "Internal error"
+    assert responses[3]["error"].get("data") is None
+
+def test_notification_only_batch_has_no_content(client, monkeypatch):
+    _screening(monkeypatch, approved=True)
+    response = client.post("/rpc", json=[{"jsonrpc": "2.0", "method": "eth_sendTransaction", "params": [{}]}])
+    assert response.status_code == 204
+
+def test_rpc_lane_comes_from_the_api_key(client, settings, monkeypatch):
+    screened = _screening(monkeypatch, approved=True)
+    monkeypatch.setattr(settings, "PRIORITY_API_KEY_LANES", {"premium-key": "high"})
+    client.post("/rpc", json=_send_transaction(1), headers={"X-API-Key": "premium-key"})
+    client.post("/rpc", json=[_send_transaction(2)])
+    assert [data["priority"] for data in screened] == ["high", "normal"]
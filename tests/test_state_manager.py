@@ -0,0 +1,55 @@
+import asyncio
+from redis.asyncio import BlockingConnectionPool
+
+def test_subscriptions_do_not_grow_the_publish_pool(state):
+    publish_pool = state._pubsub_redis.connection_pool
+    max_connections = publish_pool.max_connections
+
+    async def run():
+        for _ in range(3):
+            pubsub = await state.subscribe_to_channel("channel", patterns=["channel:*"])
+            await pubsub.aclose()
+
+    asyncio.run(run())
+    assert publish_pool.max_connections == max_connections
+
+def test_subscriber_pool_is_separate_and_unbounded(state, settings):
+    publish_pool = state._create_pubsub_client().connection_pool
+    subscriber_pool = state._create_subscriber_client().connection_pool
+    assert isinstance(publish_pool, BlockingConnectionPool)
+    assert publish_pool.max_connections == settings.REDIS_PUBLISH_MAX_CONNECTIONS
+    assert not isinstance(subscriber_pool, BlockingConnectionPool)
+    assert subscriber_pool.max_connections > publish_pool.max_connections
+
+TRANSACTION = {"chainId": 1, "from_address": "0xa", "to_address": "0xb"}
+LARGE_CALLDATA = "0xa9059cbb" + "00" * 2048
+
+def test_large_calldata_is_stored_once_and_rebuilt(state):
+    async def run():
+        first = await state.initialize_transaction({**TRANSACTION, "data": LARGE_CALLDATA})
+        second = await state.initialize_transaction({**TRANSACTION, "data": LARGE_CALLDATA})
+        blobs = [key async for key in state._redis.scan_iter("calldata:*")]
+        return (
+            await state.get_transaction(first),
+            await state.get_transaction(second, resolve_calldata=False),
+            blobs,
+        )
+
+    first, second, blobs = asyncio.run(run())
+    assert first["data"] == LARGE_CALLDATA
+    assert "data" not in second
+    assert len(blobs) == 1
+
+def test_small_or_non_canonical_calldata_is_kept_inline(state):
+    async def run():
+        small = await state.initialize_transaction({**TRANSACTION, "data": "0xa9059cbb"})
+        # Uppercase hex cannot be rebuilt byte for byte from the blob
+        upper = await state.initialize_transaction({**TRANSACTION, "data": LARGE_CALLDATA.upper()})
+        return (
+            await state.get_transaction(small, resolve_calldata=False),
+            await state.get_transaction(upper, resolve_calldata=False),
+        )
+
+    small, upper = asyncio.run(run())
+    assert small["data"] == "0xa9059cbb"
+    assert upper["data"] == LARGE_CALLDATA.upper()
@@ -0,0 +1,60 @@
+import asyncio
+import pytest
+from src.constants import TransactionStatus
+from src.stats_service import get_stats_service
+
+# 2024-01-01T00:00:00Z, on a day boundary
+DAY = 1704067200
+
+def test_counters_land_in_their_buckets(state):
+    stats = get_stats_service()
+
+    async def run():
+        await stats._increment({"transactions": 1}, timestamp=DAY + 30)
+        await stats._increment({"transactions": 1}, timestamp=DAY + 90)
+        await stats._increment({"transactions": 2}, timestamp=DAY + 3600)
+        return (
+            await stats.get_series(DAY, DAY + 179, "minute"),
+            await stats.get_series(DAY, DAY + 3600, "hour"),
+            await stats.get_series(DAY, DAY, "day"),
+            await stats.get_total("transactions"),
+        )
+
+    minutes, hours, days, total = asyncio.run(run())
+    assert minutes == [
+        {"timestamp": DAY, "counters": {"transactions": 1}},
+        {"timestamp": DAY + 60, "counters": {"transactions": 1}},
+        {"timestamp": DAY + 120, "counters": {}},
+    ]
+    assert [bucket["counters"] for bucket in hours] == [{"transactions": 2}, {"transactions": 2}]
+    assert days == [{"timestamp": DAY, "counters": {"transactions": 4}}]
+    assert total == 4
+
+def test_finished_transaction_counters(state):
+    stats = get_stats_service()
+    transaction = {"validations": [
+        {"name": "SentinelOne", "status": "completed", "result": {"risk_level": "high"}},
+        {"name": "agent", "status": "completed", "result": {"approved": True, "warnings": ["mixer"]}},
+    ]}
+
+    async def run():
+        await stats.record_finished(transaction, TransactionStatus.COMPLETED)
+        return await stats.get_totals()
+
+    assert asyncio.run(run()) == {
+        "status:completed": 1,
+        "decision:warnings": 1,
+        "sentinel:SentinelOne:high": 1,
+    }
+
+def test_series_are_capped(state, settings, monkeypatch):
+    monkeypatch.setattr(settings, "STATS_MAX_BUCKETS", 10)
+    stats = get_stats_service()
+    assert len(asyncio.run(stats.get_series(DAY, DAY + 599, "minute"))) == 10
+    with pytest.raises(ValueError, match="11 buckets"):
+        asyncio.run(stats.get_series(DAY, DAY + 600, "minute"))
+
+@pytest.mark.parametrize("start, end, granularity", [(DAY, DAY + 60, "week"), (DAY + 60, DAY, "minute")])
+def test_invalid_series_ranges(state, start, end, granularity):
+    with pytest.raises(ValueError):
+        asyncio.run(get_stats_service().get_series(start, end, granularity))